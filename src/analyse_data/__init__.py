@@ -1,3 +1,3 @@
 """Init of the analyse_data module"""
 
-from . import analyse_speech_datasets
+from . import analyse_speech_datasets, kendall_corr, streaming_stats
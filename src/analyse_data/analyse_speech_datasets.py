@@ -5,10 +5,11 @@ This Python file analyses the five speech datasets in this project.
 import logging
 import os
 
-import pandas as pd
-
+from src.analyse_data.constants import REPORTS_DIR_STR
+from src.analyse_data.streaming_stats import analyse_dataset_in_one_pass
 from src.constants import TARGET_COL_NAME
 from src.get_src_dir import get_src_path
+from src.process_data.columnar_cache import load_csv_columns
 from src.process_data.constants import DATA_DIR_STR
 
 logging.basicConfig(level=logging.INFO)
@@ -27,7 +28,7 @@ def analyse_dataset(csv_path: str) -> None:
                 The path to a csv dataset.
     """
 
-    data_df = pd.read_csv(csv_path)
+    data_df = load_csv_columns(csv_path)
 
     logging.info(f"The first two rows of the df are: {data_df.head(2)}.")
 
@@ -59,6 +60,10 @@ if __name__ == '__main__':
         'Sakar_et_al_2013/test_data_processed.csv',
         'Sakar_et_al_2018/pd_speech_features_processed.csv']
 
+    reports_dir = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{REPORTS_DIR_STR}"
+    os.makedirs(reports_dir, exist_ok=True)
     for file_path in list_of_paths_of_files_to_analyse:
-        analyse_dataset(
-            f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{file_path}")
+        analyse_dataset_in_one_pass(
+            f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{file_path}",
+            report_path=f"{reports_dir}{os.sep}"
+                        f"{os.path.splitext(os.path.basename(file_path))[0]}.json")
@@ -1,3 +1,27 @@
 """Constants for aiding data analysis"""
 
 NON_PARAM_CORR_METHOD = 'kendall'
+
+# Number of rows per chunk when analysing a dataset in a single streaming pass
+ANALYSIS_CHUNK_SIZE = 10000
+
+# Quantiles to approximate, and the size of the (uniform, seeded) sample of
+# each column they are approximated from
+QUANTILES = (0.25, 0.5, 0.75)
+QUANTILE_SAMPLE_SIZE = 10000
+
+# Directory of the JSON reports of the analysed datasets
+REPORTS_DIR_STR = 'analysis_reports'
+
+# Number of worker processes computing the pairwise correlations (None to use
+# as many as the CPU cores), and the minimum number of rows for which it pays
+# off to spread the pairs over worker processes rather than computing them
+# in the current process
+CORR_WORKERS_NUM = None
+CORR_PARALLEL_MIN_ROWS = 100000
+
+# Directory of the cached correlation matrices, keyed by data fingerprint
+CORR_CACHE_DIR_STR = 'corr_matrices'
+
+# Maximum number of cells of a correlation heatmap annotated with values
+MAX_ANNOTATED_CELLS = 400
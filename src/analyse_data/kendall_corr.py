@@ -0,0 +1,162 @@
+"""This Python file computes Kendall's tau-b correlation matrices efficiently,
+via an O(n log n) algorithm per pair of columns (Knight's, as implemented by
+scipy), the pairs being spread over worker processes for large dfs, and the
+resulting matrices being cached on disk keyed by a fingerprint of the data"""
+
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from src.get_src_dir import get_src_path
+from src.process_data.constants import DATA_DIR_STR, PARQUET_FMT_STR
+
+from .constants import (CORR_CACHE_DIR_STR, CORR_PARALLEL_MIN_ROWS,
+                        CORR_WORKERS_NUM, NON_PARAM_CORR_METHOD)
+
+ROOT_DIR_STR = str(get_src_path())
+CORR_CACHE_DIR = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{CORR_CACHE_DIR_STR}"
+
+# Columns of the df whose correlations are computed, shared with each worker
+# process once, rather than with each pair
+_WORKER_STATE: dict[str, np.ndarray] = {}
+
+
+def kendall_tau_b(
+        x_values: np.ndarray,
+        y_values: np.ndarray) -> float:
+    """
+    Compute Kendall's tau-b between two arrays in O(n log n), ignoring the
+    pairs of values with any missing value (as per pandas).
+
+    Args:
+        x_values: np.ndarray
+            The first array.
+        y_values: np.ndarray
+            The second array, of the same length.
+
+    Returns:
+        float
+            Kendall's tau-b, NaN if fewer than two pairs of values are complete
+            or if any array is constant.
+    """
+    is_complete = ~(np.isnan(x_values) | np.isnan(y_values))
+    if is_complete.sum() < 2:
+        return np.nan
+    return float(stats.kendalltau(
+        x_values[is_complete], y_values[is_complete], variant='b').statistic)
+
+
+def _init_worker(values: np.ndarray) -> None:
+    """Share the columns of the df with a worker process."""
+    _WORKER_STATE['values'] = values
+
+
+def _compute_pair(pair: tuple[int, int]) -> float:
+    """Compute Kendall's tau-b of a pair of columns in a worker process."""
+    col_num_1, col_num_2 = pair
+    values = _WORKER_STATE['values']
+    return kendall_tau_b(values[:, col_num_1], values[:, col_num_2])
+
+
+def get_data_fingerprint(
+        input_df: pd.DataFrame,
+        corr_method: str = NON_PARAM_CORR_METHOD) -> str:
+    """
+    Get the fingerprint of a df, i.e., a hash of its column names and values
+    (regardless of its index), along with the correlation method.
+
+    Args:
+        input_df: pd.DataFrame
+            An input df.
+        corr_method: str
+            The correlation method ('kendall' by default).
+
+    Returns:
+        str
+            The SHA-256 fingerprint of the df.
+    """
+    sha256 = hashlib.sha256(corr_method.encode())
+    sha256.update('\0'.join(map(str, input_df.columns)).encode())
+    row_hashes = pd.util.hash_pandas_object(input_df, index=False)
+    sha256.update(row_hashes.to_numpy().tobytes())
+    return sha256.hexdigest()
+
+
+def get_kendall_corr_matrix(
+        input_df: pd.DataFrame,
+        workers_num: Optional[int] = CORR_WORKERS_NUM,
+        parallel_min_rows: int = CORR_PARALLEL_MIN_ROWS,
+        cache_dir: Optional[str] = CORR_CACHE_DIR) -> pd.DataFrame:
+    """
+    Compute the Kendall's tau-b correlation matrix of the numeric columns of a
+    df, as per input_df.corr(method='kendall'), reusing the matrix cached for
+    the same data if any.
+
+    Args:
+        input_df: pd.DataFrame
+            An input df with various numerical features.
+        workers_num: Optional[int]
+            The number of worker processes computing the pairs of columns (None
+            by default, i.e., as many as the CPU cores).
+        parallel_min_rows: int
+            The minimum number of rows for which the pairs of columns are spread
+            over worker processes, below which they are computed in the current
+            process, as starting the workers would take longer (100000 by default).
+        cache_dir: Optional[str]
+            The directory of the cached matrices (by default, 'corr_matrices'
+            inside the data directory), or None not to cache the matrix.
+
+    Returns:
+        pd.DataFrame
+            The correlation matrix.
+    """
+    numeric_df = input_df.select_dtypes(include='number')
+    cols = numeric_df.columns
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = (f"{cache_dir}{os.sep}"
+                      f"{get_data_fingerprint(numeric_df)}{PARQUET_FMT_STR}")
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path)
+
+    # Contiguous columns, so that each column is read sequentially
+    values = np.asfortranarray(numeric_df.to_numpy(dtype=np.float64))
+    pairs = list(combinations(range(len(cols)), 2))
+
+    if (len(values) >= parallel_min_rows and len(pairs) > 1
+            and workers_num != 1):
+        chunk_size = max(
+            1, len(pairs) // (4 * (workers_num or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(
+                max_workers=workers_num,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(values,)) as executor:
+            pair_corrs = list(executor.map(
+                _compute_pair, pairs, chunksize=chunk_size))
+    else:
+        pair_corrs = [
+            kendall_tau_b(values[:, col_num_1], values[:, col_num_2])
+            for col_num_1, col_num_2 in pairs
+        ]
+
+    corr_values = np.eye(len(cols))
+    for (col_num_1, col_num_2), pair_corr in zip(pairs, pair_corrs):
+        corr_values[col_num_1, col_num_2] = pair_corr
+        corr_values[col_num_2, col_num_1] = pair_corr
+    correl_matrix = pd.DataFrame(corr_values, index=cols, columns=cols)
+
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_cache_path = f"{cache_path}.tmp"
+        correl_matrix.to_parquet(tmp_cache_path)
+        os.replace(tmp_cache_path, cache_path)
+    return correl_matrix
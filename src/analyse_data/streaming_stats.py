@@ -0,0 +1,314 @@
+"""This Python file analyses datasets in a single streaming pass, via chunks
+of bounded size, computing for every column at once its count, mean, variance,
+minimum and maximum (via Welford's algorithm, merged chunk by chunk as per Chan
+et al.), its approximate quantiles, its missing values and the class balance"""
+
+import json
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.constants import TARGET_COL_NAME
+from src.process_data.constants import RANDOM_STATE
+
+from .constants import ANALYSIS_CHUNK_SIZE, QUANTILE_SAMPLE_SIZE, QUANTILES
+
+
+class RunningMoments:
+    """Count, mean, sum of squared deviations from the mean, minimum and
+    maximum of each column of a numeric matrix, ignoring missing values, merged
+    chunk by chunk (as per Chan et al.'s generalisation of Welford's algorithm).
+    """
+
+    def __init__(self):
+        self.counts = None
+        self.means = None
+        self.m2s = None
+        self.mins = None
+        self.maxs = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Merge the moments of a chunk into the running ones.
+
+        Args:
+            values: np.ndarray
+                A chunk of rows of the matrix, with NaNs for missing values.
+        """
+        if self.counts is None:
+            cols_num = values.shape[1]
+            self.counts = np.zeros(cols_num, dtype=np.int64)
+            self.means = np.zeros(cols_num)
+            self.m2s = np.zeros(cols_num)
+            self.mins = np.full(cols_num, np.inf)
+            self.maxs = np.full(cols_num, -np.inf)
+
+        is_valid = ~np.isnan(values)
+        chunk_counts = is_valid.sum(axis=0)
+        has_values = chunk_counts > 0
+        if not has_values.any():
+            return
+
+        chunk_means = (np.where(is_valid, values, 0.0).sum(axis=0)
+                       / np.maximum(chunk_counts, 1))
+        chunk_deviations = np.where(is_valid, values - chunk_means, 0.0)
+        chunk_m2s = (chunk_deviations * chunk_deviations).sum(axis=0)
+
+        counts = self.counts + chunk_counts
+        weights = self.counts * chunk_counts / np.maximum(counts, 1)
+        deltas = chunk_means - self.means
+        self.means = np.where(
+            has_values,
+            self.means + deltas * chunk_counts / np.maximum(counts, 1),
+            self.means)
+        self.m2s = np.where(
+            has_values,
+            self.m2s + chunk_m2s + deltas * deltas * weights,
+            self.m2s)
+        self.counts = counts
+
+        self.mins = np.minimum(
+            self.mins, np.where(is_valid, values, np.inf).min(axis=0))
+        self.maxs = np.maximum(
+            self.maxs, np.where(is_valid, values, -np.inf).max(axis=0))
+
+    def get_variances(self) -> np.ndarray:
+        """Get the (sample, i.e., with one delta degree of freedom) variance of
+        each column, NaN for the columns with fewer than two values.
+
+        Returns:
+            np.ndarray
+                The variance of each column.
+        """
+        return np.where(
+            self.counts > 1, self.m2s / np.maximum(self.counts - 1, 1), np.nan)
+
+
+class BottomKSample:
+    """Uniform sample of (at most) k values of each column of a numeric matrix,
+    ignoring missing values, kept chunk by chunk via bottom-k sampling, i.e., by
+    keeping the values with the smallest (seeded) random keys.
+
+    Args:
+        sample_size: int
+            The size k of the sample of each column.
+        random_state: int
+            The random state of the sampling keys, for reproducibility.
+    """
+
+    def __init__(self, sample_size: int, random_state: int):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(random_state)
+        self.samples = None
+        self.keys = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Merge the values of a chunk into the sample of each column.
+
+        Args:
+            values: np.ndarray
+                A chunk of rows of the matrix, with NaNs for missing values.
+        """
+        if self.samples is None:
+            self.samples = [np.empty(0) for _ in range(values.shape[1])]
+            self.keys = [np.empty(0) for _ in range(values.shape[1])]
+
+        keys = self.rng.random(values.shape)
+        for col_num in range(values.shape[1]):
+            is_valid = ~np.isnan(values[:, col_num])
+            samples = np.concatenate(
+                [self.samples[col_num], values[is_valid, col_num]])
+            sample_keys = np.concatenate(
+                [self.keys[col_num], keys[is_valid, col_num]])
+            if len(samples) > self.sample_size:
+                kept = np.argpartition(
+                    sample_keys, self.sample_size)[:self.sample_size]
+                samples, sample_keys = samples[kept], sample_keys[kept]
+            self.samples[col_num] = samples
+            self.keys[col_num] = sample_keys
+
+    def get_quantile(self, col_num: int, quantile: float) -> Optional[float]:
+        """Get a quantile of a column, approximated from its sample.
+
+        Args:
+            col_num: int
+                The index of the column.
+            quantile: float
+                The quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]
+                The quantile of the column, None if the column has no values.
+        """
+        if self.samples is None or len(self.samples[col_num]) == 0:
+            return None
+        return float(np.quantile(self.samples[col_num], quantile))
+
+
+class StreamingStats:
+    """Statistics of the columns of a dataset, updated chunk by chunk in
+    bounded memory.
+
+    The numeric columns are identified from the first chunk, and the values of
+    later chunks that are not numeric are counted as missing. The quantiles are
+    approximated from a uniform sample of each numeric column, thus exact as
+    long as the column has no more values than the sample size.
+
+    Args:
+        sample_size: int
+            The size of the sample of each numeric column (10000 by default).
+        random_state: int
+            The random state of the sampling, for reproducibility.
+        target_col_name: str
+            The name of the target column whose class balance is counted
+            ('status' by default).
+    """
+
+    def __init__(
+            self,
+            sample_size: int = QUANTILE_SAMPLE_SIZE,
+            random_state: int = RANDOM_STATE,
+            target_col_name: str = TARGET_COL_NAME):
+        self.target_col_name = target_col_name
+        self.rows_num = 0
+        self.nan_counts = None
+        self.class_counts = {}
+        self.numeric_cols = None
+        self._moments = RunningMoments()
+        self._sample = BottomKSample(sample_size, random_state)
+
+    def update(self, chunk_df: pd.DataFrame) -> None:
+        """Update the statistics with a chunk of the dataset.
+
+        Args:
+            chunk_df: pd.DataFrame
+                A chunk of the dataset, with the same columns as the first one.
+        """
+        if self.nan_counts is None:
+            # Identify the (numeric) columns from the first chunk
+            self.nan_counts = pd.Series(
+                0, index=chunk_df.columns, dtype='int64')
+            self.numeric_cols = [
+                col for col in chunk_df.columns
+                if pd.api.types.is_numeric_dtype(chunk_df[col])
+                and not pd.api.types.is_bool_dtype(chunk_df[col])]
+
+        self.rows_num += len(chunk_df)
+        self.nan_counts += chunk_df[self.nan_counts.index].isna().sum()
+
+        if self.target_col_name in chunk_df.columns:
+            for label, count in chunk_df[self.target_col_name].value_counts(
+                    dropna=False).items():
+                # Label the classes consistently across chunks, whether or
+                # not a chunk's target column is float due to missing values
+                label_str = (str(int(label))
+                             if isinstance(label, float) and label.is_integer()
+                             else str(label))
+                self.class_counts[label_str] = (
+                    self.class_counts.get(label_str, 0) + int(count))
+
+        values = chunk_df[self.numeric_cols].apply(
+            pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        self._moments.update(values)
+        self._sample.update(values)
+
+    def to_report(self, quantiles: Iterable[float] = QUANTILES) -> dict:
+        """Get the statistics as a (JSON-serialisable) report.
+
+        Args:
+            quantiles: Iterable[float]
+                The quantiles to approximate (the quartiles by default).
+
+        Returns:
+            dict
+                The number of rows, the statistics of each column, the columns
+                with missing values and the class balance.
+        """
+        cols_report = {}
+        nan_counts = (self.nan_counts if self.nan_counts is not None
+                      else pd.Series(dtype='int64'))
+        for col, nan_count in nan_counts.items():
+            cols_report[col] = {
+                'is_numeric': False,
+                'count': int(self.rows_num - nan_count),
+                'nan_count': int(nan_count)
+            }
+
+        variances = self._moments.get_variances() if self.rows_num else None
+        numeric_cols = self.numeric_cols if self.rows_num else []
+        for col_num, col in enumerate(numeric_cols):
+            count = int(self._moments.counts[col_num])
+            variance = float(variances[col_num]) if count > 1 else None
+            cols_report[col].update({
+                'is_numeric': True,
+                'count': count,
+                'nan_count': int(self.rows_num - count),
+                'mean': float(self._moments.means[col_num]) if count else None,
+                'variance': variance,
+                'std': float(np.sqrt(variance)) if variance is not None else None,
+                'min': float(self._moments.mins[col_num]) if count else None,
+                'max': float(self._moments.maxs[col_num]) if count else None,
+                'quantiles': {
+                    str(quantile): self._sample.get_quantile(col_num, quantile)
+                    for quantile in quantiles
+                }
+            })
+
+        return {
+            'rows_num': self.rows_num,
+            'columns': cols_report,
+            'cols_with_nan': [
+                col for col, col_report in cols_report.items()
+                if col_report['nan_count'] > 0],
+            'class_balance': self.class_counts
+        }
+
+
+def analyse_dataset_in_one_pass(
+        csv_path: str,
+        chunk_size: int = ANALYSIS_CHUNK_SIZE,
+        quantiles: Iterable[float] = QUANTILES,
+        sample_size: int = QUANTILE_SAMPLE_SIZE,
+        random_state: int = RANDOM_STATE,
+        target_col_name: str = TARGET_COL_NAME,
+        report_path: Optional[str] = None) -> dict:
+    """
+    Analyse a speech dataset in a single sequential pass over its csv file,
+    with at most one chunk in memory at a time, and emit its report in JSON.
+
+    Args:
+        csv_path: str
+            The path to a csv dataset.
+        chunk_size: int
+            The number of rows per chunk (10000 by default).
+        quantiles: Iterable[float]
+            The quantiles to approximate (the quartiles by default).
+        sample_size: int
+            The size of the sample of each numeric column the quantiles are
+            approximated from (10000 by default).
+        random_state: int
+            The random state of the sampling, for reproducibility.
+        target_col_name: str
+            The name of the target column whose class balance is counted
+            ('status' by default).
+        report_path: Optional[str]
+            The path to save the JSON report to (None by default, i.e., logged
+            only).
+
+    Returns:
+        dict
+            The report of the dataset.
+    """
+    streaming_stats = StreamingStats(
+        sample_size, random_state, target_col_name)
+    for chunk_df in pd.read_csv(csv_path, chunksize=chunk_size):
+        streaming_stats.update(chunk_df)
+    report = streaming_stats.to_report(quantiles)
+
+    report_json = json.dumps(report, indent=2)
+    logging.info(f"The report of the df at {csv_path} is: {report_json}")
+    if report_path is not None:
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            report_file.write(report_json)
+    return report
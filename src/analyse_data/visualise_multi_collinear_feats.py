@@ -1,15 +1,20 @@
 """This Python file helps in visualising multi-collinear features
 via an appropriate correlation analysis"""
 
+from typing import Optional
+
 import matplotlib.pyplot as plt
 import pandas as pd
 
-from .constants import NON_PARAM_CORR_METHOD
+from .constants import MAX_ANNOTATED_CELLS, NON_PARAM_CORR_METHOD
+from .kendall_corr import get_kendall_corr_matrix
 
 
 def plot_multi_collinearity_heatmap(
-        input_df: pd.DataFrame,
-        corr_method: str = NON_PARAM_CORR_METHOD
+        input_df: Optional[pd.DataFrame] = None,
+        corr_method: str = NON_PARAM_CORR_METHOD,
+        correl_matrix: Optional[pd.DataFrame] = None,
+        max_annotated_cells: int = MAX_ANNOTATED_CELLS
 ) -> None:
     """Visualise multi-collinear features via a heatmap
     using a correlation analysis.
@@ -21,9 +26,21 @@ def plot_multi_collinearity_heatmap(
         corr_method: str
             The chosen correlation method (by default, using the
             non-parametric Kendall's tau method).
+        correl_matrix: Optional[pd.DataFrame]
+            A precomputed correlation matrix to plot (None by default, i.e.,
+            computed from the input dataframe).
+        max_annotated_cells: int
+            The maximum number of cells of the heatmap annotated with their
+            correlation strengths (400 by default), beyond which annotating
+            each cell would take long while being unreadable.
     """
-    # Calculate the correlation matrix on the numeric columns
-    correl_matrix = input_df.corr(method=corr_method)
+    # Calculate the correlation matrix on the numeric columns, unless provided
+    if correl_matrix is None:
+        if corr_method == NON_PARAM_CORR_METHOD:
+            correl_matrix = get_kendall_corr_matrix(input_df)
+        else:
+            correl_matrix = input_df.corr(
+                method=corr_method, numeric_only=True)
 
     # Create a heatmap with correlation strengths as annotations
     fig, ax_fig = plt.subplots(figsize=(8, 6))
@@ -31,7 +48,8 @@ def plot_multi_collinearity_heatmap(
     _ = fig.colorbar(cax)
 
     # Add annotations
-    for i in range(correl_matrix.shape[0]):
+    is_annotated = correl_matrix.size <= max_annotated_cells
+    for i in range(correl_matrix.shape[0] if is_annotated else 0):
         for j in range(correl_matrix.shape[1]):
             ax_fig.text(
                 j,
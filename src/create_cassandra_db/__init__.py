@@ -1,3 +1,3 @@
 """Init of the create_cassandra_db module"""
 
-from . import create_tables, utils
+from . import create_tables, snapshot_cache, storage_backends, utils
@@ -7,3 +7,113 @@ PROTOCOL_VERSION_NUM = 5
 ENCODING = 'utf-8'
 
 KEYSPACE_NAME = 'parkinson'
+
+# Columns of the speech data tables, in the order of the csv files
+TABLE_COL_NAMES = ['subject_id', 'jitter_percent', 'jitter_abs', 'rap', 'ppq',
+                   'apq_3', 'apq_5', 'apq_11', 'status']
+
+# Number of csv rows parsed per chunk and maximum number of
+# requests in flight when ingesting data concurrently
+INGEST_CHUNK_SIZE = 5000
+CONCURRENCY_NUM = 100
+
+# Number of rows per page when streaming data from a table
+FETCH_SIZE = 5000
+
+# Whether to decode result pages column-wise into typed arrays
+IS_COLUMNAR = False
+
+# NumPy dtypes of the table columns when decoding result pages column-wise
+COLUMNAR_DTYPES = {
+    'subject_id': object,
+    'jitter_percent': 'float32',
+    'jitter_abs': 'float32',
+    'rap': 'float32',
+    'ppq': 'float32',
+    'apq_3': 'float32',
+    'apq_5': 'float32',
+    'apq_11': 'float32',
+    'status': 'int8',
+    'recording_id': 'int32'
+}
+CATEGORICAL_COL_NAME = 'subject_id'
+
+PRIMARY_KEY_COL_NAME = 'subject_id'
+
+# Named execution profiles registered on each cluster
+BULK_WRITE_PROFILE = 'bulk_write'
+LOW_LATENCY_READ_PROFILE = 'low_latency_read'
+FULL_SCAN_PROFILE = 'full_scan'
+
+# Request timeouts of the execution profiles
+BULK_WRITE_TIMEOUT_SECS = 60.0
+LOW_LATENCY_READ_TIMEOUT_SECS = 10.0
+FULL_SCAN_TIMEOUT_SECS = 60.0
+
+# Speculative execution of idempotent reads: a new attempt is sent to
+# another replica if no response arrives within the delay
+SPECULATIVE_DELAY_SECS = 0.05
+SPECULATIVE_ATTEMPTS_NUM = 2
+
+# Number of threads of the driver's executor
+EXECUTOR_THREADS_NUM = 2
+
+# Directory (inside the data directory) of the tables
+# persisted by the local, embedded storage backend
+LOCAL_TABLES_DIR_STR = 'local_tables'
+PARQUET_FMT_STR = '.parquet'
+
+# Bounds of the Murmur3 token ring and number of token sub-ranges
+# (and of concurrent workers) when scanning a table in parallel
+MIN_TOKEN = -2**63
+MAX_TOKEN = 2**63 - 1
+TOKEN_RANGES_NUM = 32
+SCAN_WORKERS_NUM = 8
+
+# Number of random tokens splitting the token ring into the sub-ranges each
+# class is sampled from, and maximum number of rows sampled per partition per
+# sub-range (None for no maximum)
+SAMPLED_TOKENS_NUM = 256
+PER_PARTITION_LIMIT = None
+
+# Number of worker processes (and of csv shards) when bulk-loading a table
+BULK_LOAD_WORKERS_NUM = 4
+
+# Directory (inside the data directory) of the manifests of row checksums
+# used to incrementally ingest data, and whether to delete the rows
+# that are no longer in the ingested csv file
+MANIFESTS_DIR_STR = 'ingest_manifests'
+CHECKSUM_COL_NAME = 'checksum'
+TO_DELETE_MISSING = False
+
+# Whether to store the speech features as a single packed vector, i.e., a
+# blob of little-endian float32 values in the order of FEATURE_COL_NAMES
+IS_PACKED = False
+PACKED_FEATS_COL_NAME = 'features'
+PACKED_FEATS_DTYPE = '<f4'
+FEATURE_COL_NAMES = ['jitter_percent', 'jitter_abs', 'rap', 'ppq',
+                     'apq_3', 'apq_5', 'apq_11']
+PACKED_TABLE_COL_NAMES = ['subject_id', 'features', 'status']
+
+# Whether to key the table by subject partition and recording clustering
+# key (i.e., the position of the recording in the ingested csv file), so
+# that the recordings of a subject are not overwritten
+IS_PARTITIONED = False
+RECORDING_COL_NAME = 'recording_id'
+
+# Whether to index the 'status' column via a storage-attached index (SAI,
+# from Cassandra 5.0) rather than via a legacy secondary index
+IS_SAI = False
+
+# Class labels of the 'status' column (0 = healthy, 1 = PD)
+CLASS_LABELS = (0, 1)
+
+# Table of counters tracking the version of each table, bumped by every
+# write so that cached snapshots of a table can be invalidated
+VERSIONS_TABLE_NAME = 'table_versions'
+
+# Directory (inside the data directory) of the cached table snapshots,
+# and their maximum total size and age before being evicted
+SNAPSHOTS_DIR_STR = 'table_snapshots'
+MAX_SNAPSHOTS_BYTES = 2**30
+MAX_SNAPSHOT_AGE_SECS = 7 * 24 * 3600
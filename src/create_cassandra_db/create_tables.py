@@ -1,14 +1,42 @@
 """This Python file enables the creation of
 tables in Apache Cassandra"""
 
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, Union
+
+import numpy as np
+import pandas as pd
 from cassandra.cluster import Session
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.query import PreparedStatement
+
+from src.constants import TARGET_COL_NAME
+from src.get_src_dir import get_src_path
+from src.process_data.constants import DATA_DIR_STR
+
+from .constants import (BULK_LOAD_WORKERS_NUM, BULK_WRITE_PROFILE,
+                        CHECKSUM_COL_NAME, CONCURRENCY_NUM, DEFAULT_LOCAL_IP,
+                        ENCODING, FEATURE_COL_NAMES, INGEST_CHUNK_SIZE,
+                        IS_PACKED, IS_PARTITIONED, KEYSPACE_NAME,
+                        MANIFESTS_DIR_STR, PACKED_FEATS_COL_NAME,
+                        PACKED_FEATS_DTYPE, PACKED_TABLE_COL_NAMES,
+                        PARQUET_FMT_STR, PRIMARY_KEY_COL_NAME,
+                        RECORDING_COL_NAME, TABLE_COL_NAMES, TO_DELETE_MISSING)
+from .utils import bump_table_version, create_session, create_versions_table
 
-from .constants import ENCODING
+ROOT_DIR_STR = str(get_src_path())
 
 
 def create_table(
         session: Session,
-        table_name: str
+        table_name: str,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED
 ) -> None:
     """
     Create a table to persist speech data given an input session and name.
@@ -18,12 +46,38 @@ def create_table(
             An Apache Cassandra DB session.
         table_name: str
             The name of the table to be created.
+        is_packed: bool
+            Whether to store the speech features as a single blob of packed
+            little-endian float32 values, rather than as one float column
+            per feature (False by default).
+        is_partitioned: bool
+            Whether to key the table by 'subject_id' partitions and
+            'recording_id' clustering keys, rather than by 'subject_id'
+            only (False by default).
     """
-    query = (f"CREATE TABLE IF NOT EXISTS {table_name} "
-             f"(subject_id text, jitter_percent float, "
-             f"jitter_abs float, rap float, ppq float, "
-             f"apq_3 float, apq_5 float, apq_11 float, status int, "
-             f"PRIMARY KEY (subject_id))")
+    create_versions_table(session)
+
+    if not is_packed and not is_partitioned:
+        query = (f"CREATE TABLE IF NOT EXISTS {table_name} "
+                 f"(subject_id text, jitter_percent float, "
+                 f"jitter_abs float, rap float, ppq float, "
+                 f"apq_3 float, apq_5 float, apq_11 float, status int, "
+                 f"PRIMARY KEY (subject_id))")
+        session.execute(query)
+        return
+
+    feats_cols_def = (
+        f"{PACKED_FEATS_COL_NAME} blob" if is_packed
+        else ", ".join(f"{col_name} float" for col_name in FEATURE_COL_NAMES))
+    if is_partitioned:
+        query = (f"CREATE TABLE IF NOT EXISTS {table_name} "
+                 f"(subject_id text, {RECORDING_COL_NAME} int, "
+                 f"{feats_cols_def}, status int, "
+                 f"PRIMARY KEY ((subject_id), {RECORDING_COL_NAME}))")
+    else:
+        query = (f"CREATE TABLE IF NOT EXISTS {table_name} "
+                 f"(subject_id text, {feats_cols_def}, status int, "
+                 f"PRIMARY KEY (subject_id))")
     session.execute(query)
 
 
@@ -57,3 +111,432 @@ def write_data_to_table(
                 float(row[4]), float(row[5]), float(row[6]), float(row[7]),
                 int(row[8])))
             i = i + 1
+    bump_table_version(session, table_name)
+
+
+def _prepare_insert_statement(
+        session: Session,
+        table_name: str,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED) -> PreparedStatement:
+    """Prepare the statement inserting a row of speech data into a table."""
+    col_names = PACKED_TABLE_COL_NAMES if is_packed else TABLE_COL_NAMES
+    if is_partitioned:
+        col_names = col_names + [RECORDING_COL_NAME]
+    return session.prepare(
+        f"INSERT INTO {table_name} ({', '.join(col_names)}) "
+        f"VALUES ({', '.join(['?'] * len(col_names))})")
+
+
+def _to_insert_params(
+        data_df: pd.DataFrame,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED) -> Iterable[tuple]:
+    """Convert a df of speech data into the parameters of insert statements,
+    packing the features of each row into a single blob and appending the
+    recording id (i.e., the index of the df) if required."""
+    if is_partitioned:
+        data_df = data_df.assign(**{RECORDING_COL_NAME: data_df.index})
+    if not is_packed:
+        return data_df.itertuples(index=False, name=None)
+    packed_feats = np.ascontiguousarray(
+        data_df[FEATURE_COL_NAMES].to_numpy(dtype=PACKED_FEATS_DTYPE))
+    return zip(
+        data_df[PRIMARY_KEY_COL_NAME],
+        [feats_row.tobytes() for feats_row in packed_feats],
+        data_df[TARGET_COL_NAME].tolist(),
+        *([data_df[RECORDING_COL_NAME].tolist()] if is_partitioned else []))
+
+
+def _read_csv_in_chunks(
+        csv_file: Union[str, BinaryIO],
+        chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Parse the speech data of a csv file (or buffer) in chunks, indexed
+    by the position of each row in the file (or buffer)."""
+    for chunk_df in pd.read_csv(
+            csv_file,
+            usecols=TABLE_COL_NAMES,
+            dtype={TABLE_COL_NAMES[0]: str},
+            chunksize=chunk_size,
+            encoding=ENCODING):
+        yield chunk_df[TABLE_COL_NAMES]
+
+
+def write_data_to_table_concurrently(
+        session: Session,
+        path_to_csv_file: str,
+        table_name: str,
+        chunk_size: int = INGEST_CHUNK_SIZE,
+        concurrency: int = CONCURRENCY_NUM,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED) -> float:
+    """
+    Write speech data into a table given an input session and csv file path
+    in a high-throughput manner, i.e., by preparing the insert statement once,
+    parsing the csv file in chunks and keeping a bounded number of
+    requests in flight via the bulk-write execution profile.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        path_to_csv_file: str
+            The full path to a csv file.
+        table_name: str
+            The name of the table of interest.
+        chunk_size: int
+            The number of csv rows parsed per chunk (5000 by default).
+        concurrency: int
+            The maximum number of requests in flight (100 by default).
+        is_packed: bool
+            Whether the table stores the speech features as a single packed
+            blob (False by default).
+        is_partitioned: bool
+            Whether the table is keyed by subject partitions and recording
+            clustering keys (False by default).
+
+    Returns:
+        float
+            The ingest throughput in rows per second.
+    """
+    insert_statement = _prepare_insert_statement(
+        session, table_name, is_packed, is_partitioned)
+
+    rows_num = 0
+    start_time = time.perf_counter()
+    for chunk_df in _read_csv_in_chunks(path_to_csv_file, chunk_size):
+        execute_concurrent_with_args(
+            session,
+            insert_statement,
+            _to_insert_params(chunk_df, is_packed, is_partitioned),
+            concurrency=concurrency,
+            execution_profile=BULK_WRITE_PROFILE)
+        rows_num += len(chunk_df)
+    bump_table_version(session, table_name)
+    elapsed_secs = time.perf_counter() - start_time
+
+    rows_per_sec = (rows_num / elapsed_secs if elapsed_secs > 0
+                    else float(rows_num))
+    logging.info(
+        f"Written {rows_num} rows into the table {table_name} in "
+        f"{elapsed_secs:.2f} seconds ({rows_per_sec:.0f} rows/sec).")
+    return rows_per_sec
+
+
+def _split_csv_into_shards(
+        path_to_csv_file: str,
+        shards_num: int) -> tuple[bytes, list[tuple[int, int, int]]]:
+    """
+    Split a csv file into byte-range shards aligned on line boundaries.
+
+    Returns:
+        tuple[bytes, list[tuple[int, int, int]]]
+            The header line and, for each non-empty shard, its (start, end)
+            byte offsets and the position of its first row in the file.
+    """
+    file_size = os.path.getsize(path_to_csv_file)
+    with open(path_to_csv_file, 'rb') as input_file:
+        header = input_file.readline()
+        bounds = [len(header)]
+        for shard_idx in range(1, shards_num):
+            input_file.seek(
+                max(bounds[-1], file_size * shard_idx // shards_num))
+            # Move to the start of the next line
+            input_file.readline()
+            bounds.append(max(bounds[-1], input_file.tell()))
+        bounds.append(file_size)
+
+        shards = []
+        first_row_num = 0
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end > start:
+                shards.append((start, end, first_row_num))
+                first_row_num += _count_lines(input_file, start, end)
+    return header, shards
+
+
+def _count_lines(
+        input_file: BinaryIO,
+        start: int,
+        end: int,
+        block_size: int = 2**20) -> int:
+    """Count the line breaks within a byte range of a file, block by block."""
+    input_file.seek(start)
+    lines_num = 0
+    while start < end:
+        block = input_file.read(min(block_size, end - start))
+        lines_num += block.count(b'\n')
+        start += len(block)
+    return lines_num
+
+
+def _load_csv_shard(
+        path_to_csv_file: str,
+        header: bytes,
+        shard: tuple[int, int, int],
+        table_name: str,
+        ip_address: str,
+        ks_name: str,
+        chunk_size: int,
+        concurrency: int,
+        is_packed: bool,
+        is_partitioned: bool) -> dict:
+    """Load a byte-range shard of a csv file into a table from a worker
+    process with its own session, and summarise its rows and errors."""
+    session = create_session(ip_address)
+    session.set_keyspace(ks_name)
+    insert_statement = _prepare_insert_statement(
+        session, table_name, is_packed, is_partitioned)
+
+    with open(path_to_csv_file, 'rb') as input_file:
+        input_file.seek(shard[0])
+        shard_buffer = io.BytesIO(
+            header + input_file.read(shard[1] - shard[0]))
+
+    rows_num = 0
+    errors = []
+    for chunk_df in _read_csv_in_chunks(shard_buffer, chunk_size):
+        # Index the rows by their position in the whole file
+        chunk_df.index += shard[2]
+        results = execute_concurrent_with_args(
+            session,
+            insert_statement,
+            _to_insert_params(chunk_df, is_packed, is_partitioned),
+            concurrency=concurrency,
+            raise_on_first_error=False,
+            execution_profile=BULK_WRITE_PROFILE)
+        rows_num += len(chunk_df)
+        errors.extend(
+            result for success, result in results if not success)
+    bump_table_version(session, table_name)
+
+    return {
+        'shard_start': shard[0],
+        'shard_end': shard[1],
+        'rows_num': rows_num,
+        'errors_num': len(errors),
+        'first_error': repr(errors[0]) if errors else None
+    }
+
+
+def bulk_load_csv_to_table(
+        path_to_csv_file: str,
+        table_name: str,
+        ip_address: str = DEFAULT_LOCAL_IP,
+        ks_name: str = KEYSPACE_NAME,
+        workers_num: int = BULK_LOAD_WORKERS_NUM,
+        chunk_size: int = INGEST_CHUNK_SIZE,
+        concurrency: int = CONCURRENCY_NUM,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED) -> tuple[float, pd.DataFrame]:
+    """
+    Bulk-load speech data from a csv file into a table by splitting the file
+    into byte-range shards on line boundaries and loading each shard
+    concurrently from a worker process with its own session, so that
+    parsing and serialising rows scales with the number of cores.
+
+    Args:
+        path_to_csv_file: str
+            The full path to a csv file.
+        table_name: str
+            The name of the table of interest.
+        ip_address: str
+            Your local IP address ('127.0.0.1' by default).
+        ks_name: str
+            The name of the keyspace of the table ('parkinson' by default).
+        workers_num: int
+            The number of worker processes, and hence of shards
+            (4 by default).
+        chunk_size: int
+            The number of csv rows parsed per chunk (5000 by default).
+        concurrency: int
+            The maximum number of requests in flight per worker
+            (100 by default).
+        is_packed: bool
+            Whether the table stores the speech features as a single packed
+            blob (False by default).
+        is_partitioned: bool
+            Whether the table is keyed by subject partitions and recording
+            clustering keys (False by default).
+
+    Returns:
+        tuple[float, pd.DataFrame]
+            The aggregate ingest throughput in rows per second, and a df
+            summarising the rows loaded and errors raised per shard.
+    """
+    header, shards = _split_csv_into_shards(path_to_csv_file, workers_num)
+
+    start_time = time.perf_counter()
+    # Spawn (rather than fork) workers, as driver connections cannot be
+    # shared with child processes
+    with ProcessPoolExecutor(
+            max_workers=workers_num,
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [
+            executor.submit(
+                _load_csv_shard, path_to_csv_file, header, shard, table_name,
+                ip_address, ks_name, chunk_size, concurrency, is_packed,
+                is_partitioned)
+            for shard in shards
+        ]
+        shard_summary_df = pd.DataFrame(
+            [future.result() for future in futures])
+    elapsed_secs = time.perf_counter() - start_time
+
+    rows_num = int(shard_summary_df['rows_num'].sum()) if shards else 0
+    errors_num = int(shard_summary_df['errors_num'].sum()) if shards else 0
+    rows_per_sec = (rows_num / elapsed_secs if elapsed_secs > 0
+                    else float(rows_num))
+    logging.info(
+        f"Bulk-loaded {rows_num} rows ({errors_num} errors) from "
+        f"{len(shards)} shards into the table {table_name} in "
+        f"{elapsed_secs:.2f} seconds ({rows_per_sec:.0f} rows/sec).")
+    return rows_per_sec, shard_summary_df
+
+
+def _get_manifest_path(
+        session: Session,
+        table_name: str) -> str:
+    """Get the path to the checksum manifest of a table."""
+    return (f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{MANIFESTS_DIR_STR}"
+            f"{os.sep}{session.keyspace}_{table_name}{PARQUET_FMT_STR}")
+
+
+def _get_key_col_names(is_partitioned: bool = IS_PARTITIONED) -> list[str]:
+    """Get the names of the primary key columns of a table."""
+    if is_partitioned:
+        return [PRIMARY_KEY_COL_NAME, RECORDING_COL_NAME]
+    return [PRIMARY_KEY_COL_NAME]
+
+
+def _load_manifest(
+        manifest_path: str,
+        is_partitioned: bool = IS_PARTITIONED) -> pd.Series:
+    """Load a checksum manifest, i.e., the content hash of each row keyed
+    by its primary key (empty if the manifest does not exist yet)."""
+    key_col_names = _get_key_col_names(is_partitioned)
+    if not os.path.exists(manifest_path):
+        return pd.Series(
+            dtype='uint64',
+            index=pd.MultiIndex.from_arrays(
+                [[]] * len(key_col_names), names=key_col_names)
+            if is_partitioned else pd.Index([], name=PRIMARY_KEY_COL_NAME))
+    return pd.read_parquet(manifest_path).set_index(
+        key_col_names)[CHECKSUM_COL_NAME]
+
+
+def _save_manifest(
+        manifest: pd.Series,
+        manifest_path: str) -> None:
+    """Atomically (over)write a checksum manifest."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_manifest_path = f"{manifest_path}.tmp"
+    manifest.rename(CHECKSUM_COL_NAME).reset_index().to_parquet(
+        tmp_manifest_path, index=False)
+    os.replace(tmp_manifest_path, manifest_path)
+
+
+def write_delta_to_table(
+        session: Session,
+        path_to_csv_file: str,
+        table_name: str,
+        to_delete_missing: bool = TO_DELETE_MISSING,
+        manifest_path: str = None,
+        concurrency: int = CONCURRENCY_NUM,
+        is_packed: bool = IS_PACKED,
+        is_partitioned: bool = IS_PARTITIONED) -> dict[str, int]:
+    """
+    Incrementally write speech data into a table given an input session and
+    csv file path, i.e., only the rows that are new or whose content changed
+    since the last ingest, as per a local manifest of row checksums keyed
+    by the primary key, i.e., 'subject_id', or ('subject_id', 'recording_id')
+    for a partitioned table.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        path_to_csv_file: str
+            The full path to a csv file.
+        table_name: str
+            The name of the table of interest.
+        to_delete_missing: bool
+            Whether to delete the rows that are no longer in the csv
+            file (False by default).
+        manifest_path: str
+            The path to the checksum manifest (by default, named after the
+            keyspace and table inside 'ingest_manifests' in the data directory).
+        concurrency: int
+            The maximum number of requests in flight (100 by default).
+        is_packed: bool
+            Whether the table stores the speech features as a single packed
+            blob (False by default).
+        is_partitioned: bool
+            Whether the table is keyed by subject partitions and recording
+            clustering keys, i.e., the position of each row in the csv file
+            (False by default).
+
+    Returns:
+        dict[str, int]
+            The number of new, changed, unchanged and deleted rows.
+    """
+    if manifest_path is None:
+        manifest_path = _get_manifest_path(session, table_name)
+    key_col_names = _get_key_col_names(is_partitioned)
+
+    # Like the table, retain only the last row per primary key
+    data_df = pd.concat(
+        _read_csv_in_chunks(path_to_csv_file, INGEST_CHUNK_SIZE))
+    key_df = data_df[[PRIMARY_KEY_COL_NAME]].assign(
+        **{RECORDING_COL_NAME: data_df.index})[key_col_names]
+    is_last = ~key_df.duplicated(keep='last')
+    data_df, key_df = data_df[is_last], key_df[is_last]
+    checksums = pd.Series(
+        pd.util.hash_pandas_object(data_df, index=False).to_numpy(),
+        index=pd.MultiIndex.from_frame(key_df) if is_partitioned
+        else pd.Index(key_df[PRIMARY_KEY_COL_NAME]))
+    prev_checksums = _load_manifest(manifest_path, is_partitioned)
+
+    common_keys = checksums.index.intersection(prev_checksums.index)
+    changed_keys = common_keys[
+        checksums.loc[common_keys].to_numpy()
+        != prev_checksums.loc[common_keys].to_numpy()]
+    new_keys = checksums.index.difference(prev_checksums.index)
+    missing_keys = prev_checksums.index.difference(checksums.index)
+
+    execute_concurrent_with_args(
+        session,
+        _prepare_insert_statement(
+            session, table_name, is_packed, is_partitioned),
+        _to_insert_params(
+            data_df[checksums.index.isin(new_keys.union(changed_keys))],
+            is_packed, is_partitioned),
+        concurrency=concurrency,
+        execution_profile=BULK_WRITE_PROFILE)
+
+    if to_delete_missing:
+        # Delete single rows, rather than whole partitions
+        key_clause = " AND ".join(
+            f"{col_name} = ?" for col_name in key_col_names)
+        execute_concurrent_with_args(
+            session,
+            session.prepare(f"DELETE FROM {table_name} WHERE {key_clause}"),
+            [key if is_partitioned else (key,)
+             for key in missing_keys],
+            concurrency=concurrency,
+            execution_profile=BULK_WRITE_PROFILE)
+    else:
+        # The missing rows are still in the table
+        checksums = pd.concat([checksums, prev_checksums.loc[missing_keys]])
+
+    # Only record the new checksums once all writes have succeeded
+    bump_table_version(session, table_name)
+    _save_manifest(checksums, manifest_path)
+
+    delta_summary = {
+        'new': len(new_keys),
+        'changed': len(changed_keys),
+        'unchanged': len(common_keys) - len(changed_keys),
+        'deleted': len(missing_keys) if to_delete_missing else 0
+    }
+    logging.info(
+        f"Written the delta of the table {table_name}: {delta_summary}.")
+    return delta_summary
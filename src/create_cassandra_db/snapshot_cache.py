@@ -0,0 +1,144 @@
+"""Read-through cache of table snapshots persisted as Parquet files on the
+local disk, keyed by the version of each table so that a snapshot is reused
+until the table is written into again"""
+
+import glob
+import itertools
+import os
+import time
+
+import pandas as pd
+from cassandra.cluster import Session
+
+from src.get_src_dir import get_src_path
+from src.process_data.constants import DATA_DIR_STR, IS_COMPACT
+
+from .constants import (IS_COLUMNAR, MAX_SNAPSHOT_AGE_SECS,
+                        MAX_SNAPSHOTS_BYTES, PARQUET_FMT_STR,
+                        SNAPSHOTS_DIR_STR)
+from .utils import get_all_data_from_table, get_table_version
+
+ROOT_DIR_STR = str(get_src_path())
+SNAPSHOTS_DIR = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{SNAPSHOTS_DIR_STR}"
+
+
+def get_cached_data_from_table(
+        session: Session,
+        table_name: str,
+        is_columnar: bool = IS_COLUMNAR,
+        is_compact: bool = IS_COMPACT,
+        snapshots_dir: str = SNAPSHOTS_DIR,
+        max_snapshots_bytes: int = MAX_SNAPSHOTS_BYTES,
+        max_snapshot_age_secs: float = MAX_SNAPSHOT_AGE_SECS
+) -> pd.DataFrame:
+    """
+    Get all speech data from a table given an input session and table name,
+    from a local snapshot if the table has not been written into since the
+    snapshot was taken, or else from the table (thus refreshing the snapshot).
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+        is_columnar: bool
+            Whether to decode the data into per-column typed arrays via the
+            columnar row factory (False by default).
+        is_compact: bool
+            Whether to apply the memory-compact dtype policy to the data read
+            row-wise (False by default), as the snapshots of either policy
+            are kept apart.
+        snapshots_dir: str
+            The directory of the snapshots (by default, 'table_snapshots'
+            inside the data directory).
+        max_snapshots_bytes: int
+            The maximum total size of the snapshots, beyond which the least
+            recently used ones are evicted (1 GiB by default).
+        max_snapshot_age_secs: float
+            The maximum age of a snapshot, beyond which it is refreshed even
+            if the table version is unchanged, e.g., after writes that did
+            not bump it (one week by default).
+
+    Returns:
+        pd.DataFrame
+            A df with all speech data from a table.
+    """
+    # Get the version before reading, so that concurrent writes, which bump
+    # the version once done, invalidate the snapshot being taken
+    version = get_table_version(session, table_name)
+    table_prefix = f"{snapshots_dir}{os.sep}{session.keyspace}.{table_name}."
+    version_snapshot_paths = {
+        _get_snapshot_path(table_prefix, version, *flags)
+        for flags in itertools.product((False, True), repeat=2)
+    }
+    snapshot_path = _get_snapshot_path(
+        table_prefix, version, is_columnar, is_compact)
+
+    snapshot_age_secs = (time.time() - os.path.getmtime(snapshot_path)
+                         if os.path.exists(snapshot_path) else None)
+    if (snapshot_age_secs is not None
+            and snapshot_age_secs < max_snapshot_age_secs):
+        # Mark the snapshot as recently used via its access time, whereas
+        # its modification time remains the time it was taken
+        os.utime(snapshot_path, (time.time(), os.path.getmtime(snapshot_path)))
+        return pd.read_parquet(snapshot_path)
+
+    df_from_table = get_all_data_from_table(
+        session, table_name, is_columnar, is_compact=is_compact)
+
+    os.makedirs(snapshots_dir, exist_ok=True)
+    tmp_snapshot_path = f"{snapshot_path}.tmp"
+    df_from_table.to_parquet(tmp_snapshot_path, index=False)
+    os.replace(tmp_snapshot_path, snapshot_path)
+
+    # Snapshots of previous versions of the table can never be hit again
+    for path in glob.glob(f"{glob.escape(table_prefix)}v*{PARQUET_FMT_STR}"):
+        if path not in version_snapshot_paths:
+            os.remove(path)
+    evict_snapshots(snapshots_dir, max_snapshots_bytes, max_snapshot_age_secs)
+
+    return df_from_table
+
+
+def _get_snapshot_path(
+        table_prefix: str,
+        version: int,
+        is_columnar: bool,
+        is_compact: bool
+) -> str:
+    """Get the path to the snapshot of a table version decoded column-wise
+    or row-wise, with the memory-compact dtype policy or not."""
+    return (f"{table_prefix}v{version}"
+            f"{'.columnar' if is_columnar else ''}"
+            f"{'.compact' if is_compact else ''}{PARQUET_FMT_STR}")
+
+
+def evict_snapshots(
+        snapshots_dir: str = SNAPSHOTS_DIR,
+        max_snapshots_bytes: int = MAX_SNAPSHOTS_BYTES,
+        max_snapshot_age_secs: float = MAX_SNAPSHOT_AGE_SECS
+) -> None:
+    """
+    Evict the snapshots older than the maximum age, then the least recently
+    used ones until their total size is within the maximum size.
+
+    Args:
+        snapshots_dir: str
+            The directory of the snapshots (by default, 'table_snapshots'
+            inside the data directory).
+        max_snapshots_bytes: int
+            The maximum total size of the snapshots (1 GiB by default).
+        max_snapshot_age_secs: float
+            The maximum age of a snapshot (one week by default).
+    """
+    snapshot_paths = glob.glob(f"{snapshots_dir}{os.sep}*{PARQUET_FMT_STR}")
+    now = time.time()
+
+    # Sort the snapshots from the least to the most recently used
+    snapshot_paths.sort(key=os.path.getatime)
+    total_bytes = sum(os.path.getsize(path) for path in snapshot_paths)
+    for path in snapshot_paths:
+        if (now - os.path.getmtime(path) >= max_snapshot_age_secs
+                or total_bytes > max_snapshots_bytes):
+            total_bytes -= os.path.getsize(path)
+            os.remove(path)
@@ -0,0 +1,194 @@
+"""Storage backends behind the creation, writing and reading of the speech
+data tables, i.e., Apache Cassandra or a local, embedded columnar store of
+Parquet files, which yields the same results without a running database"""
+
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+from cassandra.cluster import Session
+from cassandra.metadata import Murmur3Token
+
+from src.get_src_dir import get_src_path
+from src.process_data.constants import DATA_DIR_STR
+
+from .constants import (CATEGORICAL_COL_NAME, COLUMNAR_DTYPES, ENCODING,
+                        IS_COLUMNAR, LOCAL_TABLES_DIR_STR, PARQUET_FMT_STR,
+                        PRIMARY_KEY_COL_NAME, TABLE_COL_NAMES)
+from .create_tables import create_table, write_data_to_table_concurrently
+from .utils import get_all_data_from_table
+
+ROOT_DIR_STR = str(get_src_path())
+LOCAL_TABLES_DIR = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{LOCAL_TABLES_DIR_STR}"
+
+
+class StorageBackend(ABC):
+    """Interface of a storage backend for the speech data tables"""
+
+    @abstractmethod
+    def create_table(self, table_name: str) -> None:
+        """
+        Create a table to persist speech data given its name.
+
+        Args:
+            table_name: str
+                The name of the table to be created.
+        """
+
+    @abstractmethod
+    def write_data_to_table(
+            self,
+            path_to_csv_file: str,
+            table_name: str) -> None:
+        """
+        Write speech data into a table given a csv file path.
+
+        Args:
+            path_to_csv_file: str
+                The full path to a csv file.
+            table_name: str
+                The name of the table of interest.
+        """
+
+    @abstractmethod
+    def get_all_data_from_table(
+            self,
+            table_name: str,
+            is_columnar: bool = IS_COLUMNAR
+    ) -> pd.DataFrame:
+        """
+        Get all speech data from a table given its name.
+
+        Args:
+            table_name: str
+                The name of the table of interest.
+            is_columnar: bool
+                Whether to return the columns with compact, typed dtypes
+                (False by default).
+
+        Returns:
+            pd.DataFrame
+                A df with all speech data from a table.
+        """
+
+
+class CassandraBackend(StorageBackend):
+    """Storage backend persisting the speech data tables in Apache Cassandra.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create_table(self, table_name: str) -> None:
+        create_table(self.session, table_name)
+
+    def write_data_to_table(
+            self,
+            path_to_csv_file: str,
+            table_name: str) -> None:
+        write_data_to_table_concurrently(
+            self.session, path_to_csv_file, table_name)
+
+    def get_all_data_from_table(
+            self,
+            table_name: str,
+            is_columnar: bool = IS_COLUMNAR
+    ) -> pd.DataFrame:
+        return get_all_data_from_table(self.session, table_name, is_columnar)
+
+
+class ParquetBackend(StorageBackend):
+    """Local, embedded storage backend persisting each speech data table
+    as a Parquet file, with the same upsert semantics (by 'subject_id'),
+    32-bit float precision, column order and row (token) order as Cassandra.
+
+    Args:
+        tables_dir: str
+            The directory of the Parquet files (by default, 'local_tables'
+            inside the data directory).
+    """
+
+    def __init__(
+            self,
+            tables_dir: str = LOCAL_TABLES_DIR):
+        self.tables_dir = tables_dir
+
+    def _get_table_path(self, table_name: str) -> str:
+        """Get the path to the Parquet file of a table."""
+        return f"{self.tables_dir}{os.sep}{table_name}{PARQUET_FMT_STR}"
+
+    def _save_table(self, table_df: pd.DataFrame, table_name: str) -> None:
+        """Atomically (over)write the Parquet file of a table."""
+        table_path = self._get_table_path(table_name)
+        tmp_table_path = f"{table_path}.tmp"
+        table_df.to_parquet(tmp_table_path, index=False)
+        os.replace(tmp_table_path, table_path)
+
+    def create_table(self, table_name: str) -> None:
+        os.makedirs(self.tables_dir, exist_ok=True)
+        if not os.path.exists(self._get_table_path(table_name)):
+            self._save_table(
+                _cast_to_table_dtypes(pd.DataFrame(columns=TABLE_COL_NAMES)),
+                table_name)
+
+    def write_data_to_table(
+            self,
+            path_to_csv_file: str,
+            table_name: str) -> None:
+        new_rows_df = _cast_to_table_dtypes(pd.read_csv(
+            path_to_csv_file,
+            usecols=TABLE_COL_NAMES,
+            dtype={PRIMARY_KEY_COL_NAME: str},
+            encoding=ENCODING))
+        table_df = pd.concat([
+            pd.read_parquet(self._get_table_path(table_name)), new_rows_df])
+
+        # Later writes to the same primary key overwrite earlier ones
+        table_df = table_df.drop_duplicates(
+            subset=PRIMARY_KEY_COL_NAME, keep='last')
+        self._save_table(_sort_by_token(table_df), table_name)
+
+    def get_all_data_from_table(
+            self,
+            table_name: str,
+            is_columnar: bool = IS_COLUMNAR
+    ) -> pd.DataFrame:
+        table_df = pd.read_parquet(self._get_table_path(table_name))
+
+        # Like 'select *', return the primary key followed by
+        # all other columns in alphabetical order
+        table_df = table_df[
+            [PRIMARY_KEY_COL_NAME] + sorted(
+                col for col in table_df.columns if col != PRIMARY_KEY_COL_NAME)
+        ]
+        if is_columnar:
+            table_df[CATEGORICAL_COL_NAME] = pd.Categorical(
+                table_df[CATEGORICAL_COL_NAME])
+            return table_df
+        # Like the driver, yield Python floats and ints
+        return table_df.astype({
+            col_name: 'float64' if col_dtype == 'float32' else 'int64'
+            for col_name, col_dtype in COLUMNAR_DTYPES.items()
+            if col_name in table_df.columns and col_dtype != object
+        })
+
+
+def _cast_to_table_dtypes(input_df: pd.DataFrame) -> pd.DataFrame:
+    """Cast a df to the dtypes of the columns of a speech data table."""
+    return input_df[TABLE_COL_NAMES].astype(
+        {col_name: COLUMNAR_DTYPES[col_name] for col_name in TABLE_COL_NAMES})
+
+
+def _sort_by_token(input_df: pd.DataFrame) -> pd.DataFrame:
+    """Sort a df by the Murmur3 token of its primary key,
+    i.e., in the order of a full-table scan in Cassandra."""
+    tokens = np.array([
+        Murmur3Token.hash_fn(subject_id.encode(ENCODING))
+        for subject_id in input_df[PRIMARY_KEY_COL_NAME]
+    ], dtype=np.int64)
+    return input_df.iloc[np.argsort(tokens, kind='stable')]
@@ -1,39 +1,131 @@
 """Utility-based functions to aid the creation
 of keyspace and tables in Apache Cassandra"""
 
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Union
+
+import numpy as np
 import pandas as pd
-from cassandra.cluster import Cluster, Session
-from cassandra.policies import DCAwareRoundRobinPolicy
+from cassandra.cluster import (EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile,
+                               ResultSet, Session)
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.policies import (ConstantSpeculativeExecutionPolicy,
+                                DCAwareRoundRobinPolicy, TokenAwarePolicy)
+from cassandra.query import SimpleStatement
+
+from src.constants import TARGET_COL_NAME
+from src.process_data.constants import IS_COMPACT, RANDOM_STATE
+from src.process_data.dtype_policy import apply_dtype_policy
+
+from .constants import (BULK_WRITE_PROFILE, BULK_WRITE_TIMEOUT_SECS,
+                        CATEGORICAL_COL_NAME, CLASS_LABELS, COLUMNAR_DTYPES,
+                        CONCURRENCY_NUM, DEFAULT_LOCAL_IP,
+                        EXECUTOR_THREADS_NUM, FEATURE_COL_NAMES, FETCH_SIZE,
+                        FULL_SCAN_PROFILE, FULL_SCAN_TIMEOUT_SECS, IS_COLUMNAR,
+                        IS_SAI, KEYSPACE_NAME, LOW_LATENCY_READ_PROFILE,
+                        LOW_LATENCY_READ_TIMEOUT_SECS, MAX_TOKEN, MIN_TOKEN,
+                        PACKED_FEATS_COL_NAME, PACKED_FEATS_DTYPE,
+                        PER_PARTITION_LIMIT, PRIMARY_KEY_COL_NAME,
+                        PROTOCOL_VERSION_NUM, SAMPLED_TOKENS_NUM,
+                        SCAN_WORKERS_NUM, SPECULATIVE_ATTEMPTS_NUM,
+                        SPECULATIVE_DELAY_SECS, TOKEN_RANGES_NUM,
+                        VERSIONS_TABLE_NAME)
+
+# Clusters and their sessions cached per set of contact points and number of
+# executor threads
+_CLUSTERS: dict[tuple[tuple[str, ...], int], Cluster] = {}
+_SESSIONS: dict[tuple[tuple[str, ...], int], Session] = {}
 
-from .constants import DEFAULT_LOCAL_IP, KEYSPACE_NAME, PROTOCOL_VERSION_NUM
 
+def _create_execution_profiles() -> dict[str, ExecutionProfile]:
+    """Create the default, bulk-write, low-latency read and full-scan
+    execution profiles, all routing requests to a replica owning the data via
+    token awareness. Only the low-latency reads are speculatively executed,
+    since a speculative attempt of a scan would read the whole range again."""
+    load_balancing_policy = TokenAwarePolicy(DCAwareRoundRobinPolicy())
+    return {
+        EXEC_PROFILE_DEFAULT: ExecutionProfile(
+            load_balancing_policy=load_balancing_policy
+        ),
+        BULK_WRITE_PROFILE: ExecutionProfile(
+            load_balancing_policy=load_balancing_policy,
+            request_timeout=BULK_WRITE_TIMEOUT_SECS
+        ),
+        LOW_LATENCY_READ_PROFILE: ExecutionProfile(
+            load_balancing_policy=load_balancing_policy,
+            request_timeout=LOW_LATENCY_READ_TIMEOUT_SECS,
+            speculative_execution_policy=ConstantSpeculativeExecutionPolicy(
+                delay=SPECULATIVE_DELAY_SECS,
+                max_attempts=SPECULATIVE_ATTEMPTS_NUM
+            )
+        ),
+        FULL_SCAN_PROFILE: ExecutionProfile(
+            load_balancing_policy=load_balancing_policy,
+            request_timeout=FULL_SCAN_TIMEOUT_SECS
+        )
+    }
 
-def create_session(ip_address: str = DEFAULT_LOCAL_IP) -> Session:
-    """Create an Apache Cassandra session given an IP address.
+
+def create_session(
+        ip_address: Union[str, list[str]] = DEFAULT_LOCAL_IP,
+        executor_threads: int = EXECUTOR_THREADS_NUM
+) -> Session:
+    """Create an Apache Cassandra session given an IP address, or reuse the
+    cached one if a session to the same contact points, with the same number
+    of executor threads, already exists.
+
+    The cluster routes requests via token-aware load balancing and registers
+    a 'bulk_write', a 'low_latency_read' (with speculative execution) and a
+    'full_scan' execution profiles. Each host is served by a single multiplexed
+    connection, as per protocol version 5, whose connection pool cannot be
+    sized. All clusters are shut down at exit.
 
     Args:
-        ip_address: str
-            Your local IP address ('127.0.0.1' by default).
+        ip_address: Union[str, list[str]]
+            Your local IP address ('127.0.0.1' by default), or a list of
+            contact points.
+        executor_threads: int
+            The number of threads of the cluster's executor (2 by default).
 
     Returns:
         Session
             An Apache Cassandra DB session.
     """
+    contact_points = tuple(sorted(
+        [ip_address] if isinstance(ip_address, str) else ip_address))
+    session_key = (contact_points, executor_threads)
+    if session_key in _SESSIONS:
+        return _SESSIONS[session_key]
+
     cluster = Cluster(
-        [ip_address],
+        list(contact_points),
         protocol_version=PROTOCOL_VERSION_NUM,
-        load_balancing_policy=DCAwareRoundRobinPolicy()
+        execution_profiles=_create_execution_profiles(),
+        executor_threads=executor_threads
     )
     session = cluster.connect()
+    _CLUSTERS[session_key] = cluster
+    _SESSIONS[session_key] = session
     return session
 
 
+@atexit.register
+def shutdown_sessions() -> None:
+    """Shut down all cached clusters and their sessions."""
+    for cluster in _CLUSTERS.values():
+        cluster.shutdown()
+    _CLUSTERS.clear()
+    _SESSIONS.clear()
+
+
 def create_and_set_keyspace(
         session: Session,
         ks_name: str = KEYSPACE_NAME
 ) -> None:
     """
-    Create and set a keyspace given an input session and name.
+    Create and set a keyspace given an input session and name, along with
+    the table of the versions of its tables, bumped by every write.
 
     Args:
         session: Session
@@ -48,11 +140,194 @@ def create_and_set_keyspace(
                     )
 
     session.set_keyspace(ks_name)
+    create_versions_table(session)
 
 
-def get_all_data_from_table(
+def create_versions_table(session: Session) -> None:
+    """
+    Create the table of counters tracking the version of each table.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+    """
+    session.execute(
+        f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE_NAME} "
+        f"(table_name text, version counter, PRIMARY KEY (table_name))")
+
+
+def bump_table_version(
         session: Session,
         table_name: str
+) -> None:
+    """
+    Bump the version of a table after writing into it, thus invalidating
+    its cached snapshots.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+    """
+    session.execute(
+        f"UPDATE {VERSIONS_TABLE_NAME} SET version = version + 1 "
+        f"WHERE table_name = %s", (table_name,))
+
+
+def get_table_version(
+        session: Session,
+        table_name: str
+) -> int:
+    """
+    Get the version of a table, i.e., the number of writes into it.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+
+    Returns:
+        int
+            The version of the table (0 if never written).
+    """
+    version_row = session.execute(
+        f"SELECT version FROM {VERSIONS_TABLE_NAME} WHERE table_name = %s",
+        (table_name,)).one()
+    return version_row[0] if version_row else 0
+
+
+def columnar_row_factory(
+        colnames: list[str],
+        rows: list[tuple]
+) -> dict[str, np.ndarray]:
+    """
+    Decode a result page into per-column typed arrays, rather than
+    into one named tuple per row.
+
+    Args:
+        colnames: list[str]
+            The names of the columns of the result page.
+        rows: list[tuple]
+            The rows of the result page.
+
+    Returns:
+        dict[str, np.ndarray]
+            A dictionary mapping each column name to an array of its values
+            (float32 for the speech features, int8 for the 'status' column),
+            or to a 2-D float32 array for the packed features.
+    """
+    cols_values = zip(*rows) if rows else [()] * len(colnames)
+    page_cols = {}
+    for col_name, col_values in zip(colnames, cols_values):
+        if col_name == PACKED_FEATS_COL_NAME:
+            # Reinterpret the packed blobs as a matrix, without boxing values
+            page_cols[col_name] = np.frombuffer(
+                b''.join(col_values), dtype=PACKED_FEATS_DTYPE
+            ).reshape(-1, len(FEATURE_COL_NAMES))
+        else:
+            page_cols[col_name] = np.array(
+                col_values, dtype=COLUMNAR_DTYPES.get(col_name, object))
+    return page_cols
+
+
+def _get_read_profile(
+        session: Session,
+        row_factory: Callable = None,
+        profile_name: str = LOW_LATENCY_READ_PROFILE
+) -> Union[str, ExecutionProfile]:
+    """Get a read profile (the low-latency one by default), with a custom row
+    factory if any."""
+    if row_factory is None:
+        return profile_name
+    # The row factory is bound to the response future, hence to all pages
+    return session.execution_profile_clone_update(
+        profile_name, row_factory=row_factory)
+
+
+def _iterate_pages(result_set: ResultSet) -> Iterator[ResultSet]:
+    """Yield a result set once per non-empty page, fetching pages on demand."""
+    while True:
+        if result_set.current_rows:
+            yield result_set
+        if not result_set.has_more_pages:
+            break
+        result_set.fetch_next_page()
+
+
+def _execute_paged(
+        session: Session,
+        query: str,
+        fetch_size: int,
+        row_factory: Callable = None,
+        parameters: tuple = None,
+        profile_name: str = LOW_LATENCY_READ_PROFILE
+) -> Iterator[ResultSet]:
+    """Execute an idempotent read via a read profile (the low-latency one by
+    default) and yield its result set once per non-empty page."""
+    statement = SimpleStatement(
+        query, fetch_size=fetch_size, is_idempotent=True)
+    result_set = session.execute(
+        statement,
+        parameters,
+        execution_profile=_get_read_profile(
+            session, row_factory, profile_name))
+    yield from _iterate_pages(result_set)
+
+
+def _rows_pages_to_df(pages: Iterable[ResultSet]) -> pd.DataFrame:
+    """Build a df from the rows of result pages."""
+    rows = []
+    col_names = None
+    for result_set in pages:
+        rows.extend(result_set.current_rows)
+        col_names = result_set.column_names
+    return pd.DataFrame(rows, columns=col_names)
+
+
+def _pages_to_df(
+        pages: Iterable[ResultSet],
+        is_columnar: bool
+) -> pd.DataFrame:
+    """Build a df from result pages decoded row-wise or column-wise."""
+    if is_columnar:
+        return _concat_columnar_pages([page.current_rows[0] for page in pages])
+    return _rows_pages_to_df(pages)
+
+
+def _columns_to_df(cols: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Build a df from per-column arrays, with a categorical subject id
+    and with the packed features (if any) expanded into one column each."""
+    expanded_cols = {}
+    for col_name, col_values in cols.items():
+        if col_name == PACKED_FEATS_COL_NAME:
+            expanded_cols.update(zip(FEATURE_COL_NAMES, col_values.T))
+        else:
+            expanded_cols[col_name] = col_values
+    df_from_cols = pd.DataFrame(expanded_cols, copy=False)
+    if CATEGORICAL_COL_NAME in df_from_cols.columns:
+        df_from_cols[CATEGORICAL_COL_NAME] = pd.Categorical(
+            df_from_cols[CATEGORICAL_COL_NAME])
+    return df_from_cols
+
+
+def _concat_columnar_pages(pages: list[dict[str, np.ndarray]]) -> pd.DataFrame:
+    """Concatenate columnar pages column-wise into a single df."""
+    if not pages:
+        return pd.DataFrame()
+    return _columns_to_df({
+        col_name: np.concatenate([page[col_name] for page in pages])
+        for col_name in pages[0]
+    })
+
+
+def get_all_data_from_table(
+        session: Session,
+        table_name: str,
+        is_columnar: bool = IS_COLUMNAR,
+        fetch_size: int = FETCH_SIZE,
+        is_compact: bool = IS_COMPACT
 ) -> pd.DataFrame:
     """
     Get all speech data from a table given an input session and table name.
@@ -62,11 +337,546 @@ def get_all_data_from_table(
             An Apache Cassandra DB session.
         table_name: str
             The name of the table of interest.
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+        is_compact: bool
+            Whether to apply the memory-compact dtype policy to the rows read
+            row-wise, as the columnar row factory does (False by default).
 
     Returns:
         pd.DataFrame
             A df with all speech data from a table.
     """
-    all_rows = session.execute(f'select * from {table_name};')
-    df_from_table = pd.DataFrame(list(all_rows))
+    if is_columnar:
+        return _concat_columnar_pages([
+            result_set.current_rows[0] for result_set in _execute_paged(
+                session,
+                f'select * from {table_name};',
+                fetch_size,
+                columnar_row_factory,
+                profile_name=FULL_SCAN_PROFILE)
+        ])
+
+    df_from_table = _rows_pages_to_df(_execute_paged(
+        session, f'select * from {table_name};', fetch_size,
+        profile_name=FULL_SCAN_PROFILE))
+    if is_compact:
+        df_from_table = apply_dtype_policy(df_from_table)
     return df_from_table
+
+
+def stream_data_from_table(
+        session: Session,
+        table_name: str,
+        fetch_size: int = FETCH_SIZE,
+        is_columnar: bool = IS_COLUMNAR,
+        is_compact: bool = IS_COMPACT
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream all speech data from a table given an input session and table
+    name, one driver page at a time, so that only a single page of rows
+    is held in memory.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+        fetch_size: int
+            The number of rows per page (5000 by default).
+        is_columnar: bool
+            Whether to decode each page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        is_compact: bool
+            Whether to apply the memory-compact dtype policy to the pages read
+            row-wise, as the columnar row factory does (False by default).
+
+    Yields:
+        pd.DataFrame
+            A df with the speech data of a single page.
+    """
+    query = f'select * from {table_name};'
+    if is_columnar:
+        for result_set in _execute_paged(
+                session, query, fetch_size, columnar_row_factory,
+                profile_name=FULL_SCAN_PROFILE):
+            yield _columns_to_df(result_set.current_rows[0])
+    else:
+        for result_set in _execute_paged(
+                session, query, fetch_size, profile_name=FULL_SCAN_PROFILE):
+            page_df = pd.DataFrame(
+                result_set.current_rows, columns=result_set.column_names)
+            yield apply_dtype_policy(page_df) if is_compact else page_df
+
+
+def _split_token_ring(
+        ranges_num: int
+) -> list[tuple[int, int]]:
+    """Split the Murmur3 token ring into contiguous (start, end] sub-ranges."""
+    step = (MAX_TOKEN - MIN_TOKEN) // ranges_num
+    bounds = [MIN_TOKEN + i * step for i in range(ranges_num)] + [MAX_TOKEN]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_token_range(
+        session: Session,
+        table_name: str,
+        token_range: tuple[int, int],
+        fetch_size: int,
+        is_columnar: bool
+) -> Union[pd.DataFrame, list[dict[str, np.ndarray]]]:
+    """Read all rows whose partition key falls into a token sub-range,
+    as a df or as a list of columnar pages."""
+    query = (f'select * from {table_name} '
+             f'where token({PRIMARY_KEY_COL_NAME}) > %s '
+             f'and token({PRIMARY_KEY_COL_NAME}) <= %s;')
+    if is_columnar:
+        return [
+            result_set.current_rows[0] for result_set in _execute_paged(
+                session, query, fetch_size, columnar_row_factory, token_range,
+                FULL_SCAN_PROFILE)
+        ]
+
+    return _rows_pages_to_df(_execute_paged(
+        session, query, fetch_size, parameters=token_range,
+        profile_name=FULL_SCAN_PROFILE))
+
+
+def scan_table_in_parallel(
+        session: Session,
+        table_name: str,
+        ranges_num: int = TOKEN_RANGES_NUM,
+        workers_num: int = SCAN_WORKERS_NUM,
+        is_columnar: bool = IS_COLUMNAR,
+        fetch_size: int = FETCH_SIZE
+) -> pd.DataFrame:
+    """
+    Get all speech data from a table given an input session and table name,
+    by splitting the token ring into sub-ranges, reading them concurrently
+    on a thread pool (and hence via different coordinators) and merging
+    the partial results.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+        ranges_num: int
+            The number of token sub-ranges to split the ring into
+            (32 by default).
+        workers_num: int
+            The number of sub-ranges read concurrently (8 by default).
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+
+    Returns:
+        pd.DataFrame
+            A df with all speech data from a table, in token order.
+    """
+    with ThreadPoolExecutor(max_workers=workers_num) as executor:
+        partial_results = list(executor.map(
+            lambda token_range: _read_token_range(
+                session, table_name, token_range, fetch_size, is_columnar),
+            _split_token_ring(ranges_num)))
+
+    if is_columnar:
+        return _concat_columnar_pages(
+            [page for pages in partial_results for page in pages])
+    non_empty_dfs = [
+        partial_df for partial_df in partial_results if not partial_df.empty]
+    if not non_empty_dfs:
+        return pd.DataFrame()
+    return pd.concat(non_empty_dfs, ignore_index=True)
+
+
+def get_feats_and_targets_from_table(
+        session: Session,
+        table_name: str,
+        fetch_size: int = FETCH_SIZE
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the dense matrix of speech features and the array of target labels
+    from a table storing the features as a packed vector, decoding each
+    result page straight into a 2-D array.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest (created with is_packed=True).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]
+            The float32 matrix of features (one column per feature, in the
+            order of FEATURE_COL_NAMES) and the int8 array of target labels.
+    """
+    query = (f'select {PACKED_FEATS_COL_NAME}, {TARGET_COL_NAME} '
+             f'from {table_name};')
+    pages = [
+        result_set.current_rows[0] for result_set in _execute_paged(
+            session, query, fetch_size, columnar_row_factory,
+            profile_name=FULL_SCAN_PROFILE)
+    ]
+    if not pages:
+        return (np.empty((0, len(FEATURE_COL_NAMES)), dtype=np.float32),
+                np.empty(0, dtype=np.int8))
+    return (np.concatenate([page[PACKED_FEATS_COL_NAME] for page in pages]),
+            np.concatenate([page[TARGET_COL_NAME] for page in pages]))
+
+
+def _read_partitions(
+        session: Session,
+        query: str,
+        parameters: list[tuple],
+        is_columnar: bool,
+        concurrency: int,
+        fetch_size: int
+) -> pd.DataFrame:
+    """Run a single-partition read once per set of parameters, concurrently,
+    and merge the results into a df."""
+    # A prepared statement carries the routing key for token-aware routing
+    statement = session.prepare(query)
+    statement.is_idempotent = True
+    statement.fetch_size = fetch_size
+
+    results = execute_concurrent_with_args(
+        session,
+        statement,
+        parameters,
+        concurrency=concurrency,
+        execution_profile=_get_read_profile(
+            session, columnar_row_factory if is_columnar else None))
+    return _pages_to_df(
+        (page for _, result_set in results for page in _iterate_pages(result_set)),
+        is_columnar)
+
+
+def get_recordings_of_subjects(
+        session: Session,
+        table_name: str,
+        subject_ids: list[str],
+        is_columnar: bool = IS_COLUMNAR,
+        concurrency: int = CONCURRENCY_NUM,
+        fetch_size: int = FETCH_SIZE
+) -> pd.DataFrame:
+    """
+    Get all recordings of a batch of subjects from a table keyed by subject
+    partitions, by reading the partitions concurrently, each one from a
+    replica owning it.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest (created with
+            is_partitioned=True).
+        subject_ids: list[str]
+            The ids of the subjects of interest.
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        concurrency: int
+            The maximum number of partition reads in flight (100 by default).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+
+    Returns:
+        pd.DataFrame
+            A df with the recordings of the subjects, ordered by subject
+            and recording id.
+    """
+    return _read_partitions(
+        session,
+        f'select * from {table_name} where {PRIMARY_KEY_COL_NAME} = ?;',
+        [(subject_id,) for subject_id in subject_ids],
+        is_columnar,
+        concurrency,
+        fetch_size)
+
+
+def get_subject_recordings(
+        session: Session,
+        table_name: str,
+        subject_id: str,
+        is_columnar: bool = IS_COLUMNAR
+) -> pd.DataFrame:
+    """
+    Get all recordings of a subject from a table keyed by subject partitions
+    via a single partition read.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest (created with
+            is_partitioned=True).
+        subject_id: str
+            The id of the subject of interest.
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+
+    Returns:
+        pd.DataFrame
+            A df with the recordings of the subject, ordered by recording id.
+    """
+    return get_recordings_of_subjects(
+        session, table_name, [subject_id], is_columnar)
+
+
+def create_status_index(
+        session: Session,
+        table_name: str,
+        is_sai: bool = IS_SAI
+) -> None:
+    """
+    Index the 'status' column of a table, so that reads can be filtered
+    by class on the server side.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest.
+        is_sai: bool
+            Whether to create a storage-attached index (SAI, from Cassandra
+            5.0) rather than a legacy secondary index (False by default).
+    """
+    if is_sai:
+        session.execute(
+            f"CREATE CUSTOM INDEX IF NOT EXISTS ON {table_name} "
+            f"({TARGET_COL_NAME}) USING 'StorageAttachedIndex'")
+    else:
+        session.execute(
+            f"CREATE INDEX IF NOT EXISTS ON {table_name} ({TARGET_COL_NAME})")
+
+
+def get_filtered_data_from_table(
+        session: Session,
+        table_name: str,
+        cols: list[str] = None,
+        status: int = None,
+        subject_ids: list[str] = None,
+        is_columnar: bool = IS_COLUMNAR,
+        concurrency: int = CONCURRENCY_NUM,
+        fetch_size: int = FETCH_SIZE
+) -> pd.DataFrame:
+    """
+    Get the speech data from a table matching a class and/or a subset of
+    subjects, with only the selected columns, filtering and projecting
+    them on the server side rather than after a full-table read.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest (whose 'status' column is
+            indexed via create_status_index if filtering by status only).
+        cols: list[str]
+            The columns to read (None by default, i.e., all columns).
+        status: int
+            The class to retain (None by default, i.e., all classes).
+        subject_ids: list[str]
+            The subjects to retain, each read from its own partition
+            concurrently (None by default, i.e., all subjects).
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        concurrency: int
+            The maximum number of partition reads in flight (100 by default).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+
+    Returns:
+        pd.DataFrame
+            A df with the filtered and projected speech data.
+    """
+    select_clause = f"select {', '.join(cols) if cols else '*'} from {table_name}"
+    # Partition reads are prepared, hence bound by '?' rather than '%s'
+    status_clause = f"{TARGET_COL_NAME} = " + (
+        '?' if subject_ids is not None else '%s')
+
+    if subject_ids is not None:
+        if status is None:
+            return _read_partitions(
+                session,
+                f"{select_clause} where {PRIMARY_KEY_COL_NAME} = ?;",
+                [(subject_id,) for subject_id in subject_ids],
+                is_columnar, concurrency, fetch_size)
+        # Filtering is bounded to a single partition per read
+        return _read_partitions(
+            session,
+            f"{select_clause} where {PRIMARY_KEY_COL_NAME} = ? "
+            f"and {status_clause} allow filtering;",
+            [(subject_id, status) for subject_id in subject_ids],
+            is_columnar, concurrency, fetch_size)
+
+    if status is None:
+        return _pages_to_df(
+            _execute_paged(
+                session, f"{select_clause};", fetch_size,
+                columnar_row_factory if is_columnar else None,
+                profile_name=FULL_SCAN_PROFILE),
+            is_columnar)
+    # The index on the 'status' column is read on every node
+    return _pages_to_df(
+        _execute_paged(
+            session, f"{select_clause} where {status_clause};", fetch_size,
+            columnar_row_factory if is_columnar else None, (status,),
+            FULL_SCAN_PROFILE),
+        is_columnar)
+
+
+def get_class_sampled_data_from_table(
+        session: Session,
+        table_name: str,
+        samples_per_class: int = None,
+        cols: list[str] = None,
+        class_labels: tuple[int, ...] = CLASS_LABELS,
+        random_state: int = RANDOM_STATE,
+        is_columnar: bool = IS_COLUMNAR,
+        fetch_size: int = FETCH_SIZE,
+        sampled_tokens_num: int = SAMPLED_TOKENS_NUM,
+        per_partition_limit: int = PER_PARTITION_LIMIT
+) -> pd.DataFrame:
+    """
+    Get a sample of at most n rows per class from a table, where n is the
+    number of rows of the minority class by default, thus reading only the
+    rows of a balanced set rather than the whole table.
+
+    Rows are stored in the order of the (Murmur3) hash of their partition key,
+    i.e., in a pseudo-random order wrt their content. Each class is thus
+    sampled, via the index on the 'status' column, by splitting the token ring
+    at random tokens and reading the first rows of each sub-range, as many as
+    its share of n (plus the rows missing from the previous sub-ranges).
+    This is not a uniform sample: the rows read from a sub-range are adjacent
+    on the ring, i.e., clustered, and so are the rows of a partition, e.g.,
+    the recordings of a subject in a partitioned table, unless limited via
+    per_partition_limit. A class whose rows are all needed is read whole, and
+    fewer than n rows may be sampled if the last sub-ranges hold fewer rows
+    than are missing, i.e., if n is close to the number of rows of the class.
+
+    Args:
+        session: Session
+            An Apache Cassandra DB session.
+        table_name: str
+            The name of the table of interest (whose 'status' column is
+            indexed via create_status_index).
+        samples_per_class: int
+            The maximum number of rows per class (None by default, i.e., the
+            number of rows of the minority class, counted via the index on
+            the 'status' column, i.e., by scanning the whole cluster once
+            per class).
+        cols: list[str]
+            The columns to read (None by default, i.e., all columns).
+        class_labels: tuple[int, ...]
+            The classes to sample ((0, 1) by default).
+        random_state: int
+            The random state to draw the tokens splitting the ring in a
+            reproducible manner.
+        is_columnar: bool
+            Whether to decode each result page straight into per-column
+            typed arrays via the columnar row factory (False by default).
+        fetch_size: int
+            The number of rows per page (5000 by default).
+        sampled_tokens_num: int
+            The number of random tokens splitting the token ring per class
+            (256 by default), i.e., the fewer rows per sub-range, the less
+            clustered the sample, but the more reads.
+        per_partition_limit: int
+            The maximum number of rows read per partition per sub-range
+            (None by default, i.e., no maximum).
+
+    Returns:
+        pd.DataFrame
+            A df with the sampled speech data of each class.
+    """
+    class_counts = None
+    if samples_per_class is None:
+        class_counts = {
+            class_label: session.execute(
+                f"select count(*) from {table_name} "
+                f"where {TARGET_COL_NAME} = %s;",
+                (class_label,)).one()[0]
+            for class_label in class_labels}
+        samples_per_class = min(class_counts.values())
+
+    select_clause = f"select {', '.join(cols) if cols else '*'} from {table_name}"
+    per_partition_clause = (
+        f" per partition limit {per_partition_limit}"
+        if per_partition_limit else "")
+    row_factory = columnar_row_factory if is_columnar else None
+    random_generator = np.random.default_rng(random_state)
+
+    pages_rows = []
+    col_names = None
+    for class_label in class_labels:
+        if (class_counts is not None
+                and class_counts[class_label] <= samples_per_class):
+            split_tokens = []
+        else:
+            split_tokens = np.sort(random_generator.integers(
+                MIN_TOKEN, MAX_TOKEN, sampled_tokens_num)).tolist()
+        token_bounds = [MIN_TOKEN] + split_tokens + [MAX_TOKEN]
+        range_quotas = np.diff(np.linspace(
+            0, samples_per_class, len(token_bounds)).round().astype(int))
+
+        missing_rows_num = 0
+        for lower_token, upper_token, range_quota in zip(
+                token_bounds[:-1], token_bounds[1:], range_quotas):
+            rows_limit = int(range_quota) + missing_rows_num
+            if rows_limit == 0:
+                continue
+            range_rows, col_names = _copy_pages_rows(_execute_paged(
+                session,
+                f"{select_clause} where {TARGET_COL_NAME} = %s "
+                f"and token({PRIMARY_KEY_COL_NAME}) > %s "
+                f"and token({PRIMARY_KEY_COL_NAME}) <= %s"
+                f"{per_partition_clause} limit %s;",
+                fetch_size, row_factory,
+                (class_label, lower_token, upper_token, rows_limit)),
+                is_columnar, col_names)
+            pages_rows.extend(range_rows)
+            missing_rows_num = rows_limit - sum(
+                _count_page_rows(page_rows, is_columnar)
+                for page_rows in range_rows)
+
+    if is_columnar:
+        return _concat_columnar_pages(pages_rows)
+    return pd.DataFrame(
+        [row for page_rows in pages_rows for row in page_rows], columns=col_names)
+
+
+def _copy_pages_rows(
+        pages: Iterable[ResultSet],
+        is_columnar: bool,
+        col_names: list[str] = None
+) -> tuple[list, list[str]]:
+    """Copy the rows of each result page, decoded row-wise or column-wise,
+    before the next page is fetched into the same result set, along with
+    the column names (col_names if there are no pages)."""
+    pages_rows = []
+    for result_set in pages:
+        pages_rows.append(
+            result_set.current_rows[0] if is_columnar
+            else list(result_set.current_rows))
+        col_names = result_set.column_names
+    return pages_rows, col_names
+
+
+def _count_page_rows(
+        page_rows: Union[list, dict[str, np.ndarray]],
+        is_columnar: bool
+) -> int:
+    """Count the rows of a result page decoded row-wise or column-wise."""
+    if is_columnar:
+        return len(next(iter(page_rows.values())))
+    return len(page_rows)
@@ -0,0 +1,344 @@
+"""
+This file builds the train and test datasets incrementally, via a graph of
+stages (preparing each speech dataset, then merging them into train and test
+sets), by fingerprinting each stage via the content hashes of its input files
+and the parameters it depends on, and skipping the stages whose fingerprints
+and outputs are unchanged since they were last built.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Optional
+
+from src.create_train_and_test_data.constants import (BUILD_MANIFEST_FILE_STR,
+                                                      TEST_CSV_FILE_STR,
+                                                      TEST_DATASET_NAMES,
+                                                      TRAIN_CSV_FILE_STR,
+                                                      TRAIN_DATASET_NAMES)
+from src.create_train_and_test_data.merge_speech_data import (
+    TRAIN_TEST_DATA_DIR, get_processed_dataset_path, merge_speech_datasets)
+from src.get_src_dir import get_src_path
+from src.process_data.constants import (COMPACT_DTYPES, DATA_DIR_STR,
+                                        NEW_COL_NAMES, PREPARE_WORKERS_NUM,
+                                        SPEECH_DATASETS)
+from src.process_data.prepare_data import prepare_speech_datasets
+
+logging.basicConfig(level=logging.INFO)
+
+ROOT_DIR_STR = str(get_src_path())
+BUILD_MANIFEST_PATH = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{BUILD_MANIFEST_FILE_STR}"
+
+# Size of the blocks in which files are read to hash their content
+HASH_BLOCK_BYTES = 2**20
+
+
+def load_manifest(manifest_path: str = BUILD_MANIFEST_PATH) -> dict:
+    """
+    Load the manifest of the fingerprints of the stages built so far, and of
+    the content hashes of the files hashed so far.
+
+    Args:
+        manifest_path: str
+            The path to the manifest (by default, 'build_manifest.json'
+            inside the data directory).
+
+    Returns:
+        dict
+            The manifest, empty if not built yet.
+    """
+    if not os.path.exists(manifest_path):
+        return {'stages': {}, 'file_hashes': {}}
+    with open(manifest_path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(
+        manifest: dict,
+        manifest_path: str = BUILD_MANIFEST_PATH) -> None:
+    """
+    Save the manifest atomically, i.e., via a temporary file then renamed.
+
+    Args:
+        manifest: dict
+            The manifest to save.
+        manifest_path: str
+            The path to the manifest (by default, 'build_manifest.json'
+            inside the data directory).
+    """
+    tmp_manifest_path = f"{manifest_path}.tmp"
+    with open(tmp_manifest_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(tmp_manifest_path, manifest_path)
+
+
+def hash_file(
+        file_path: str,
+        manifest: dict) -> str:
+    """
+    Hash the content of a file, reusing its hash recorded in the manifest if
+    the file's size and modification time are unchanged since it was hashed.
+
+    Args:
+        file_path: str
+            The path to the file to hash.
+        manifest: dict
+            The manifest, whose file hashes are updated in place.
+
+    Returns:
+        str
+            The SHA-256 hash of the content of the file.
+    """
+    file_stat = os.stat(file_path)
+    file_hash = manifest['file_hashes'].get(file_path)
+    if (file_hash is not None
+            and file_hash['size'] == file_stat.st_size
+            and file_hash['mtime_ns'] == file_stat.st_mtime_ns):
+        return file_hash['hash']
+
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b''):
+            sha256.update(block)
+    manifest['file_hashes'][file_path] = {
+        'size': file_stat.st_size,
+        'mtime_ns': file_stat.st_mtime_ns,
+        'hash': sha256.hexdigest()
+    }
+    return sha256.hexdigest()
+
+
+def get_stage_fingerprint(
+        input_paths: list[str],
+        params: dict,
+        manifest: dict) -> str:
+    """
+    Get the fingerprint of a stage given its input files and parameters.
+
+    Args:
+        input_paths: list[str]
+            The paths to the input files of the stage.
+        params: dict
+            The (JSON-serialisable) parameters the stage depends on.
+        manifest: dict
+            The manifest, whose file hashes are updated in place.
+
+    Returns:
+        str
+            The SHA-256 hash of the content hashes of the input files
+            (keyed by their paths relative to the source directory, so that
+            the fingerprint does not depend on where the repo is) and of the
+            parameters.
+    """
+    input_hashes = {
+        os.path.relpath(input_path, ROOT_DIR_STR):
+            hash_file(input_path, manifest)
+        for input_path in input_paths
+    }
+    return hashlib.sha256(
+        json.dumps(
+            {'inputs': input_hashes, 'params': params}, sort_keys=True
+        ).encode()).hexdigest()
+
+
+def is_stage_up_to_date(
+        stage_name: str,
+        fingerprint: str,
+        output_paths: list[str],
+        manifest: dict) -> bool:
+    """
+    Check whether a stage is up to date, i.e., whether it was last built with
+    the same fingerprint and its outputs have not been modified since.
+
+    Args:
+        stage_name: str
+            The name of the stage.
+        fingerprint: str
+            The current fingerprint of the stage.
+        output_paths: list[str]
+            The paths to the output files of the stage.
+        manifest: dict
+            The manifest.
+
+    Returns:
+        bool
+            Whether the stage is up to date.
+    """
+    stage = manifest['stages'].get(stage_name)
+    return (stage is not None
+            and stage['fingerprint'] == fingerprint
+            and all(os.path.exists(output_path)
+                    and hash_file(output_path, manifest) == stage['outputs'].get(output_path)
+                    for output_path in output_paths))
+
+
+def record_stage(
+        stage_name: str,
+        fingerprint: str,
+        output_paths: list[str],
+        manifest: dict) -> None:
+    """
+    Record a stage as built in the manifest, along with the content hashes
+    of its outputs.
+
+    Args:
+        stage_name: str
+            The name of the stage.
+        fingerprint: str
+            The fingerprint the stage was built with.
+        output_paths: list[str]
+            The paths to the output files of the stage.
+        manifest: dict
+            The manifest, updated in place.
+    """
+    manifest['stages'][stage_name] = {
+        'fingerprint': fingerprint,
+        'outputs': {
+            output_path: hash_file(output_path, manifest)
+            for output_path in output_paths
+        }
+    }
+
+
+def run_stage(
+        stage_name: str,
+        input_paths: list[str],
+        output_paths: list[str],
+        params: dict,
+        build_fn: Callable[[], object],
+        manifest: dict,
+        is_forced: bool = False) -> bool:
+    """
+    Run a stage unless it is up to date.
+
+    Args:
+        stage_name: str
+            The name of the stage.
+        input_paths: list[str]
+            The paths to the input files of the stage.
+        output_paths: list[str]
+            The paths to the output files of the stage.
+        params: dict
+            The (JSON-serialisable) parameters the stage depends on.
+        build_fn: Callable[[], object]
+            The function building the outputs of the stage (atomically).
+        manifest: dict
+            The manifest, updated in place.
+        is_forced: bool
+            Whether to run the stage even if up to date (False by default).
+
+    Returns:
+        bool
+            Whether the stage was run (rather than skipped).
+    """
+    fingerprint = get_stage_fingerprint(input_paths, params, manifest)
+    if not is_forced and is_stage_up_to_date(
+            stage_name, fingerprint, output_paths, manifest):
+        logging.info(f"Skipped the stage {stage_name}, as up to date.")
+        return False
+
+    build_fn()
+    record_stage(stage_name, fingerprint, output_paths, manifest)
+    logging.info(f"Built the stage {stage_name}.")
+    return True
+
+
+def build_train_and_test_data(
+        datasets: dict[str, dict] = SPEECH_DATASETS,
+        train_dataset_names: list[str] = TRAIN_DATASET_NAMES,
+        test_dataset_names: list[str] = TEST_DATASET_NAMES,
+        workers_num: Optional[int] = PREPARE_WORKERS_NUM,
+        manifest_path: str = BUILD_MANIFEST_PATH,
+        is_forced: bool = False) -> dict[str, bool]:
+    """
+    Build the train and test datasets incrementally, by preparing (in parallel)
+    only the speech datasets whose initial csv files or registry entries have
+    changed, then merging them into train and test sets only if any processed
+    csv file has changed.
+
+    Args:
+        datasets: dict[str, dict]
+            The registry of datasets.
+        train_dataset_names: list[str]
+            The names of the datasets to merge into the train set.
+        test_dataset_names: list[str]
+            The names of the datasets to merge into the test set.
+        workers_num: Optional[int]
+            The number of worker processes preparing the datasets (None by
+            default, i.e., as many as the CPU cores).
+        manifest_path: str
+            The path to the manifest (by default, 'build_manifest.json'
+            inside the data directory).
+        is_forced: bool
+            Whether to rebuild all stages even if up to date (False by default).
+
+    Returns:
+        dict[str, bool]
+            Whether each stage was run (rather than skipped).
+    """
+    manifest = load_manifest(manifest_path)
+    stages_run = {}
+
+    prepare_fingerprints = {}
+    for dataset_name in train_dataset_names + test_dataset_names:
+        stage_name = f"prepare_{dataset_name}"
+        input_path = (f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}"
+                      f"{datasets[dataset_name]['csv_path']}")
+        output_paths = [get_processed_dataset_path(dataset_name, datasets)]
+
+        if not os.path.exists(input_path) and os.path.exists(output_paths[0]):
+            # E.g., initial csv files not redistributed with the repo,
+            # whose processed csv files can thus be used as they are
+            logging.warning(
+                f"Skipped the stage {stage_name}, as its input {input_path} is "
+                f"missing but its output {output_paths[0]} exists.")
+            stages_run[stage_name] = False
+            continue
+
+        fingerprint = get_stage_fingerprint(
+            [input_path],
+            {'dataset': datasets[dataset_name],
+             'new_column_names': NEW_COL_NAMES,
+             'compact_dtypes': COMPACT_DTYPES},
+            manifest)
+        stages_run[stage_name] = is_forced or not is_stage_up_to_date(
+            stage_name, fingerprint, output_paths, manifest)
+        if stages_run[stage_name]:
+            prepare_fingerprints[dataset_name] = fingerprint
+        else:
+            logging.info(f"Skipped the stage {stage_name}, as up to date.")
+
+    if prepare_fingerprints:
+        prepare_speech_datasets(
+            {dataset_name: datasets[dataset_name]
+             for dataset_name in prepare_fingerprints},
+            workers_num)
+        for dataset_name, fingerprint in prepare_fingerprints.items():
+            record_stage(
+                f"prepare_{dataset_name}", fingerprint,
+                [get_processed_dataset_path(dataset_name, datasets)], manifest)
+        # Persist the prepare stages already, in case the merge stage fails
+        save_manifest(manifest, manifest_path)
+
+    stages_run['merge'] = run_stage(
+        'merge',
+        [get_processed_dataset_path(dataset_name, datasets)
+         for dataset_name in train_dataset_names + test_dataset_names],
+        [f"{TRAIN_TEST_DATA_DIR}{os.sep}{TRAIN_CSV_FILE_STR}",
+         f"{TRAIN_TEST_DATA_DIR}{os.sep}{TEST_CSV_FILE_STR}"],
+        {'train_dataset_names': train_dataset_names,
+         'test_dataset_names': test_dataset_names,
+         'new_column_names': NEW_COL_NAMES,
+         'compact_dtypes': COMPACT_DTYPES},
+        lambda: merge_speech_datasets(
+            train_dataset_names, test_dataset_names, datasets),
+        manifest,
+        is_forced)
+
+    save_manifest(manifest, manifest_path)
+    return stages_run
+
+
+if __name__ == '__main__':
+    build_train_and_test_data()
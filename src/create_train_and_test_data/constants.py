@@ -0,0 +1,22 @@
+"""
+Constants to aid the creation of the train and test datasets.
+"""
+
+# Names of the speech datasets (as per the registry of datasets) merged into
+# the train set, i.e., past data (from 2008 to 2013), and into the test set,
+# i.e., future data (from 2018)
+TRAIN_DATASET_NAMES = ['little_2008', 'little_2009', 'naranjo_2016',
+                       'sakar_2013_train', 'sakar_2013_test']
+TEST_DATASET_NAMES = ['sakar_2018']
+
+TRAIN_TEST_DATA_DIR_STR = 'train_and_test_sets'
+TRAIN_CSV_FILE_STR = 'train_data.csv'
+TEST_CSV_FILE_STR = 'test_data.csv'
+
+# Manifest of the fingerprints of the stages of the incremental build
+BUILD_MANIFEST_FILE_STR = 'build_manifest.json'
+
+# Whether to merge the speech datasets by streaming them in chunks, rather than
+# loading them fully into memory, and the number of rows per chunk
+IS_STREAMED = False
+MERGE_CHUNK_SIZE = 10000
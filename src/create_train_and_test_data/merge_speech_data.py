@@ -10,49 +10,148 @@ the second and last set of (other) subjects, i.e.,
 representing 'unseen', real life-like data to the model.
 """
 
+import logging
 import os
 
 import pandas as pd
 
+from src.constants import TARGET_COL_NAME
+from src.create_train_and_test_data.constants import (IS_STREAMED,
+                                                      MERGE_CHUNK_SIZE,
+                                                      TEST_CSV_FILE_STR,
+                                                      TEST_DATASET_NAMES,
+                                                      TRAIN_CSV_FILE_STR,
+                                                      TRAIN_DATASET_NAMES,
+                                                      TRAIN_TEST_DATA_DIR_STR)
 from src.get_src_dir import get_src_path
-from src.process_data.constants import DATA_DIR_STR
+from src.process_data.columnar_cache import load_csv_columns
+from src.process_data.constants import (COMPACT_DTYPES, DATA_DIR_STR,
+                                        NEW_COL_NAMES, SPEECH_DATASETS)
+from src.process_data.utils import get_processed_file_path, save_df_atomically
 
 ROOT_DIR_STR = str(get_src_path())
+TRAIN_TEST_DATA_DIR = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{TRAIN_TEST_DATA_DIR_STR}"
 
 
-def merge_speech_datasets() -> None:
-    """Merge speech datasets into train and test sets"""
-    file_paths = {
-        'LITTLE_2008_CSV_PATH': 'Little_2008/parkinsons_data_processed.csv',
-        'LITTLE_2009_CSV_PATH': 'Little_2009/parkinsons_updrs_processed.csv',
-        'NARANJO_2016_CSV_PATH':
-            'Naranjo_et_al_2016/ReplicatedAcousticFeatures-ParkinsonDatabase_processed.csv',
-        'SAKAR_2013_TRAIN_CSV_PATH': 'Sakar_et_al_2013/train_data_processed.csv',
-        'SAKAR_2013_TEST_CSV_PATH': 'Sakar_et_al_2013/test_data_processed.csv',
-        'SAKAR_2018_CSV_PATH': 'Sakar_et_al_2018/pd_speech_features_processed.csv'}
+def get_processed_dataset_path(
+        dataset_name: str,
+        datasets: dict[str, dict] = SPEECH_DATASETS) -> str:
+    """
+    Get the full path to the processed csv file of a speech dataset.
 
-    dfs = {}
-    for key, file_path in file_paths.items():
-        df_name = key.replace("_csv_path", "_df")
-        dfs[df_name] = pd.read_csv(
-            f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{file_path}")
+    Args:
+        dataset_name: str
+            The name of the dataset in the registry of datasets.
+        datasets: dict[str, dict]
+            The registry of datasets.
+
+    Returns:
+        str
+            The full path to the processed csv file of the dataset.
+    """
+    return (f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}"
+            f"{get_processed_file_path(datasets[dataset_name]['csv_path'])}")
+
+
+def stream_datasets_to_csv(
+        dataset_names: list[str],
+        csv_full_path: str,
+        datasets: dict[str, dict] = SPEECH_DATASETS,
+        chunk_size: int = MERGE_CHUNK_SIZE) -> int:
+    """
+    Merge speech datasets into a csv file by streaming them in chunks, dropping
+    the rows with missing values of each chunk and appending it to the csv file,
+    so that at most one chunk is held in memory at a time.
+
+    Args:
+        dataset_names: list[str]
+            The names of the datasets to merge.
+        csv_full_path: str
+            The full path to the merged csv file, written atomically.
+        datasets: dict[str, dict]
+            The registry of datasets.
+        chunk_size: int
+            The number of rows per chunk (10000 by default).
+
+    Returns:
+        int
+            The number of rows merged.
+    """
+    cols = NEW_COL_NAMES + [TARGET_COL_NAME]
+    rows_num = 0
+    tmp_csv_full_path = f"{csv_full_path}.tmp"
+    with open(tmp_csv_full_path, 'w', encoding='utf-8', newline='') as csv_file:
+        # Write the header once, even if no rows are merged
+        pd.DataFrame(columns=cols).to_csv(csv_file, index=False)
+        for dataset_name in dataset_names:
+            # Parse the subject IDs as text and the target as a nullable
+            # integer, so that each chunk is written back as in the processed
+            # csv file, whichever values the chunk happens to hold
+            chunks = pd.read_csv(
+                get_processed_dataset_path(dataset_name, datasets),
+                usecols=cols,
+                dtype={NEW_COL_NAMES[0]: str, TARGET_COL_NAME: 'Int8'},
+                chunksize=chunk_size)
+            for chunk in chunks:
+                chunk = chunk[cols].dropna()
+                chunk.to_csv(csv_file, header=False, index=False)
+                rows_num += len(chunk)
+    os.replace(tmp_csv_full_path, csv_full_path)
+    return rows_num
+
+
+def merge_speech_datasets(
+        train_dataset_names: list[str] = TRAIN_DATASET_NAMES,
+        test_dataset_names: list[str] = TEST_DATASET_NAMES,
+        datasets: dict[str, dict] = SPEECH_DATASETS,
+        is_streamed: bool = IS_STREAMED,
+        chunk_size: int = MERGE_CHUNK_SIZE) -> None:
+    """
+    Merge speech datasets into train and test sets.
+
+    Args:
+        train_dataset_names: list[str]
+            The names of the datasets to merge into the train set.
+        test_dataset_names: list[str]
+            The names of the datasets to merge into the test set.
+        datasets: dict[str, dict]
+            The registry of datasets.
+        is_streamed: bool
+            Whether to stream the datasets in chunks rather than loading them
+            fully into memory, yielding the same train and test sets (False
+            by default).
+        chunk_size: int
+            The number of rows per chunk when streaming (10000 by default).
+    """
+    os.makedirs(TRAIN_TEST_DATA_DIR, exist_ok=True)
+    train_csv_full_path = f"{TRAIN_TEST_DATA_DIR}{os.sep}{TRAIN_CSV_FILE_STR}"
+    test_csv_full_path = f"{TRAIN_TEST_DATA_DIR}{os.sep}{TEST_CSV_FILE_STR}"
+
+    if is_streamed:
+        train_rows_num = stream_datasets_to_csv(
+            train_dataset_names, train_csv_full_path, datasets, chunk_size)
+        test_rows_num = stream_datasets_to_csv(
+            test_dataset_names, test_csv_full_path, datasets, chunk_size)
+        logging.info(
+            f"Merged {train_rows_num} train rows and {test_rows_num} test rows.")
+        return
+
+    dfs = {
+        dataset_name: load_csv_columns(
+            get_processed_dataset_path(dataset_name, datasets),
+            NEW_COL_NAMES + [TARGET_COL_NAME], COMPACT_DTYPES)
+        for dataset_name in train_dataset_names + test_dataset_names
+    }
 
     train_data = pd.concat(
-        [dfs['little_2008_df'], dfs['little_2009_df'], dfs['naranjo_2016_df'],
-            dfs['sakar_2013_train_df'], dfs['sakar_2013_test_df']]
-    ).dropna()
-
-    test_data = dfs['sakar_2018_df'].dropna()
-
-    train_test_data_dir_name = 'train_and_test_sets'
-    train_data.to_csv(
-        f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}"
-        f"{train_test_data_dir_name}{os.sep}{'train_data.csv'}",
-        index=False)
-    test_data.to_csv(
-        f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}"
-        f"{train_test_data_dir_name}{os.sep}{'test_data.csv'}",
-        index=False)
+        [dfs[dataset_name] for dataset_name in train_dataset_names]).dropna()
+    test_data = pd.concat(
+        [dfs[dataset_name] for dataset_name in test_dataset_names]).dropna()
+
+    save_df_atomically(train_data, train_csv_full_path)
+    save_df_atomically(test_data, test_csv_full_path)
+    logging.info(
+        f"Merged {len(train_data)} train rows and {len(test_data)} test rows.")
 
 
 if __name__ == '__main__':
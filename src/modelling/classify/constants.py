@@ -9,3 +9,54 @@ LEARNING_RATE = 0.1
 ESTIMATORS_NUM = 15
 MAX_FEATS = 'sqrt'
 SUB_SAMPLING = 0.6
+
+# GBT engine, either the classic one ('classic'), finding exact splits, or the
+# histogram-based one ('hist'), finding splits among the (at most MAX_BINS) bins
+# of each feature, across the CPU cores, and stopping early once the loss on
+# the validation samples stops improving for ITER_NO_CHANGE iterations
+CLASSIC_ENGINE = 'classic'
+HIST_ENGINE = 'hist'
+GBT_ENGINE = CLASSIC_ENGINE
+MAX_BINS = 255
+IS_EARLY_STOPPED = True
+ITER_NO_CHANGE = 5
+VALIDATION_FRACTION = 0.1
+
+# Names of the hyperparameters of the classic GBT engine in the histogram-based
+# one, None for those it does not support (i.e., row subsampling and, as of the
+# pinned scikit-learn 1.2, feature subsampling, all features being considered
+# at each split)
+HIST_PARAM_NAMES = {
+    'n_estimators': 'max_iter',
+    'subsample': None,
+    'max_features': None
+}
+
+# Hyperparameter grid of the GBT classifier, searched if optimising it
+PARAM_GRID = {
+    'gbt__n_estimators': [10, 20, 30, 50, 100],
+    'gbt__learning_rate': [0.05, 0.15, 0.2, 0.25, 0.3],
+    'gbt__max_depth': [3, 4, 5, 7, 9, 12, 15],
+    'gbt__n_iter_no_change': [5, 7, 9, 11, 15],
+    'gbt__subsample': [0.3, 0.5, 0.7, 0.9],
+    'gbt__max_leaf_nodes': [None],
+}
+
+# Hyperparameter search, either exhaustive ('grid') or via successive halving
+# ('halving'), i.e., evaluating all candidates on a small resource (number of
+# samples or of estimators), then the best 1 / HALVING_FACTOR of them on
+# HALVING_FACTOR times more resource, and so on
+GRID_SEARCH_MODE = 'grid'
+HALVING_SEARCH_MODE = 'halving'
+SEARCH_MODE = GRID_SEARCH_MODE
+HALVING_FACTOR = 3
+HALVING_RESOURCE = 'n_samples'
+
+# Minimum number of samples of the first iterations of successive halving, so
+# that the minority class has enough samples for early stopping to split its
+# validation samples off
+HALVING_MIN_SAMPLES = 500
+
+# Number of parallel jobs of the hyperparameter search (None for a single one,
+# -1 for all CPU cores)
+SEARCH_JOBS_NUM = None
@@ -1,22 +1,191 @@
 """Train and return a GBT classifier"""
 
+import logging
+import time
+from math import floor, log
+from typing import Optional, Union
+
 import pandas as pd
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import (GradientBoostingClassifier,
+                              HistGradientBoostingClassifier)
+# Enable the (experimental) successive-halving search, before importing it
+from sklearn.experimental import \
+    enable_halving_search_cv as _enable_halving_search_cv
 from sklearn.metrics import make_scorer, recall_score
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import (GridSearchCV, HalvingGridSearchCV,
+                                     ParameterGrid)
 from sklearn.pipeline import Pipeline
 
 from src.modelling.constants import FOLDS_NUM
 
-from .constants import (ESTIMATORS_NUM, LEARNING_RATE, MAX_DEPTH, MAX_FEATS,
-                        RANDOM_STATE, SUB_SAMPLING, TO_OPTIMISE)
+from .constants import (CLASSIC_ENGINE, ESTIMATORS_NUM, GBT_ENGINE,
+                        GRID_SEARCH_MODE, HALVING_FACTOR, HALVING_MIN_SAMPLES,
+                        HALVING_RESOURCE, HALVING_SEARCH_MODE, HIST_ENGINE,
+                        HIST_PARAM_NAMES, IS_EARLY_STOPPED, ITER_NO_CHANGE,
+                        LEARNING_RATE, MAX_BINS, MAX_DEPTH, MAX_FEATS,
+                        PARAM_GRID, RANDOM_STATE, SEARCH_JOBS_NUM, SEARCH_MODE,
+                        SUB_SAMPLING, TO_OPTIMISE, VALIDATION_FRACTION)
+
+
+def get_search_report(
+        search_cv: Union[GridSearchCV, HalvingGridSearchCV],
+        param_grid: dict[str, list],
+        wall_clock_secs: float,
+        folds_num: int = FOLDS_NUM) -> dict:
+    """
+    Report the cost of a fitted hyperparameter search, compared to an
+    exhaustive grid search over the same hyperparameters.
+
+    Args:
+        search_cv: Union[GridSearchCV, HalvingGridSearchCV]
+            A fitted hyperparameter search.
+        param_grid: dict[str, list]
+            The full hyperparameter grid.
+        wall_clock_secs: float
+            The wall-clock time of the search, in seconds.
+        folds_num: int
+            The number of cross-validation folds (5 by default).
+
+    Returns:
+        dict
+            The wall-clock time, the number of (candidate, fold) fits performed,
+            their cost in fits on the full resource (i.e., all samples or
+            estimators), the number of fits of an exhaustive grid search (all
+            on the full resource) and the fits saved.
+    """
+    grid_fits_num = len(ParameterGrid(param_grid)) * folds_num
+    if isinstance(search_cv, HalvingGridSearchCV):
+        fits_num = sum(search_cv.n_candidates_) * folds_num
+        # Weigh the fits of each iteration by the share of the resource used
+        full_fits_num = folds_num * sum(
+            candidates_num * resources_num / search_cv.max_resources_
+            for candidates_num, resources_num in zip(
+                search_cv.n_candidates_, search_cv.n_resources_))
+    else:
+        fits_num = full_fits_num = (
+            len(search_cv.cv_results_['params']) * folds_num)
+    return {
+        'wall_clock_secs': wall_clock_secs,
+        'fits_num': fits_num,
+        'full_fits_num': full_fits_num,
+        'grid_fits_num': grid_fits_num,
+        'saved_fits_num': grid_fits_num - full_fits_num,
+        'saved_fits_percent': 100 * (1 - full_fits_num / grid_fits_num)
+    }
+
+
+def get_min_samples(
+        samples_num: int,
+        halving_min_samples: int = HALVING_MIN_SAMPLES,
+        halving_factor: int = HALVING_FACTOR) -> int:
+    """
+    Get the number of samples of the first iterations of successive halving,
+    i.e., the smallest one of at least halving_min_samples such that the last
+    iteration uses (almost) all samples.
+
+    Args:
+        samples_num: int
+            The number of training samples.
+        halving_min_samples: int
+            The minimum number of samples of the first iterations (500 by default).
+        halving_factor: int
+            The factor by which the number of samples grows at each iteration
+            (3 by default).
+
+    Returns:
+        int
+            The number of samples of the first iterations.
+    """
+    if samples_num <= halving_min_samples:
+        return samples_num
+    last_iteration = floor(
+        log(samples_num / halving_min_samples, halving_factor))
+    return samples_num // halving_factor ** last_iteration
+
+
+def get_gbt_classifier(
+        engine: str = GBT_ENGINE
+) -> Union[GradientBoostingClassifier, HistGradientBoostingClassifier]:
+    """
+    Create a GBT classifier with the default hyperparameters, via either
+    engine. The histogram-based engine considers all features at each split,
+    i.e., MAX_FEATS maps to None, as its max_features hyperparameter requires
+    scikit-learn 1.4 onwards.
+
+    Args:
+        engine: str
+            The GBT engine, either 'classic' (by default) or 'hist'.
+
+    Returns:
+        Union[GradientBoostingClassifier, HistGradientBoostingClassifier]
+            The (untrained) GBT classifier.
+    """
+    if engine == CLASSIC_ENGINE:
+        return GradientBoostingClassifier(
+            random_state=RANDOM_STATE,
+            max_depth=MAX_DEPTH,
+            learning_rate=LEARNING_RATE,
+            n_estimators=ESTIMATORS_NUM,
+            max_features=MAX_FEATS,
+            subsample=SUB_SAMPLING
+        )
+    if engine == HIST_ENGINE:
+        # Trees limited by their depth only, as per the classic engine
+        return HistGradientBoostingClassifier(
+            random_state=RANDOM_STATE,
+            max_depth=MAX_DEPTH,
+            learning_rate=LEARNING_RATE,
+            max_iter=ESTIMATORS_NUM,
+            max_leaf_nodes=None,
+            max_bins=MAX_BINS,
+            early_stopping=IS_EARLY_STOPPED,
+            n_iter_no_change=ITER_NO_CHANGE,
+            validation_fraction=VALIDATION_FRACTION
+        )
+    raise ValueError(f"Unknown GBT engine: {engine}.")
+
+
+def get_engine_param_name(
+        param_name: str,
+        engine: str = GBT_ENGINE
+) -> Optional[str]:
+    """
+    Get the name of a (pipeline) hyperparameter of the classic GBT engine in
+    the given engine.
+
+    Args:
+        param_name: str
+            The name of the hyperparameter, e.g., 'gbt__n_estimators'.
+        engine: str
+            The GBT engine, either 'classic' (by default) or 'hist'.
+
+    Returns:
+        Optional[str]
+            The name of the hyperparameter in the engine, e.g.,
+            'gbt__max_iter', None if the engine does not support it.
+    """
+    if engine != HIST_ENGINE:
+        return param_name
+    prefix, _, name = param_name.rpartition('__')
+    if name not in HIST_PARAM_NAMES:
+        return param_name
+    if HIST_PARAM_NAMES[name] is None:
+        return None
+    return f"{prefix}__{HIST_PARAM_NAMES[name]}" if prefix else HIST_PARAM_NAMES[name]
 
 
 def get_best_gbt_classifier(
         train_feats: pd.DataFrame,
         train_targets: pd.Series,
-        to_optimise: bool = TO_OPTIMISE
-) -> GradientBoostingClassifier:
+        to_optimise: bool = TO_OPTIMISE,
+        search_mode: str = SEARCH_MODE,
+        jobs_num: Optional[int] = SEARCH_JOBS_NUM,
+        param_grid: Optional[dict[str, list]] = None,
+        halving_resource: str = HALVING_RESOURCE,
+        halving_factor: int = HALVING_FACTOR,
+        halving_min_samples: int = HALVING_MIN_SAMPLES,
+        engine: str = GBT_ENGINE
+) -> Union[GradientBoostingClassifier, HistGradientBoostingClassifier]:
     """Create and return a Gradient-Boosted Tree (GBT) classifier
     with cross-validated and optimised hyperparameters (if required).
 
@@ -28,38 +197,94 @@ def get_best_gbt_classifier(
             the training of the GBT classifier.
         to_optimise: bool
             Whether to optimise the model's hyperparameters.
+        search_mode: str
+            The hyperparameter search, either 'grid' (by default, i.e.,
+            exhaustive) or 'halving' (i.e., successive halving, discarding the
+            poorest candidates on small resources).
+        jobs_num: Optional[int]
+            The number of parallel jobs of the hyperparameter search (None by
+            default, i.e., a single one, or -1 for as many as the CPU cores).
+        param_grid: Optional[dict[str, list]]
+            The hyperparameter grid to search (None by default, i.e.,
+            PARAM_GRID).
+        halving_resource: str
+            The resource increased at each iteration of successive halving,
+            either 'n_samples' (by default) or 'gbt__n_estimators', in which
+            case the number of estimators is no longer searched via the grid
+            but grows up to its largest value in the grid.
+        halving_factor: int
+            The factor by which the resource grows, and the candidates shrink,
+            at each iteration of successive halving (3 by default).
+        halving_min_samples: int
+            The minimum number of samples of the first iterations of successive
+            halving over the samples (500 by default).
+        engine: str
+            The GBT engine, either 'classic' (by default), or 'hist', i.e.,
+            histogram-based, multi-threaded and early-stopped, in which case
+            the hyperparameters of the grid are renamed accordingly (e.g.,
+            'gbt__n_estimators' to 'gbt__max_iter'), those it does not support
+            (i.e., 'gbt__subsample') being dropped.
 
     Returns:
-        GradientBoostingClassifier
+        Union[GradientBoostingClassifier, HistGradientBoostingClassifier]
             The trained and optimised GBT classifier.
     """
 
-    gbt = GradientBoostingClassifier(
-        random_state=RANDOM_STATE,
-        max_depth=MAX_DEPTH,
-        learning_rate=LEARNING_RATE,
-        n_estimators=ESTIMATORS_NUM,
-        max_features=MAX_FEATS,
-        subsample=SUB_SAMPLING
-    )
+    gbt = get_gbt_classifier(engine)
 
     pipeline = Pipeline(steps=[('gbt', gbt)])
 
+    if param_grid is None:
+        param_grid = PARAM_GRID
     param_grid = {
-        'gbt__n_estimators': [10, 20, 30, 50, 100],
-        'gbt__learning_rate': [0.05, 0.15, 0.2, 0.25, 0.3],
-        'gbt__max_depth': [3, 4, 5, 7, 9, 12, 15],
-        'gbt__n_iter_no_change': [5, 7, 9, 11, 15],
-        'gbt__subsample': [0.3, 0.5, 0.7, 0.9],
-        'gbt__max_leaf_nodes': [None],
+        get_engine_param_name(param_name, engine): param_values
+        for param_name, param_values in param_grid.items()
+        if get_engine_param_name(param_name, engine) is not None
     }
+    if halving_resource != 'n_samples':
+        halving_resource = get_engine_param_name(halving_resource, engine)
 
     # Create a custom scorer for weighted recall
     weighted_recall_scorer = make_scorer(recall_score, average='weighted')
 
-    if to_optimise:
-        gbt = GridSearchCV(estimator=pipeline, param_grid=param_grid,
-                           cv=FOLDS_NUM, scoring=weighted_recall_scorer)
+    if not to_optimise:
+        return gbt.fit(train_feats, train_targets)
+
+    if search_mode == GRID_SEARCH_MODE:
+        search_cv = GridSearchCV(estimator=pipeline, param_grid=param_grid,
+                                 cv=FOLDS_NUM, scoring=weighted_recall_scorer,
+                                 n_jobs=jobs_num)
+    elif search_mode == HALVING_SEARCH_MODE:
+        halving_param_grid = dict(param_grid)
+        min_resources, max_resources = 'exhaust', 'auto'
+        if halving_resource == 'n_samples':
+            min_resources = get_min_samples(
+                len(train_feats), halving_min_samples, halving_factor)
+        else:
+            max_resources = max(halving_param_grid.pop(halving_resource))
+        # Eliminate candidates on the minimum resource for as many iterations
+        # as needed to end up with the best candidates on the maximum resource
+        search_cv = HalvingGridSearchCV(
+            estimator=pipeline, param_grid=halving_param_grid,
+            factor=halving_factor, resource=halving_resource,
+            max_resources=max_resources, min_resources=min_resources,
+            aggressive_elimination=True, cv=FOLDS_NUM,
+            scoring=weighted_recall_scorer, n_jobs=jobs_num,
+            random_state=RANDOM_STATE)
+    else:
+        raise ValueError(f"Unknown search mode: {search_mode}.")
 
-    best_gbt = gbt.fit(train_feats, train_targets)
+    start_time = time.perf_counter()
+    best_gbt = search_cv.fit(train_feats, train_targets)
+    search_report = get_search_report(
+        search_cv, param_grid, time.perf_counter() - start_time)
+    full_resource = (halving_resource if search_mode == HALVING_SEARCH_MODE
+                     else 'data')
+    logging.info(f"The {search_mode} search of the GBT hyperparameters took "
+                 f"{search_report['wall_clock_secs']:.1f} s, performing "
+                 f"{search_report['fits_num']} fits, i.e., "
+                 f"{search_report['full_fits_num']:.0f} on the full "
+                 f"{full_resource}, "
+                 f"rather than {search_report['grid_fits_num']} "
+                 f"({search_report['saved_fits_percent']:.1f}% saved).")
     return best_gbt
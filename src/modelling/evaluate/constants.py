@@ -3,3 +3,7 @@
 IS_4D = False
 
 PREDS_WRT_PROBS = False
+
+# Maximum depth of the decision tree mimicking the predictions of a trained
+# model whose own trees cannot be visualised (e.g., a histogram-based GBT)
+SURROGATE_MAX_DEPTH = 6
@@ -4,7 +4,38 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.tree import plot_tree
+from sklearn.tree import DecisionTreeClassifier, plot_tree
+
+from src.modelling.classify.constants import RANDOM_STATE
+
+from .constants import SURROGATE_MAX_DEPTH
+
+
+def get_surrogate_tree(
+        trained_model: GradientBoostingClassifier,
+        feats: pd.DataFrame,
+        max_depth: int = SURROGATE_MAX_DEPTH
+) -> DecisionTreeClassifier:
+    """
+    Fit a (global surrogate) decision tree mimicking the predictions of a
+    trained model, e.g., a histogram-based GBT, whose trees and feature
+    importances are not exposed as per the classic GBT.
+
+    Args:
+        trained_model: GradientBoostingClassifier
+            A trained model.
+        feats: pd.DataFrame
+            The df with features to predict on.
+        max_depth: int
+            The maximum depth of the surrogate tree (6 by default).
+
+    Returns:
+        DecisionTreeClassifier
+            The surrogate tree.
+    """
+    surrogate_tree = DecisionTreeClassifier(
+        max_depth=max_depth, random_state=RANDOM_STATE)
+    return surrogate_tree.fit(feats, trained_model.predict(feats))
 
 
 def plot_decision_tree(
@@ -21,8 +52,13 @@ def plot_decision_tree(
         feats: pd.DataFrame
             The df with features for training the KNN classifier.
     """
-    tree_to_visualize = trained_model.estimators_[
-        0][0]  # Access the first tree
+    if hasattr(trained_model, 'estimators_'):
+        tree_to_visualize = trained_model.estimators_[
+            0][0]  # Access the first tree
+        title = 'Decision Tree Visualization (GBT - First Tree)'
+    else:
+        tree_to_visualize = get_surrogate_tree(trained_model, feats)
+        title = 'Decision Tree Visualization (GBT - Surrogate Tree)'
 
     # Plot the decision tree
     plt.figure(figsize=(12, 8))
@@ -30,7 +66,7 @@ def plot_decision_tree(
     # bottom leaf node, Parkinson's Disease otherwise
     plot_tree(tree_to_visualize, filled=True, feature_names=feats.columns,
               class_names=['Healthy', 'Parkinson\'s Disease'])
-    plt.title('Decision Tree Visualization (GBT - First Tree)')
+    plt.title(title)
     plt.show()
 
 
@@ -48,7 +84,11 @@ def plot_feat_import(
         feats: pd.DataFrame
             The df with features for training the KNN classifier.
     """
-    feature_importances = trained_model.feature_importances_
+    if hasattr(trained_model, 'feature_importances_'):
+        feature_importances = trained_model.feature_importances_
+    else:
+        feature_importances = get_surrogate_tree(
+            trained_model, feats).feature_importances_
 
     feature_names = feats.columns
 
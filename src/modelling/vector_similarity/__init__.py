@@ -1,3 +1,3 @@
 """Init of the vector_similarity module"""
 
-from . import knn_classifier
+from . import ann_index, blocked_knn, knn_classifier
@@ -0,0 +1,340 @@
+"""Module to create a persistent, approximate-nearest-neighbour (ANN) index of
+the training vectors, i.e., a forest of random-projection trees built once at
+fit time, saved to disk and memory-mapped on load, behind a KNN classifier-like
+interface to yield vector similarity"""
+
+import json
+import os
+import shutil
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from .blocked_knn import get_class_probs, get_exact_distances
+from .constants import (ANN_LEAF_SIZE, NEIGHBOURS_NUM, P_PARAM,
+                        QUERY_BATCH_SIZE, RANDOM_STATE, SEARCH_TREES_NUM,
+                        TREES_NUM, WEIGHTS_METHOD)
+
+# Name of the JSON file of the hyperparameters of a saved index, the arrays of
+# the index being saved alongside it, one .npy file per array
+PARAMS_FILE_STR = 'params.json'
+
+
+def _build_tree(
+        vectors: np.ndarray,
+        leaf_size: int,
+        rng: np.random.Generator) -> dict[str, np.ndarray]:
+    """Build a random-projection tree, splitting each node with more than
+    leaf_size vectors in two halves along the direction between two of its
+    vectors picked at random (a random direction if they are equal)."""
+    normals = [np.zeros(vectors.shape[1], dtype=np.float32)]
+    thresholds, children, leaf_bounds = [0.0], [(-1, -1)], [(0, 0)]
+    leaf_items, leaf_items_num = [], 0
+
+    nodes_to_split = [(0, np.arange(len(vectors)))]
+    while nodes_to_split:
+        node_num, items = nodes_to_split.pop()
+        if len(items) <= leaf_size:
+            leaf_bounds[node_num] = (
+                leaf_items_num, leaf_items_num + len(items))
+            leaf_items.append(items)
+            leaf_items_num += len(items)
+            continue
+
+        first_item, second_item = rng.choice(items, 2, replace=False)
+        normal = vectors[first_item] - vectors[second_item]
+        if not normal.any():
+            normal = rng.standard_normal(vectors.shape[1]).astype(np.float32)
+        projections = vectors[items] @ normal
+        order = np.argsort(projections, kind='stable')
+        half = len(items) // 2
+
+        left_num = len(normals)
+        normals[node_num] = normal
+        thresholds[node_num] = (
+            projections[order[half - 1]] + projections[order[half]]) / 2
+        children[node_num] = (left_num, left_num + 1)
+        for _ in range(2):
+            normals.append(np.zeros(vectors.shape[1], dtype=np.float32))
+            thresholds.append(0.0)
+            children.append((-1, -1))
+            leaf_bounds.append((0, 0))
+        nodes_to_split.extend([(left_num + 1, items[order[half:]]),
+                               (left_num, items[order[:half]])])
+
+    return {
+        'normals': np.stack(normals),
+        'thresholds': np.array(thresholds, dtype=np.float32),
+        'children': np.array(children, dtype=np.int32),
+        'leaf_bounds': np.array(leaf_bounds, dtype=np.int64),
+        'leaf_items': np.concatenate(leaf_items).astype(np.int64)
+    }
+
+
+class AnnKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """K-Nearest Neighbour (KNN) classifier backed by an approximate-nearest-
+    neighbour index, i.e., a forest of random-projection trees of the training
+    vectors (as per Annoy). The training vectors in the leaves the queries fall
+    into are the candidate neighbours, which are then ranked by their exact
+    Minkowski distance to the queries.
+
+    Args:
+        n_neighbors: int
+            The number of neighbours (2 by default).
+        weights: str
+            The weights of the neighbours, either 'uniform' or 'distance' (by
+            default, i.e., the inverse of their distance).
+        p: float
+            The power of the Minkowski distance (0.5 by default).
+        trees_num: int
+            The number of trees of the forest (10 by default). The more trees,
+            the higher the recall, the latency and the size of the index.
+        search_trees_num: Optional[int]
+            The number of trees searched per query (None by default, i.e., all
+            of them), to trade recall for latency without rebuilding the index.
+        leaf_size: int
+            The maximum number of training vectors per leaf (32 by default, or
+            n_neighbors if greater). The larger the leaves, the higher the
+            recall and the latency.
+        random_state: int
+            The random state to build the trees in a reproducible manner.
+    """
+
+    def __init__(
+            self,
+            n_neighbors: int = NEIGHBOURS_NUM,
+            weights: str = WEIGHTS_METHOD,
+            p: float = P_PARAM,
+            trees_num: int = TREES_NUM,
+            search_trees_num: Optional[int] = SEARCH_TREES_NUM,
+            leaf_size: int = ANN_LEAF_SIZE,
+            random_state: int = RANDOM_STATE):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.trees_num = trees_num
+        self.search_trees_num = search_trees_num
+        self.leaf_size = leaf_size
+        self.random_state = random_state
+        self.index: Optional[dict[str, np.ndarray]] = None
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """The class labels."""
+        return self.index['classes']
+
+    def __sklearn_is_fitted__(self) -> bool:
+        """Whether the index has been built (or loaded)."""
+        return self.index is not None
+
+    def fit(
+            self,
+            train_feats: pd.DataFrame,
+            train_targets: pd.Series) -> 'AnnKNeighborsClassifier':
+        """Build the index of the training vectors.
+
+        Args:
+            train_feats: pd.DataFrame
+                The df with features of the training vectors.
+            train_targets: pd.Series
+                The column/series of target labels of the training vectors.
+
+        Returns:
+            AnnKNeighborsClassifier
+                The classifier with its index built.
+        """
+        vectors = np.ascontiguousarray(train_feats, dtype=np.float32)
+        classes, label_codes = np.unique(
+            np.asarray(train_targets), return_inverse=True)
+        if classes.dtype == object:
+            # Save string labels without pickling them
+            classes = classes.astype(str)
+        rng = np.random.default_rng(self.random_state)
+
+        # Concatenate the trees, offsetting the node numbers of each tree
+        leaf_size = max(self.leaf_size, self.n_neighbors)
+        trees = [_build_tree(vectors, leaf_size, rng)
+                 for _ in range(self.trees_num)]
+        nodes_nums = np.cumsum(
+            [0] + [len(tree['thresholds']) for tree in trees])
+        items_nums = np.cumsum(
+            [0] + [len(tree['leaf_items']) for tree in trees])
+        self.index = {
+            'vectors': vectors,
+            'label_codes': label_codes.astype(np.int32),
+            'classes': classes,
+            'roots': nodes_nums[:-1].astype(np.int64),
+            'normals': np.concatenate([tree['normals'] for tree in trees]),
+            'thresholds': np.concatenate([tree['thresholds'] for tree in trees]),
+            'children': np.concatenate([
+                np.where(tree['children'] >= 0,
+                         tree['children'] + nodes_num, -1)
+                for tree, nodes_num in zip(trees, nodes_nums)]),
+            'leaf_bounds': np.concatenate([
+                tree['leaf_bounds'] + items_num
+                for tree, items_num in zip(trees, items_nums)]),
+            'leaf_items': np.concatenate([tree['leaf_items'] for tree in trees])
+        }
+        return self
+
+    def _get_candidates(
+            self,
+            queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the distinct (query, training vector) pairs of candidate
+        neighbours, by routing each query down each searched tree to a leaf."""
+        roots = self.index['roots'][:self.search_trees_num]
+        query_nums = np.repeat(np.arange(len(queries)), len(roots))
+        nodes = np.tile(roots, len(queries))
+
+        children = self.index['children']
+        is_split = children[nodes, 0] >= 0
+        while is_split.any():
+            split_nodes = nodes[is_split]
+            margins = (np.einsum('ij,ij->i', queries[query_nums[is_split]],
+                                 self.index['normals'][split_nodes])
+                       - self.index['thresholds'][split_nodes])
+            nodes[is_split] = children[
+                split_nodes, (margins >= 0).astype(np.int64)]
+            is_split = children[nodes, 0] >= 0
+
+        starts, ends = self.index['leaf_bounds'][nodes].T
+        counts = ends - starts
+        positions = (np.repeat(starts - np.cumsum(counts) + counts, counts)
+                     + np.arange(counts.sum()))
+        vectors_num = len(self.index['vectors'])
+        keys = np.unique(np.repeat(query_nums, counts) * vectors_num
+                         + self.index['leaf_items'][positions])
+        return keys // vectors_num, keys % vectors_num
+
+    def kneighbors(
+            self,
+            feats: pd.DataFrame,
+            n_neighbors: Optional[int] = None,
+            return_distance: bool = True
+    ) -> Union[tuple[np.ndarray, np.ndarray], np.ndarray]:
+        """Find the (approximate) nearest neighbours of each query.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+            n_neighbors: Optional[int]
+                The number of neighbours (None by default, i.e., n_neighbors).
+            return_distance: bool
+                Whether to return the distances to the neighbours along with
+                their indices (True by default), as per KNeighborsClassifier.
+
+        Returns:
+            Union[tuple[np.ndarray, np.ndarray], np.ndarray]
+                The distances to the neighbours (if return_distance) and their
+                indices among the training vectors, sorted by distance, one row
+                per query (padded with infinite distances and -1 indices if
+                fewer neighbours are found).
+        """
+        if self.index is None:
+            raise ValueError('The index must be built first.')
+        n_neighbors = self.n_neighbors if n_neighbors is None else n_neighbors
+        queries = np.ascontiguousarray(feats, dtype=np.float32)
+        distances = np.full((len(queries), n_neighbors), np.inf)
+        indices = np.full((len(queries), n_neighbors), -1, dtype=np.int64)
+
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = queries[start:start + QUERY_BATCH_SIZE]
+            query_nums, items = self._get_candidates(batch)
+            pair_distances = get_exact_distances(
+                self.index['vectors'][items], batch[query_nums], self.p)
+
+            # Rank the candidates of each query by distance
+            order = np.lexsort((items, pair_distances, query_nums))
+            query_nums = query_nums[order]
+            ranks = (np.arange(len(order))
+                     - np.searchsorted(query_nums, query_nums))
+            is_kept = ranks < n_neighbors
+            distances[start + query_nums[is_kept], ranks[is_kept]] = \
+                pair_distances[order][is_kept]
+            indices[start + query_nums[is_kept], ranks[is_kept]] = \
+                items[order][is_kept]
+
+        if return_distance:
+            return distances, indices
+        return indices
+
+    def predict_proba(self, feats: pd.DataFrame) -> np.ndarray:
+        """Estimate the probability of each class for each query, as per
+        KNeighborsClassifier, given the (approximate) nearest neighbours.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+
+        Returns:
+            np.ndarray
+                The probability of each class (in the order of classes_), one
+                row per query.
+        """
+        distances, indices = self.kneighbors(feats)
+        return get_class_probs(distances, indices, self.index['label_codes'],
+                               len(self.classes_), self.weights)
+
+    def predict(self, feats: pd.DataFrame) -> np.ndarray:
+        """Predict the class of each query.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+
+        Returns:
+            np.ndarray
+                The predicted class labels.
+        """
+        return self.classes_[np.argmax(self.predict_proba(feats), axis=1)]
+
+    def save(self, index_dir: str) -> None:
+        """Save the classifier and its index into a directory, replacing any
+        index previously saved there.
+
+        Args:
+            index_dir: str
+                The path to the directory of the index.
+        """
+        tmp_index_dir = f"{index_dir}.tmp"
+        shutil.rmtree(tmp_index_dir, ignore_errors=True)
+        os.makedirs(tmp_index_dir)
+        for array_name, array in self.index.items():
+            np.save(f"{tmp_index_dir}{os.sep}{array_name}.npy",
+                    array, allow_pickle=False)
+        with open(f"{tmp_index_dir}{os.sep}{PARAMS_FILE_STR}", 'w',
+                  encoding='utf-8') as params_file:
+            json.dump(self.get_params(), params_file, indent=2)
+        shutil.rmtree(index_dir, ignore_errors=True)
+        os.replace(tmp_index_dir, index_dir)
+
+    @classmethod
+    def load(
+            cls,
+            index_dir: str,
+            is_memory_mapped: bool = True) -> 'AnnKNeighborsClassifier':
+        """Load a classifier and its index from a directory.
+
+        Args:
+            index_dir: str
+                The path to the directory of the index.
+            is_memory_mapped: bool
+                Whether to memory-map the arrays of the index (True by default),
+                thus sharing their pages across processes and reading only the
+                pages needed, rather than reading them whole into memory.
+
+        Returns:
+            AnnKNeighborsClassifier
+                The classifier with its index.
+        """
+        with open(f"{index_dir}{os.sep}{PARAMS_FILE_STR}", encoding='utf-8') as params_file:
+            ann_classifier = cls(**json.load(params_file))
+        ann_classifier.index = {
+            file_name[:-len('.npy')]: np.load(
+                f"{index_dir}{os.sep}{file_name}",
+                mmap_mode='r' if is_memory_mapped else None)
+            for file_name in sorted(os.listdir(index_dir)) if file_name.endswith('.npy')
+        }
+        return ann_classifier
@@ -0,0 +1,357 @@
+"""Module to find the exact nearest neighbours of queries among the training
+vectors in tiles of bounded memory, i.e., computing the float32 Minkowski
+distances between a tile of queries and a tile of training vectors at a time,
+in parallel across the CPU cores, while keeping the running k nearest
+neighbours of each query, behind a KNN classifier-like interface"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.utils.validation import check_is_fitted
+
+from .constants import (KNN_WORKERS_NUM, MEMORY_BUDGET_BYTES, NEIGHBOURS_NUM,
+                        P_PARAM, WEIGHTS_METHOD)
+
+# Bytes taken per (query, training vector) cell of a tile, i.e., its float32
+# distance, a float32 temporary array and the int64 index of the partial sort
+_TILE_CELL_BYTES = 16
+
+
+def get_reduced_distances(
+        queries: np.ndarray,
+        vectors: np.ndarray,
+        p_param: float) -> np.ndarray:
+    """
+    Compute the reduced Minkowski distances between each query and each
+    training vector in float32, i.e., the sum of the absolute differences to
+    the power of p (without the root, which preserves the ranking), via a
+    matrix product for p=2 and feature by feature otherwise.
+
+    Args:
+        queries: np.ndarray
+            A (float32) tile of queries.
+        vectors: np.ndarray
+            A (float32) tile of training vectors.
+        p_param: float
+            The power of the Minkowski distance, e.g., 1 (Manhattan), 2
+            (Euclidean), or fractional (e.g., 0.5).
+
+    Returns:
+        np.ndarray
+            The reduced distances, one row per query and one column per
+            training vector.
+    """
+    if p_param == 2:
+        # ||q - v||^2 = ||q||^2 + ||v||^2 - 2 q.v
+        reduced_distances = queries @ vectors.T
+        reduced_distances *= -2
+        reduced_distances += np.einsum(
+            'ij,ij->i', queries, queries)[:, np.newaxis]
+        reduced_distances += np.einsum(
+            'ij,ij->i', vectors, vectors)[np.newaxis, :]
+        return np.maximum(reduced_distances, 0, out=reduced_distances)
+
+    reduced_distances = np.zeros(
+        (len(queries), len(vectors)), dtype=np.float32)
+    abs_diffs = np.empty_like(reduced_distances)
+    for feat_num in range(queries.shape[1]):
+        np.subtract(queries[:, feat_num, np.newaxis],
+                    vectors[np.newaxis, :, feat_num], out=abs_diffs)
+        np.abs(abs_diffs, out=abs_diffs)
+        if p_param == 0.5:
+            np.sqrt(abs_diffs, out=abs_diffs)
+        elif p_param != 1:
+            np.power(abs_diffs, np.float32(p_param), out=abs_diffs)
+        reduced_distances += abs_diffs
+    return reduced_distances
+
+
+def get_exact_distances(
+        queries: np.ndarray,
+        vectors: np.ndarray,
+        p_param: float) -> np.ndarray:
+    """Get the Minkowski distances between pairs of vectors, row by row, in
+    double precision."""
+    abs_diffs = np.abs(vectors.astype(np.float64) - queries)
+    if p_param == 1:
+        return abs_diffs.sum(axis=-1)
+    if p_param == 2:
+        return np.sqrt((abs_diffs * abs_diffs).sum(axis=-1))
+    return (abs_diffs ** p_param).sum(axis=-1) ** (1 / p_param)
+
+
+def get_class_probs(
+        distances: np.ndarray,
+        indices: np.ndarray,
+        label_codes: np.ndarray,
+        classes_num: int,
+        weights: str = WEIGHTS_METHOD) -> np.ndarray:
+    """
+    Estimate the probability of each class for each query given its nearest
+    neighbours, as per KNeighborsClassifier.
+
+    Args:
+        distances: np.ndarray
+            The distances to the neighbours, one row per query.
+        indices: np.ndarray
+            The indices of the neighbours among the training vectors, -1 for
+            missing neighbours.
+        label_codes: np.ndarray
+            The class number of each training vector.
+        classes_num: int
+            The number of classes.
+        weights: str
+            The weights of the neighbours, either 'uniform' or 'distance' (by
+            default, i.e., the inverse of their distance).
+
+    Returns:
+        np.ndarray
+            The probability of each class, one row per query.
+    """
+    is_found = indices >= 0
+    if weights == 'distance':
+        # Neighbours equal to a query outweigh all the others, as per sklearn
+        with np.errstate(divide='ignore'):
+            neigh_weights = 1 / distances
+        has_exact_match = (distances == 0).any(axis=1, keepdims=True)
+        neigh_weights = np.where(
+            has_exact_match, distances == 0, neigh_weights)
+    else:
+        neigh_weights = np.ones(distances.shape)
+    neigh_weights = np.where(is_found, neigh_weights, 0.0)
+
+    neigh_codes = label_codes[np.where(is_found, indices, 0)]
+    probs = np.zeros((len(indices), classes_num))
+    for class_num in range(classes_num):
+        probs[:, class_num] = (
+            neigh_weights * (neigh_codes == class_num)).sum(axis=1)
+    probs_sums = probs.sum(axis=1, keepdims=True)
+    return probs / np.where(probs_sums > 0, probs_sums, 1)
+
+
+def get_tile_sizes(
+        queries_num: int,
+        vectors_num: int,
+        n_neighbors: int,
+        memory_budget: int = MEMORY_BUDGET_BYTES,
+        workers_num: int = 1) -> tuple[int, int]:
+    """
+    Get the number of queries and of training vectors per tile such that the
+    tiles of all workers fit in the memory budget.
+
+    Args:
+        queries_num: int
+            The number of queries.
+        vectors_num: int
+            The number of training vectors.
+        n_neighbors: int
+            The number of neighbours, i.e., the minimum number of training
+            vectors per tile.
+        memory_budget: int
+            The memory budget in bytes (256 MiB by default).
+        workers_num: int
+            The number of workers, each processing a tile at a time.
+
+    Returns:
+        tuple[int, int]
+            The number of queries and of training vectors per tile.
+    """
+    tile_cells = max(1, memory_budget // (_TILE_CELL_BYTES * workers_num))
+    vectors_tile_size = min(vectors_num, max(n_neighbors, tile_cells))
+    queries_tile_size = min(
+        queries_num, max(1, tile_cells // vectors_tile_size))
+    return queries_tile_size, vectors_tile_size
+
+
+class BlockedKNeighborsClassifier(ClassifierMixin, BaseEstimator):
+    """Exact K-Nearest Neighbour (KNN) classifier whose brute-force search runs
+    in tiles of bounded memory, rather than via the full matrix of distances
+    between the queries and the training vectors, thus supporting fractional
+    Minkowski distances (unlike tree-based indexes) on large batches.
+
+    Args:
+        n_neighbors: int
+            The number of neighbours (2 by default).
+        weights: str
+            The weights of the neighbours, either 'uniform' or 'distance' (by
+            default, i.e., the inverse of their distance).
+        p: float
+            The power of the Minkowski distance (0.5 by default).
+        memory_budget: int
+            The maximum memory taken by the tiles of all workers at once, in
+            bytes (256 MiB by default).
+        workers_num: Optional[int]
+            The number of threads processing tiles of queries in parallel (None
+            by default, i.e., as many as the CPU cores).
+    """
+
+    def __init__(
+            self,
+            n_neighbors: int = NEIGHBOURS_NUM,
+            weights: str = WEIGHTS_METHOD,
+            p: float = P_PARAM,
+            memory_budget: int = MEMORY_BUDGET_BYTES,
+            workers_num: Optional[int] = KNN_WORKERS_NUM):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.memory_budget = memory_budget
+        self.workers_num = workers_num
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """The class labels."""
+        check_is_fitted(self)
+        return self.train_data_['classes']
+
+    def fit(
+            self,
+            train_feats: pd.DataFrame,
+            train_targets: pd.Series) -> 'BlockedKNeighborsClassifier':
+        """Store the training vectors in float32 and their class numbers.
+
+        Args:
+            train_feats: pd.DataFrame
+                The df with features of the training vectors.
+            train_targets: pd.Series
+                The column/series of target labels of the training vectors.
+
+        Returns:
+            BlockedKNeighborsClassifier
+                The fitted classifier.
+        """
+        classes, label_codes = np.unique(
+            np.asarray(train_targets), return_inverse=True)
+        self.train_data_ = {
+            'vectors': np.ascontiguousarray(train_feats, dtype=np.float32),
+            'label_codes': label_codes,
+            'classes': classes
+        }
+        return self
+
+    def _search_tile(
+            self,
+            queries: np.ndarray,
+            n_neighbors: int,
+            vectors_tile_size: int) -> tuple[np.ndarray, np.ndarray]:
+        """Find the nearest neighbours of a tile of queries, going through the
+        training vectors one tile at a time while keeping the running k nearest
+        neighbours of each query."""
+        vectors = self.train_data_['vectors']
+        best_distances = np.full(
+            (len(queries), n_neighbors), np.inf, dtype=np.float32)
+        best_indices = np.zeros((len(queries), n_neighbors), dtype=np.int64)
+        query_nums = np.arange(len(queries))[:, np.newaxis]
+
+        for start in range(0, len(vectors), vectors_tile_size):
+            reduced_distances = get_reduced_distances(
+                queries, vectors[start:start + vectors_tile_size], self.p)
+            if reduced_distances.shape[1] > n_neighbors:
+                tile_indices = np.argpartition(
+                    reduced_distances, n_neighbors - 1, axis=1)
+                tile_indices = tile_indices[:, :n_neighbors]
+            else:
+                tile_indices = np.broadcast_to(
+                    np.arange(reduced_distances.shape[1]),
+                    reduced_distances.shape)
+
+            # Merge the nearest neighbours of the tile into the running ones
+            merged_distances = np.hstack(
+                [best_distances, reduced_distances[query_nums, tile_indices]])
+            merged_indices = np.hstack([best_indices, tile_indices + start])
+            kept = np.argpartition(
+                merged_distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+            best_distances = merged_distances[query_nums, kept]
+            best_indices = merged_indices[query_nums, kept]
+
+        # Sort the neighbours by their exact distance (then by index)
+        distances = get_exact_distances(
+            queries[:, np.newaxis, :], vectors[best_indices], self.p)
+        order = np.lexsort((best_indices, distances), axis=1)
+        return distances[query_nums, order], best_indices[query_nums, order]
+
+    def kneighbors(
+            self,
+            feats: pd.DataFrame,
+            n_neighbors: Optional[int] = None,
+            return_distance: bool = True):
+        """Find the exact nearest neighbours of each query.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+            n_neighbors: Optional[int]
+                The number of neighbours (None by default, i.e., n_neighbors).
+            return_distance: bool
+                Whether to return the distances too (True by default).
+
+        Returns:
+            Union[tuple[np.ndarray, np.ndarray], np.ndarray]
+                The distances to the neighbours (if required) and their indices
+                among the training vectors, sorted by distance, one row per query.
+        """
+        check_is_fitted(self)
+        n_neighbors = self.n_neighbors if n_neighbors is None else n_neighbors
+        vectors_num = len(self.train_data_['vectors'])
+        if n_neighbors > vectors_num:
+            raise ValueError(
+                f"Expected n_neighbors <= {vectors_num}, got {n_neighbors}.")
+
+        queries = np.ascontiguousarray(feats, dtype=np.float32)
+        workers_num = self.workers_num or os.cpu_count() or 1
+        queries_tile_size, vectors_tile_size = get_tile_sizes(
+            len(queries), vectors_num, n_neighbors, self.memory_budget, workers_num)
+
+        distances = np.empty((len(queries), n_neighbors))
+        indices = np.empty((len(queries), n_neighbors), dtype=np.int64)
+
+        def search_queries_tile(start: int) -> None:
+            """Search a tile of queries and store its nearest neighbours."""
+            end = start + queries_tile_size
+            distances[start:end], indices[start:end] = self._search_tile(
+                queries[start:end], n_neighbors, vectors_tile_size)
+
+        # The tiles of queries are searched by threads, since numpy releases the
+        # GIL in its kernels, sharing the training vectors and the outputs
+        with ThreadPoolExecutor(max_workers=workers_num) as executor:
+            list(executor.map(search_queries_tile,
+                              range(0, len(queries), queries_tile_size)))
+
+        if return_distance:
+            return distances, indices
+        return indices
+
+    def predict_proba(self, feats: pd.DataFrame) -> np.ndarray:
+        """Estimate the probability of each class for each query.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+
+        Returns:
+            np.ndarray
+                The probability of each class (in the order of classes_), one
+                row per query.
+        """
+        check_is_fitted(self)
+        distances, indices = self.kneighbors(feats)
+        return get_class_probs(
+            distances, indices, self.train_data_['label_codes'],
+            len(self.classes_), self.weights)
+
+    def predict(self, feats: pd.DataFrame) -> np.ndarray:
+        """Predict the class of each query.
+
+        Args:
+            feats: pd.DataFrame
+                The df with features of the queries.
+
+        Returns:
+            np.ndarray
+                The predicted class labels.
+        """
+        return self.classes_[np.argmax(self.predict_proba(feats), axis=1)]
@@ -6,3 +6,22 @@ NEIGHBOURS_NUM = 2
 P_PARAM = 0.5
 SCORING_METRIC = 'recall'
 WEIGHTS_METHOD = 'distance'
+
+# Approximate-nearest-neighbour index, i.e., a forest of TREES_NUM random-
+# projection trees whose leaves hold at most ANN_LEAF_SIZE training vectors,
+# searched via SEARCH_TREES_NUM of its trees (None for all of them), the more
+# trees, the higher the recall and the latency, QUERY_BATCH_SIZE queries at a
+# time
+TREES_NUM = 10
+ANN_LEAF_SIZE = 32
+SEARCH_TREES_NUM = None
+QUERY_BATCH_SIZE = 1024
+RANDOM_STATE = 13
+
+# Exact KNN via tiles of queries by training vectors, whose distances are
+# computed in float32 by KNN_WORKERS_NUM threads (None for as many as the CPU
+# cores), all tiles in memory at once taking at most MEMORY_BUDGET_BYTES
+KNN_ENGINES = ('sklearn', 'blocked')
+KNN_ENGINE = 'sklearn'
+KNN_WORKERS_NUM = None
+MEMORY_BUDGET_BYTES = 256 * 2 ** 20
@@ -1,19 +1,24 @@
 """Module to create a KNN classifier to
 yield vector similarity"""
 
+from typing import Union
+
 import pandas as pd
 from sklearn.model_selection import GridSearchCV
 from sklearn.neighbors import KNeighborsClassifier
 
 from ..constants import FOLDS_NUM
-from .constants import (KNN_ALGO, LEAF_SIZE, NEIGHBOURS_NUM, P_PARAM,
-                        SCORING_METRIC, WEIGHTS_METHOD)
+from .blocked_knn import BlockedKNeighborsClassifier
+from .constants import (KNN_ALGO, KNN_ENGINE, KNN_ENGINES, LEAF_SIZE,
+                        NEIGHBOURS_NUM, P_PARAM, SCORING_METRIC,
+                        WEIGHTS_METHOD)
 
 
 def get_best_knn_classifier(
         train_feats: pd.DataFrame,
-        train_targets: pd.Series
-) -> KNeighborsClassifier:
+        train_targets: pd.Series,
+        knn_engine: str = KNN_ENGINE
+) -> Union[KNeighborsClassifier, BlockedKNeighborsClassifier]:
     """Create and return a K-Nearest Neighbour (KNN) classifier
     with cross-validated, optimised hyperparameter tuning.
 
@@ -23,19 +28,17 @@ def get_best_knn_classifier(
         train_targets: pd.Series
             The column/series of target labels for supervising
             the training of the KNN classifier.
+        knn_engine: str
+            The KNN engine, either 'sklearn' (by default) or 'blocked', i.e.,
+            the exact, memory-bounded search in float32 tiles, for which the
+            leaf size is irrelevant and thus not searched.
 
     Returns:
-        KNeighborsClassifier
+        Union[KNeighborsClassifier, BlockedKNeighborsClassifier]
             The trained and optimised KNN classifier.
     """
-
-    knn_classifier = KNeighborsClassifier(
-        weights=WEIGHTS_METHOD,
-        n_neighbors=NEIGHBOURS_NUM,
-        p=P_PARAM,
-        leaf_size=LEAF_SIZE,
-        algorithm=KNN_ALGO
-    )
+    if knn_engine not in KNN_ENGINES:
+        raise ValueError(f"Unknown KNN engine: {knn_engine}.")
 
     param_grid = {
         'weights': ['uniform', 'distance'],
@@ -43,6 +46,22 @@ def get_best_knn_classifier(
         'p': [1, 2]  # 1 for Manhattan distance, 2 for Euclidean distance
     }
 
+    if knn_engine == 'blocked':
+        knn_classifier = BlockedKNeighborsClassifier(
+            weights=WEIGHTS_METHOD,
+            n_neighbors=NEIGHBOURS_NUM,
+            p=P_PARAM
+        )
+        del param_grid['leaf_size']
+    else:
+        knn_classifier = KNeighborsClassifier(
+            weights=WEIGHTS_METHOD,
+            n_neighbors=NEIGHBOURS_NUM,
+            p=P_PARAM,
+            leaf_size=LEAF_SIZE,
+            algorithm=KNN_ALGO
+        )
+
     grid_search = GridSearchCV(
         estimator=knn_classifier,
         param_grid=param_grid,
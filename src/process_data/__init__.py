@@ -1,3 +1,4 @@
 """Init of the process_data module"""
 
-from . import balance_classes, prepare_data, remove_outliers, utils
+from . import (balance_classes, columnar_cache, dtype_policy, prepare_data,
+               remove_outliers, utils)
@@ -1,10 +1,73 @@
 """This Python file helps to balance samples for each class."""
 
+import math
+from typing import Hashable, Iterable, Optional, Union
+
+import numpy as np
 import pandas as pd
 
 from src.constants import TARGET_COL_NAME
 
-from .constants import RANDOM_STATE
+from .constants import RANDOM_STATE, RESERVOIR_SIZE
+
+# Name of the (temporary) columns of the sampling keys and arrival order of the
+# rows kept in the reservoirs
+_KEY_COL_NAME = '_reservoir_key'
+_ORDER_COL_NAME = '_reservoir_order'
+
+
+def get_target_counts(
+        class_counts: dict[Hashable, int],
+        class_ratios: Optional[dict[Hashable, float]] = None
+) -> dict[Hashable, int]:
+    """Get the largest number of samples to retain per class such that the classes
+    are in the target ratio, given the number of samples available per class.
+
+    Args:
+        class_counts: dict[Hashable, int]
+            The number of samples available per class.
+        class_ratios: Optional[dict[Hashable, float]]
+            The target (relative, positive) ratio of each class, e.g., {0: 1, 1: 2}
+            for twice as many samples of class 1 as of class 0 (None by default,
+            i.e., the same number of samples for each class). The classes without
+            a ratio are dropped.
+
+    Returns:
+        dict[Hashable, int]
+            The number of samples to retain per class.
+    """
+    if class_ratios is None:
+        class_ratios = {label: 1 for label in class_counts}
+    scale = min(class_counts.get(label, 0) / ratio
+                for label, ratio in class_ratios.items())
+    return {
+        label: min(class_counts.get(label, 0),
+                   math.floor(scale * ratio + 1e-9))
+        for label, ratio in class_ratios.items()
+    }
+
+
+def _balance_df(
+        input_df: pd.DataFrame,
+        class_name: str,
+        random_state: int,
+        class_ratios: Optional[dict[Hashable, float]] = None
+) -> pd.DataFrame:
+    """Balance the classes of an in-memory df, by retaining all samples of the
+    classes with no more samples than needed and sampling the other classes,
+    slicing the df without copying it whole, thus preserving its dtypes."""
+    class_counts = input_df[class_name].value_counts().to_dict()
+    target_counts = get_target_counts(class_counts, class_ratios)
+
+    class_dfs = []
+    for label in sorted(target_counts):
+        class_df = input_df[input_df[class_name] == label]
+        if target_counts[label] < len(class_df):
+            class_df = class_df.sample(
+                n=target_counts[label], random_state=random_state)
+        class_dfs.append(class_df)
+
+    return pd.concat(class_dfs)
 
 
 def balance_samples_per_class(
@@ -32,22 +95,79 @@ def balance_samples_per_class(
             The processed df with balanced classes, i.e., with the same number
             of samples for each class.
     """
+    return _balance_df(input_df, class_name, random_state)
+
 
-    balanced_df = input_df.copy()
-    status_counts = balanced_df[class_name].value_counts()
+def balance_samples_in_stream(
+        chunks: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        class_name: str = TARGET_COL_NAME,
+        random_state: int = RANDOM_STATE,
+        class_ratios: Optional[dict[Hashable, float]] = None,
+        reservoir_size: int = RESERVOIR_SIZE
+) -> pd.DataFrame:
+    """Balance samples per class out of core, i.e., from chunks (e.g., the pages
+    of a table) streamed one at a time, by keeping a seeded reservoir sample of
+    at most a given number of samples per class.
+
+    Each reservoir keeps the samples of its class with the smallest random keys
+    (i.e., bottom-k sampling), thus a uniform sample of the class, which is then
+    narrowed down to the samples with the smallest keys needed to balance the
+    classes. Given a single in-memory df instead, its classes are balanced as per
+    balance_samples_per_class, yielding the same samples.
+
+    Args:
+        chunks: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+            An in-memory df, or an iterable of chunks of a df.
+        class_name: str
+            The class name based on which the chunks need to be balanced
+            ('status' by default).
+        random_state: int
+            The random state of the sampling, for reproducibility.
+        class_ratios: Optional[dict[Hashable, float]]
+            The target (relative) ratio of each class (None by default, i.e.,
+            the same number of samples for each class, whichever the number of
+            classes).
+        reservoir_size: int
+            The maximum number of samples kept in memory per class (100000 by
+            default), thus capping the number of samples retained per class.
+
+    Returns:
+        pd.DataFrame
+            The df with balanced classes, the samples of each class being in
+            their order of arrival.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        return _balance_df(chunks, class_name, random_state, class_ratios)
 
-    # Get number of rows to retain for 'class_name = 1'
-    desired_count = status_counts[0]
+    rng = np.random.default_rng(random_state)
+    reservoirs: dict[Hashable, pd.DataFrame] = {}
+    rows_num = 0
 
-    # Sample n rows with 'class_name = 1'
-    balanced_df_train_status_1 = balanced_df[
-        balanced_df[class_name] == 1
-    ].sample(n=desired_count, random_state=random_state)
+    for chunk_df in chunks:
+        chunk_df = chunk_df.assign(**{
+            _KEY_COL_NAME: rng.random(len(chunk_df)),
+            _ORDER_COL_NAME: np.arange(rows_num, rows_num + len(chunk_df))
+        })
+        rows_num += len(chunk_df)
 
-    balanced_df_train_status_0 = balanced_df[balanced_df[class_name] == 0]
+        for label, class_df in chunk_df.groupby(
+                class_name, sort=False, observed=True):
+            if label in reservoirs:
+                class_df = pd.concat([reservoirs[label], class_df])
+            if len(class_df) > reservoir_size:
+                class_df = class_df.nsmallest(reservoir_size, _KEY_COL_NAME)
+            reservoirs[label] = class_df
 
-    # Retain all balanced rows/samples
-    balanced_df = pd.concat(
-        [balanced_df_train_status_0, balanced_df_train_status_1])
+    # Cap the samples available per class to the samples kept in its reservoir
+    target_counts = get_target_counts(
+        {label: len(reservoir) for label, reservoir in reservoirs.items()},
+        class_ratios)
 
-    return balanced_df
+    class_dfs = [
+        reservoirs[label].nsmallest(target_counts[label], _KEY_COL_NAME).sort_values(
+            _ORDER_COL_NAME)
+        for label in sorted(target_counts) if label in reservoirs
+    ]
+    if not class_dfs:
+        return pd.DataFrame()
+    return pd.concat(class_dfs).drop(columns=[_KEY_COL_NAME, _ORDER_COL_NAME])
@@ -0,0 +1,87 @@
+"""
+Columnar cache of the csv files, each converted once into a Parquet file so
+that later reads parse only the columns needed, with compact dtypes.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+import pandas as pd
+
+from src.get_src_dir import get_src_path
+from src.process_data.constants import (COLUMNAR_CACHE_DIR_STR, DATA_DIR_STR,
+                                        PARQUET_FMT_STR)
+
+ROOT_DIR_STR = str(get_src_path())
+COLUMNAR_CACHE_DIR = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{COLUMNAR_CACHE_DIR_STR}"
+
+
+def get_cache_path(
+        csv_full_path: str,
+        cache_dir: str = COLUMNAR_CACHE_DIR) -> str:
+    """
+    Get the path of the Parquet file caching a csv file.
+
+    Args:
+        csv_full_path: str
+            The full path to a csv file.
+        cache_dir: str
+            The directory of the cache (by default, 'columnar_cache' inside
+            the data directory).
+
+    Returns:
+        str
+            The path of the cached Parquet file, named after the csv file and
+            a hash of its full path, so that files with the same name in
+            different directories do not collide.
+    """
+    path_hash = hashlib.sha1(
+        os.path.abspath(csv_full_path).encode(),
+        usedforsecurity=False).hexdigest()[:16]
+    file_name = os.path.splitext(os.path.basename(csv_full_path))[0]
+    return f"{cache_dir}{os.sep}{file_name}.{path_hash}{PARQUET_FMT_STR}"
+
+
+def load_csv_columns(
+        csv_full_path: str,
+        cols: Optional[list[str]] = None,
+        dtypes: Optional[dict[str, str]] = None,
+        cache_dir: str = COLUMNAR_CACHE_DIR) -> pd.DataFrame:
+    """
+    Load (selected columns of) a csv file via its columnar cache, converting
+    the csv file into the cache first if not cached yet or if it has been
+    modified since it was cached.
+
+    Args:
+        csv_full_path: str
+            The full path to a csv file.
+        cols: Optional[list[str]]
+            The names of the columns to load (None by default, i.e., all).
+        dtypes: Optional[dict[str, str]]
+            The dtypes to cast the columns to, applied to the loaded columns
+            only (None by default, i.e., as inferred from the csv file).
+        cache_dir: str
+            The directory of the cache (by default, 'columnar_cache' inside
+            the data directory).
+
+    Returns:
+        pd.DataFrame
+            A df with the selected columns of the csv file.
+    """
+    cache_path = get_cache_path(csv_full_path, cache_dir)
+
+    if (not os.path.exists(cache_path)
+            or os.path.getmtime(cache_path) < os.path.getmtime(csv_full_path)):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_cache_path = f"{cache_path}.tmp"
+        pd.read_csv(csv_full_path).to_parquet(tmp_cache_path, index=False)
+        os.replace(tmp_cache_path, cache_path)
+
+    data_df = pd.read_parquet(
+        cache_path, columns=None if cols is None else list(cols))
+
+    if dtypes:
+        data_df = data_df.astype(
+            {col: dtype for col, dtype in dtypes.items() if col in data_df.columns})
+    return data_df
@@ -2,6 +2,8 @@
 Constants to aid data preparation.
 """
 
+from src.constants import TARGET_COL_NAME
+
 CSV_FMT_STR = '.csv'
 DATA_DIR_STR = 'data'
 
@@ -17,3 +19,89 @@ RANDOM_STATE = 0
 Z_SCORE_THRESH = 3
 
 COLS_TO_RETAIN = ['subject_id', 'apq_11', 'apq_3', 'jitter_percent', 'status']
+
+# Columnar (Parquet) cache of the csv files, converted once and then read
+# column by column
+COLUMNAR_CACHE_DIR_STR = 'columnar_cache'
+PARQUET_FMT_STR = '.parquet'
+
+# Compact dtypes of the speech data columns, applied on load
+COMPACT_DTYPES = {'subject_id': 'category', TARGET_COL_NAME: 'int8'}
+
+# Registry of the speech datasets to prepare, describing for each of them the
+# path to its initial csv file (inside the data directory), the columns to
+# retain (renamed to NEW_COL_NAMES, in the same order) and the target column
+# to rename to TARGET_COL_NAME, or else the target value of all rows when the
+# dataset has no target column (e.g., for the data of Max Little in 2009,
+# whose rows all pertain to PD subjects)
+SPEECH_DATASETS = {
+    'little_2008': {
+        'csv_path': 'Little_2008/parkinsons_data.csv',
+        'cols_to_retain': ['name', 'MDVP:Jitter(%)', 'MDVP:Jitter(Abs)',
+                           'MDVP:RAP', 'MDVP:PPQ', 'Shimmer:APQ3',
+                           'Shimmer:APQ5', 'MDVP:APQ'],
+        'target_col': TARGET_COL_NAME
+    },
+    'little_2009': {
+        'csv_path': 'Little_2009/parkinsons_updrs.csv',
+        'cols_to_retain': ['subject#', 'Jitter(%)', 'Jitter(Abs)',
+                           'Jitter:RAP', 'Jitter:PPQ5', 'Shimmer:APQ3',
+                           'Shimmer:APQ5', 'Shimmer:APQ11'],
+        'target_value': 1
+    },
+    'naranjo_2016': {
+        'csv_path': 'Naranjo_et_al_2016/ReplicatedAcousticFeatures-ParkinsonDatabase.csv',
+        'cols_to_retain': ['ID', 'Jitter_rel', 'Jitter_abs', 'Jitter_RAP',
+                           'Jitter_PPQ', 'Shim_APQ3', 'Shim_APQ5', 'Shi_APQ11'],
+        'target_col': 'Status'
+    },
+    'sakar_2013_train': {
+        'csv_path': 'Sakar_et_al_2013/train_data.csv',
+        'cols_to_retain': ['Subject_id', 'Jitter_local', 'Jitter_local_absolute',
+                           'Jitter_rap', 'Jitter_ppq5', 'Shimmer_apq3',
+                           'Shimmer_apq5', 'Shimmer_apq11'],
+        'target_col': 'class'
+    },
+    'sakar_2013_test': {
+        'csv_path': 'Sakar_et_al_2013/test_data.csv',
+        'cols_to_retain': ['Subject_id', 'Jitter_local', 'Jitter_local_absolute',
+                           'Jitter_rap', 'Jitter_ppq5', 'Shimmer_apq3',
+                           'Shimmer_apq5', 'Shimmer_apq11'],
+        'target_col': 'class'
+    },
+    'sakar_2018': {
+        'csv_path': 'Sakar_et_al_2018/pd_speech_features.csv',
+        'cols_to_retain': ['id', 'locPctJitter', 'locAbsJitter', 'rapJitter',
+                           'ppq5Jitter', 'apq3Shimmer', 'apq5Shimmer',
+                           'apq11Shimmer'],
+        'target_col': 'class'
+    }
+}
+
+# Number of worker processes preparing the speech datasets in parallel
+# (None to use as many as the CPU cores)
+PREPARE_WORKERS_NUM = None
+
+# Memory-compact dtype policy of the speech data, i.e., 32-bit floats for the
+# features (as stored in Cassandra), on top of the compact dtypes above
+FEATURE_DTYPE = 'float32'
+DTYPE_POLICY = {
+    **COMPACT_DTYPES,
+    **{col_name: FEATURE_DTYPE for col_name in NEW_COL_NAMES[1:]}
+}
+
+# Whether the readers apply the dtype policy on load
+IS_COMPACT = False
+
+# Whether the z-score outlier filter fits the statistics of each column on the
+# rows kept by the previous columns (rather than all at once on all rows), and
+# whether it uses robust statistics, i.e., the median and the median absolute
+# deviation (scaled to be consistent with the standard deviation of normally
+# distributed data) rather than the mean and the standard deviation
+IS_SEQUENTIAL = True
+IS_ROBUST = False
+MAD_SCALE = 1.4826
+
+# Maximum number of rows kept in memory per class when balancing the classes
+# of a stream of chunks, via a (seeded) reservoir sample of each class
+RESERVOIR_SIZE = 100000
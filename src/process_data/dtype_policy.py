@@ -0,0 +1,84 @@
+"""
+This Python file applies the memory-compact dtype policy of the speech data, i.e.,
+32-bit float features, 8-bit integer targets and categorical subject IDs, and
+reports the memory usage of the dfs it is applied to, stage by stage.
+"""
+
+import logging
+
+import pandas as pd
+
+from src.process_data.constants import DTYPE_POLICY
+
+
+def apply_dtype_policy(
+        input_df: pd.DataFrame,
+        dtype_policy: dict[str, str] = DTYPE_POLICY) -> pd.DataFrame:
+    """Cast the columns of a df to the dtypes of the policy, leaving the columns
+    the policy does not cover (or already in the right dtype) as they are.
+
+    Args:
+        input_df: pd.DataFrame
+            An input df with (some of) the speech data columns.
+        dtype_policy: dict[str, str]
+            The dtype of each column (by default, float32 features, int8
+            'status' and categorical 'subject_id').
+
+    Returns:
+        pd.DataFrame
+            The df with compact dtypes.
+    """
+    dtypes_to_cast = {
+        col: dtype for col, dtype in dtype_policy.items()
+        if col in input_df.columns and input_df[col].dtype != dtype
+    }
+    if not dtypes_to_cast:
+        return input_df
+    return input_df.astype(dtypes_to_cast)
+
+
+def _to_wide_dtypes(input_df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the compact columns of a df back to float64, int64 and the dtype of
+    the categories of the categorical ones, i.e., as loaded without the policy."""
+    wide_dtypes = {}
+    for col, dtype in input_df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            wide_dtypes[col] = dtype.categories.dtype
+        elif pd.api.types.is_float_dtype(dtype):
+            wide_dtypes[col] = 'float64'
+        elif pd.api.types.is_integer_dtype(dtype):
+            wide_dtypes[col] = 'int64'
+    return input_df.astype(wide_dtypes)
+
+
+def get_memory_usage_report(
+        stage_dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Report the memory usage of the df of each stage of the pipeline, compared
+    to the same df with wide dtypes, i.e., float64, int64 and non-categorical
+    columns.
+
+    Args:
+        stage_dfs: dict[str, pd.DataFrame]
+            The df of each stage, by stage name.
+
+    Returns:
+        pd.DataFrame
+            The number of rows, the memory usage in bytes with the current and
+            with wide dtypes, and the savings in percentage, of each stage.
+    """
+    report_rows = []
+    for stage_name, stage_df in stage_dfs.items():
+        stage_bytes = int(stage_df.memory_usage(index=True, deep=True).sum())
+        wide_bytes = int(_to_wide_dtypes(stage_df).memory_usage(
+            index=True, deep=True).sum())
+        report_rows.append({
+            'stage': stage_name,
+            'rows_num': len(stage_df),
+            'bytes': stage_bytes,
+            'wide_bytes': wide_bytes,
+            'savings_percent': 100 * (1 - stage_bytes / wide_bytes) if wide_bytes else 0.0
+        })
+
+    memory_usage_report = pd.DataFrame(report_rows).set_index('stage')
+    logging.info(f"The memory usage per stage is: {memory_usage_report}.")
+    return memory_usage_report
@@ -2,53 +2,31 @@
 This file prepares the datasets to have the same input and target column names and scales.
 """
 
+import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 
-import pandas as pd
-
+from src.constants import TARGET_COL_NAME
 from src.get_src_dir import get_src_path
-from src.process_data.constants import DATA_DIR_STR, NEW_COL_NAMES
-from src.process_data.utils import add_target_column, save_processed_df
+from src.process_data.columnar_cache import load_csv_columns
+from src.process_data.constants import (COMPACT_DTYPES, DATA_DIR_STR,
+                                        NEW_COL_NAMES, PREPARE_WORKERS_NUM,
+                                        SPEECH_DATASETS)
+from src.process_data.utils import get_processed_file_path, save_processed_df
 
 ROOT_DIR_STR = str(get_src_path())
 
 
-def generate_and_save_initial_processed_files() -> None:  # pragma: no cover
-    """
-    Generate and save the initial processed files to ensure that
-    they have the same target column name ('status', as
-    per the dataset of Little in 2008), and the same common
-    input features identified.
-    """
-    little_2009_csv_path = 'Little_2009/parkinsons_updrs.csv'
-    little_2009_df_processed = add_target_column(little_2009_csv_path)
-    save_processed_df(little_2009_csv_path, little_2009_df_processed)
-
-    naranjo_2016_csv_path = 'Naranjo_et_al_2016/ReplicatedAcousticFeatures-ParkinsonDatabase.csv'
-    naranjo_2016_df_processed = add_target_column(naranjo_2016_csv_path)
-    save_processed_df(naranjo_2016_csv_path, naranjo_2016_df_processed)
-
-    sakar_2013_train_csv_path = 'Sakar_et_al_2013/train_data.csv'
-    sakar_2013_train_df_processed = add_target_column(
-        sakar_2013_train_csv_path)
-    save_processed_df(sakar_2013_train_csv_path, sakar_2013_train_df_processed)
-
-    sakar_2013_test_csv_path = 'Sakar_et_al_2013/test_data.csv'
-    sakar_2013_test_df_processed = add_target_column(sakar_2013_test_csv_path)
-    save_processed_df(sakar_2013_test_csv_path, sakar_2013_test_df_processed)
-
-    sakar_2018_csv_path = 'Sakar_et_al_2018/pd_speech_features.csv'
-    sakar_2018_df_processed = add_target_column(sakar_2018_csv_path)
-    save_processed_df(sakar_2018_csv_path, sakar_2018_df_processed)
-
-
 def process_csv(
         csv_file_path: str,
         cols_to_retain: list[str],
         new_column_names: list[str]) -> None:
     """
     Process each csv file by retaining only relevant columns and renaming them consistently,
-    thus preparing them for merging them into train and test sets.
+    thus preparing them for merging them into train and test sets, and save it into its
+    processed csv file (rather than overwriting it).
 
     Args:
         csv_file_path: str
@@ -59,110 +37,95 @@ def process_csv(
             The new names of the columns.
     """
     csv_full_path = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{csv_file_path}"
-    data_df = pd.read_csv(csv_full_path)
-    data_df = data_df[cols_to_retain]
-    data_df.rename(columns=dict(
-        zip(cols_to_retain, new_column_names)), inplace=True)
-    data_df.to_csv(csv_full_path, index=False)
-
-
-def process_speech_datasets() -> None:  # pragma: no cover
-    """Process all speech datasets"""
-    little_2008_csv_path = 'Little_2008/parkinsons_data.csv'
-    little_2008_copy_df = pd.read_csv(
-        f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{little_2008_csv_path}")
-    little_2008_copy_df_path = 'Little_2008/parkinsons_data_processed.csv'
-    little_2008_copy_df.to_csv(
-        f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{little_2008_copy_df_path}",
-        index=False)
-    little_2008_cols_to_retain = [
-        'name',
-        'MDVP:Jitter(%)',
-        'MDVP:Jitter(Abs)',
-        'MDVP:RAP',
-        'MDVP:PPQ',
-        'Shimmer:APQ3',
-        'Shimmer:APQ5',
-        'MDVP:APQ',
-        'status']
-    process_csv(little_2008_copy_df_path,
-                little_2008_cols_to_retain, NEW_COL_NAMES)
-
-    little_2009_csv_path = 'Little_2009/parkinsons_updrs_processed.csv'
-    little_2009_cols_to_retain = [
-        'subject#',
-        'Jitter(%)',
-        'Jitter(Abs)',
-        'Jitter:RAP',
-        'Jitter:PPQ5',
-        'Shimmer:APQ3',
-        'Shimmer:APQ5',
-        'Shimmer:APQ11',
-        'status']
-    process_csv(
-        little_2009_csv_path,
-        little_2009_cols_to_retain,
-        NEW_COL_NAMES)
-
-    naranjo_2016_csv_path = \
-        'Naranjo_et_al_2016/ReplicatedAcousticFeatures-ParkinsonDatabase_processed.csv'
-    naranjo_2016_cols_to_retain = [
-        'ID',
-        'Jitter_rel',
-        'Jitter_abs',
-        'Jitter_RAP',
-        'Jitter_PPQ',
-        'Shim_APQ3',
-        'Shim_APQ5',
-        'Shi_APQ11',
-        'status']
-    process_csv(
-        naranjo_2016_csv_path,
-        naranjo_2016_cols_to_retain,
-        NEW_COL_NAMES)
-
-    sakar_2013_train_csv_path = 'Sakar_et_al_2013/train_data_processed.csv'
-    sakar_2013_train_cols_to_retain = [
-        'Subject_id',
-        'Jitter_local',
-        'Jitter_local_absolute',
-        'Jitter_rap',
-        'Jitter_ppq5',
-        'Shimmer_apq3',
-        'Shimmer_apq5',
-        'Shimmer_apq11',
-        'status']
-    process_csv(sakar_2013_train_csv_path,
-                sakar_2013_train_cols_to_retain, NEW_COL_NAMES)
-
-    sakar_2013_test_csv_path = 'Sakar_et_al_2013/test_data_processed.csv'
-    sakar_2013_test_cols_to_retain = [
-        'Subject_id',
-        'Jitter_local',
-        'Jitter_local_absolute',
-        'Jitter_rap',
-        'Jitter_ppq5',
-        'Shimmer_apq3',
-        'Shimmer_apq5',
-        'Shimmer_apq11',
-        'status']
-    process_csv(sakar_2013_test_csv_path,
-                sakar_2013_test_cols_to_retain, NEW_COL_NAMES)
-
-    sakar_2018_csv_path = 'Sakar_et_al_2018/pd_speech_features_processed.csv'
-    sakar_2018_cols_to_retain = [
-        'id',
-        'locPctJitter',
-        'locAbsJitter',
-        'rapJitter',
-        'ppq5Jitter',
-        'apq3Shimmer',
-        'apq5Shimmer',
-        'apq11Shimmer',
-        'status']
-    process_csv(sakar_2018_csv_path, sakar_2018_cols_to_retain, NEW_COL_NAMES)
+    # Parse only the columns to retain, from the columnar cache of the file
+    data_df = load_csv_columns(csv_full_path, list(cols_to_retain))
+    data_df = data_df.rename(
+        columns=dict(zip(cols_to_retain, new_column_names)))
+    data_df = data_df.astype(
+        {col: dtype for col, dtype in COMPACT_DTYPES.items() if col in data_df.columns})
+    save_processed_df(csv_file_path, data_df)
+
+
+def prepare_dataset(
+        dataset_name: str,
+        datasets: dict[str, dict] = SPEECH_DATASETS,
+        new_column_names: list[str] = NEW_COL_NAMES,
+        target_col_name: str = TARGET_COL_NAME) -> str:
+    """
+    Prepare a speech dataset described in the registry of datasets, by retaining
+    only its relevant columns, renaming them consistently and naming (or adding)
+    its target column consistently, and save it into a processed csv file.
+
+    Args:
+        dataset_name: str
+            The name of the dataset in the registry of datasets.
+        datasets: dict[str, dict]
+            The registry of datasets, describing each dataset via the path to its
+            initial csv file, the columns to retain and either the target column to
+            rename or the target value of all rows.
+        new_column_names: list[str]
+            The new names of the columns to retain.
+        target_col_name: str
+            The name of the target column ('status' by default).
+
+    Returns:
+        str
+            The path to the processed csv file, inside the data directory.
+    """
+    dataset = datasets[dataset_name]
+    csv_file_path = dataset['csv_path']
+    cols_to_retain = list(dataset['cols_to_retain'])
+    target_col = dataset.get('target_col')
+
+    data_df = load_csv_columns(
+        f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{csv_file_path}",
+        cols_to_retain + ([target_col] if target_col else []))
+    data_df = data_df.rename(
+        columns=dict(zip(cols_to_retain, new_column_names)))
+    if target_col:
+        data_df = data_df.rename(columns={target_col: target_col_name})
+    else:
+        data_df[target_col_name] = dataset['target_value']
+    data_df = data_df[list(new_column_names) + [target_col_name]].astype(
+        {col: dtype for col, dtype in COMPACT_DTYPES.items() if col in data_df.columns})
+
+    save_processed_df(csv_file_path, data_df)
+    logging.info(f"Prepared the dataset {dataset_name} ({len(data_df)} rows).")
+    return get_processed_file_path(csv_file_path)
+
+
+def prepare_speech_datasets(
+        datasets: dict[str, dict] = SPEECH_DATASETS,
+        workers_num: Optional[int] = PREPARE_WORKERS_NUM) -> dict[str, str]:
+    """
+    Prepare all speech datasets described in the registry of datasets in
+    parallel, with one worker process per dataset at a time.
+
+    Args:
+        datasets: dict[str, dict]
+            The registry of datasets to prepare.
+        workers_num: Optional[int]
+            The number of worker processes (None by default, i.e., as many
+            as the CPU cores).
+
+    Returns:
+        dict[str, str]
+            The path to the processed csv file of each dataset, inside the
+            data directory.
+    """
+    with ProcessPoolExecutor(
+            max_workers=workers_num,
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {
+            dataset_name: executor.submit(
+                prepare_dataset, dataset_name, datasets)
+            for dataset_name in datasets
+        }
+        return {
+            dataset_name: future.result()
+            for dataset_name, future in futures.items()
+        }
 
 
 if __name__ == '__main__':
-    generate_and_save_initial_processed_files()
-    process_speech_datasets()
+    prepare_speech_datasets()
@@ -1,10 +1,206 @@
 """This Python file helps to identify and remove outliers."""
 
+import json
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from scipy import stats
 
-from .constants import Z_SCORE_THRESH
+from .constants import IS_ROBUST, IS_SEQUENTIAL, MAD_SCALE, Z_SCORE_THRESH
+
+
+class ZScoreOutlierFilter:
+    """Outlier filter based on the z-scores of selected columns, whose
+    statistics are fitted once and can then be applied to any (e.g., streamed
+    test or inference) data in a vectorised manner.
+
+    Args:
+        list_of_cols: list[str]
+            A list of columns to use to identify outliers.
+        thresh: float
+            The z-score threshold beyond which a row is an outlier.
+        is_sequential: bool
+            Whether to fit the statistics of each column on the rows kept by
+            the previous columns, as when removing outliers column by column
+            (True by default), rather than on all rows in a single pass.
+        is_robust: bool
+            Whether to use the median and the (scaled) median absolute
+            deviation rather than the mean and the standard deviation
+            (False by default).
+    """
+
+    def __init__(
+            self,
+            list_of_cols: list[str],
+            thresh: float = Z_SCORE_THRESH,
+            is_sequential: bool = IS_SEQUENTIAL,
+            is_robust: bool = IS_ROBUST):
+        self.list_of_cols = list(list_of_cols)
+        self.thresh = thresh
+        self.is_sequential = is_sequential
+        self.is_robust = is_robust
+        self.centres: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+
+    def _get_stats(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the centre and scale of each column of a matrix."""
+        if self.is_robust:
+            centres = np.median(values, axis=0)
+            scales = MAD_SCALE * np.median(np.abs(values - centres), axis=0)
+        else:
+            centres = values.mean(axis=0)
+            scales = values.std(axis=0)
+        return centres, scales
+
+    def _get_values(self, input_df: pd.DataFrame) -> np.ndarray:
+        """Get the values of the selected columns in double precision."""
+        return input_df[self.list_of_cols].to_numpy(dtype=np.float64)
+
+    def fit(self, input_df: pd.DataFrame) -> 'ZScoreOutlierFilter':
+        """Fit the statistics of the selected columns.
+
+        Args:
+            input_df: pd.DataFrame
+                An input df to fit the statistics on.
+
+        Returns:
+            ZScoreOutlierFilter
+                The fitted filter.
+        """
+        values = self._get_values(input_df)
+        if not self.is_sequential:
+            self.centres, self.scales = self._get_stats(values)
+            return self
+
+        self.centres = np.empty(len(self.list_of_cols))
+        self.scales = np.empty(len(self.list_of_cols))
+        is_kept = np.ones(len(values), dtype=bool)
+        for col_num in range(len(self.list_of_cols)):
+            col_values = values[is_kept, col_num:col_num + 1]
+            centre, scale = self._get_stats(col_values)
+            self.centres[col_num], self.scales[col_num] = centre[0], scale[0]
+            z_scores = self._get_z_scores(values[:, col_num], col_num)
+            is_kept &= z_scores < self.thresh
+        return self
+
+    def _get_z_scores(
+            self,
+            values: np.ndarray,
+            col_num: Optional[int] = None) -> np.ndarray:
+        """Get the absolute z-scores of the values of a (or each) column."""
+        centres = self.centres if col_num is None else self.centres[col_num]
+        scales = self.scales if col_num is None else self.scales[col_num]
+        # Constant columns yield infinite or undefined z-scores, thus outliers
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.abs((values - centres) / scales)
+
+    def get_inlier_mask(self, input_df: pd.DataFrame) -> np.ndarray:
+        """Get which rows are inliers, i.e., whose z-scores are all within the
+        threshold, given the fitted statistics.
+
+        Args:
+            input_df: pd.DataFrame
+                An input df with the selected columns.
+
+        Returns:
+            np.ndarray
+                A boolean mask of the inliers.
+        """
+        if self.centres is None:
+            raise ValueError('The outlier filter must be fitted first.')
+        z_scores = self._get_z_scores(self._get_values(input_df))
+        return (z_scores < self.thresh).all(axis=1)
+
+    def transform(self, input_df: pd.DataFrame) -> pd.DataFrame:
+        """Remove the outliers from a df given the fitted statistics.
+
+        Args:
+            input_df: pd.DataFrame
+                An input df to filter to remove outliers.
+
+        Returns:
+            pd.DataFrame
+                The df without outliers, with the same dtypes.
+        """
+        return input_df[self.get_inlier_mask(input_df)]
+
+    def fit_transform(self, input_df: pd.DataFrame) -> pd.DataFrame:
+        """Fit the statistics of the selected columns on a df and remove its
+        outliers. In the sequential mode, this yields the same rows as removing
+        the outliers column by column while recomputing the z-scores each time.
+
+        Args:
+            input_df: pd.DataFrame
+                An input df to fit the statistics on and to filter.
+
+        Returns:
+            pd.DataFrame
+                The df without outliers, with the same dtypes.
+        """
+        return self.fit(input_df).transform(input_df)
+
+    def to_dict(self) -> dict:
+        """Serialise the parameters and fitted statistics of the filter.
+
+        Returns:
+            dict
+                The (JSON-serialisable) parameters and statistics.
+        """
+        return {
+            'list_of_cols': self.list_of_cols,
+            'thresh': self.thresh,
+            'is_sequential': self.is_sequential,
+            'is_robust': self.is_robust,
+            'centres': None if self.centres is None else self.centres.tolist(),
+            'scales': None if self.scales is None else self.scales.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, filter_dict: dict) -> 'ZScoreOutlierFilter':
+        """Deserialise a filter from its parameters and fitted statistics.
+
+        Args:
+            filter_dict: dict
+                The parameters and statistics, as serialised via to_dict.
+
+        Returns:
+            ZScoreOutlierFilter
+                The (fitted) filter.
+        """
+        outlier_filter = cls(
+            filter_dict['list_of_cols'], filter_dict['thresh'],
+            filter_dict['is_sequential'], filter_dict['is_robust'])
+        if filter_dict['centres'] is not None:
+            outlier_filter.centres = np.array(
+                filter_dict['centres'], dtype=np.float64)
+            outlier_filter.scales = np.array(
+                filter_dict['scales'], dtype=np.float64)
+        return outlier_filter
+
+    def save(self, json_path: str) -> None:
+        """Save the filter into a JSON file.
+
+        Args:
+            json_path: str
+                The path to the JSON file.
+        """
+        with open(json_path, 'w', encoding='utf-8') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
+
+    @classmethod
+    def load(cls, json_path: str) -> 'ZScoreOutlierFilter':
+        """Load a filter from a JSON file.
+
+        Args:
+            json_path: str
+                The path to the JSON file.
+
+        Returns:
+            ZScoreOutlierFilter
+                The (fitted) filter.
+        """
+        with open(json_path, encoding='utf-8') as json_file:
+            return cls.from_dict(json.load(json_file))
 
 
 def z_score_outlier_removal(
@@ -25,9 +221,9 @@ def z_score_outlier_removal(
     Returns:
         The df without outliers.
     """
-    df_train_wo_outliers = input_df.copy()
-    for col in list_of_cols:
-        df_train_wo_outliers = df_train_wo_outliers[
-            (np.abs(stats.zscore(df_train_wo_outliers[col])) < thresh)
-        ]
-    return df_train_wo_outliers
+    # The z-scores of each column are computed on the rows kept by the
+    # previous columns, in double precision, so that compact (e.g., float32)
+    # columns are filtered as their float64 counterparts, while the (compact)
+    # dtypes of the df itself are preserved
+    return ZScoreOutlierFilter(
+        list_of_cols, thresh, is_sequential=True).fit_transform(input_df)
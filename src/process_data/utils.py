@@ -8,6 +8,7 @@ import pandas as pd
 
 from src.constants import TARGET_COL_NAME
 from src.get_src_dir import get_src_path
+from src.process_data.columnar_cache import load_csv_columns
 from src.process_data.constants import (COLS_TO_RETAIN, CSV_FMT_STR,
                                         DATA_DIR_STR, PROCESSED_SUFFIX)
 
@@ -30,7 +31,7 @@ def add_target_column(
         The updated df with the target column.
     """
 
-    initial_df = pd.read_csv(
+    initial_df = load_csv_columns(
         f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{initial_file_path}"
     )
 
@@ -78,11 +79,49 @@ def retain_selected_cols(
         The sliced df with selected columns.
     """
 
-    df_w_selected_cols = input_df.copy()
-    df_w_selected_cols = df_w_selected_cols[cols_to_retain]
+    # Copy only the selected columns, preserving their (compact) dtypes
+    df_w_selected_cols = input_df[cols_to_retain].copy()
     return df_w_selected_cols
 
 
+def get_processed_file_path(
+        initial_file_path: str,
+        processed_suffix: str = PROCESSED_SUFFIX) -> str:
+    """
+    Get the path to the processed csv file of an initial csv file.
+
+    Args:
+        initial_file_path: str
+                The path to the initial csv file (with the extension).
+        processed_suffix: str
+                The processed file name's suffix ('_processed' by default).
+
+    Returns:
+        str
+            The path to the processed csv file, i.e., the initial one with the
+            suffix added.
+    """
+    return f"{initial_file_path.split('.')[0]}{processed_suffix}{CSV_FMT_STR}"
+
+
+def save_df_atomically(
+        data_df: pd.DataFrame,
+        csv_full_path: str) -> None:
+    """
+    Save a df to a csv file atomically, i.e., via a temporary file then renamed,
+    so that an interrupted run never leaves a partially-written csv file behind.
+
+    Args:
+        data_df: pd.DataFrame
+                The df to save into a csv file.
+        csv_full_path: str
+                The full path to the csv file.
+    """
+    tmp_csv_full_path = f"{csv_full_path}.tmp"
+    data_df.to_csv(tmp_csv_full_path, index=False)
+    os.replace(tmp_csv_full_path, csv_full_path)
+
+
 def save_processed_df(
         initial_file_path: str,
         processed_df: pd.DataFrame,
@@ -98,7 +137,7 @@ def save_processed_df(
         processed_suffix: str
                 The processed file name's suffix ('_processed' by default).
     """
-    processed_df.to_csv(
+    save_df_atomically(
+        processed_df,
         f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}"
-        f"{initial_file_path.split('.')[0]}{processed_suffix}{CSV_FMT_STR}",
-        index=False)
+        f"{get_processed_file_path(initial_file_path, processed_suffix)}")
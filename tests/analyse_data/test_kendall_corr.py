@@ -0,0 +1,66 @@
+"""Tests for the Kendall correlation engine"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.analyse_data.kendall_corr import get_kendall_corr_matrix
+
+
+class TestGetKendallCorrMatrix(unittest.TestCase):
+    """Test class for the Kendall correlation matrix"""
+
+    def setUp(self):
+        """Provide a dummy dataset with ties, missing values and a non-numeric
+        column, and a temporary cache directory"""
+        rng = np.random.default_rng(0)
+        self.data_df = pd.DataFrame({
+            'subject_id': [f"S{num % 7}" for num in range(300)],
+            'jitter_abs': rng.normal(1e-5, 1e-6, 300),
+            'rap': rng.integers(0, 10, 300).astype(float),
+            'apq_11': rng.random(300),
+            'status': rng.integers(0, 2, 300)
+        })
+        self.data_df['ppq'] = self.data_df['rap'] + rng.random(300)
+        self.data_df.loc[[3, 50, 99], 'apq_11'] = np.nan
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary cache directory"""
+        shutil.rmtree(self.cache_dir)
+
+    def test_matches_pandas(self):
+        """Ensure the matrix matches pandas' one, whether the pairs are computed
+        in the current process or in worker processes"""
+        expected_df = self.data_df.corr(method='kendall', numeric_only=True)
+        for parallel_min_rows in (len(self.data_df) + 1, 0):
+            correl_matrix = get_kendall_corr_matrix(
+                self.data_df, workers_num=2,
+                parallel_min_rows=parallel_min_rows, cache_dir=None)
+            pd.testing.assert_frame_equal(
+                correl_matrix, expected_df, atol=1e-12)
+
+    def test_cached_matrix_is_reused(self):
+        """Ensure the matrix is cached and reused for the same data only"""
+        correl_matrix = get_kendall_corr_matrix(
+            self.data_df, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        with patch('src.analyse_data.kendall_corr.kendall_tau_b') as mock_kendall_tau_b:
+            cached_matrix = get_kendall_corr_matrix(
+                self.data_df.reset_index(drop=True), cache_dir=self.cache_dir)
+        mock_kendall_tau_b.assert_not_called()
+        pd.testing.assert_frame_equal(cached_matrix, correl_matrix)
+
+        self.data_df.loc[0, 'rap'] += 1
+        get_kendall_corr_matrix(self.data_df, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
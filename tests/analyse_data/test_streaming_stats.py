@@ -0,0 +1,85 @@
+"""Tests for the one-pass streaming statistics of a dataset"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analyse_data.streaming_stats import (StreamingStats,
+                                              analyse_dataset_in_one_pass)
+
+
+class TestStreamingStats(unittest.TestCase):
+    """Test class for the streaming statistics"""
+
+    def setUp(self):
+        """Provide a dummy dataset with missing values"""
+        rng = np.random.default_rng(0)
+        self.data_df = pd.DataFrame({
+            'subject_id': [f"S{num % 7}" for num in range(101)],
+            'jitter_abs': rng.normal(1e-5, 1e-6, 101),
+            'apq_11': rng.random(101),
+            'status': rng.integers(0, 2, 101)
+        })
+        self.data_df.loc[[3, 50, 99], 'apq_11'] = np.nan
+
+    def _get_report(self, chunk_size: int, sample_size: int = 1000) -> dict:
+        """Get the report of the dummy dataset streamed in chunks"""
+        streaming_stats = StreamingStats(sample_size=sample_size)
+        for start in range(0, len(self.data_df), chunk_size):
+            streaming_stats.update(self.data_df.iloc[start:start + chunk_size])
+        return streaming_stats.to_report()
+
+    def test_stats_match_pandas(self):
+        """Ensure the statistics match pandas' ones, whichever the chunk size"""
+        for chunk_size in (1, 10, 1000):
+            report = self._get_report(chunk_size)
+            for col in ('jitter_abs', 'apq_11'):
+                col_report = report['columns'][col]
+                description = self.data_df[col].describe()
+                self.assertEqual(col_report['count'], description['count'])
+                for stat_name, description_name in (
+                        ('mean', 'mean'), ('std', 'std'), ('min', 'min'),
+                        ('max', 'max')):
+                    self.assertAlmostEqual(
+                        col_report[stat_name] / description[description_name], 1.0)
+                for quantile, description_name in (
+                        ('0.25', '25%'), ('0.5', '50%')):
+                    self.assertAlmostEqual(
+                        col_report['quantiles'][quantile],
+                        description[description_name])
+
+            self.assertEqual(report['rows_num'], 101)
+            self.assertEqual(report['cols_with_nan'], ['apq_11'])
+            self.assertEqual(report['columns']['apq_11']['nan_count'], 3)
+            self.assertFalse(report['columns']['subject_id']['is_numeric'])
+            self.assertEqual(
+                report['class_balance'],
+                {str(label): int(count) for label, count
+                 in self.data_df['status'].value_counts().items()})
+
+    def test_approximate_quantiles(self):
+        """Ensure the quantiles are approximated from a bounded sample"""
+        report = self._get_report(chunk_size=10, sample_size=50)
+        self.assertAlmostEqual(
+            report['columns']['apq_11']['quantiles']['0.5'],
+            self.data_df['apq_11'].median(), delta=0.15)
+
+    def test_analyse_dataset_in_one_pass(self):
+        """Ensure a csv dataset is analysed and its JSON report saved"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            csv_path = f"{tmp_dir}{os.sep}data.csv"
+            report_path = f"{tmp_dir}{os.sep}report.json"
+            self.data_df.to_csv(csv_path, index=False)
+
+            report = analyse_dataset_in_one_pass(
+                csv_path, chunk_size=16, report_path=report_path)
+
+            self.assertEqual(report['rows_num'], 101)
+            self.assertTrue(os.path.exists(report_path))
+        finally:
+            shutil.rmtree(tmp_dir)
@@ -0,0 +1,131 @@
+"""Tests for the sharding of csv files bulk-loaded into tables and for the
+incremental writes of csv files into tables"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.create_cassandra_db.constants import FEATURE_COL_NAMES
+from src.create_cassandra_db.create_tables import (_split_csv_into_shards,
+                                                   write_delta_to_table)
+
+HEADER = b'subject_id,jitter_percent,status\n'
+
+
+class TestSplitCsvIntoShards(unittest.TestCase):
+    """Test class for splitting a csv file into byte-range shards"""
+
+    def setUp(self):
+        """Provide a temporary directory and data lines of various lengths"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = f"{self.tmp_dir}{os.sep}data.csv"
+        self.lines = [
+            f"S{num},0.{'1' * (num % 9 + 1)},{num % 2}\n".encode()
+            for num in range(50)]
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def _assert_lines_split_once(self, body: bytes, shards_num: int):
+        """Ensure each data line is in exactly one shard, starting on a line
+        boundary and positioned correctly, and the header in none"""
+        with open(self.csv_path, 'wb') as csv_file:
+            csv_file.write(HEADER + body)
+        header, shards = _split_csv_into_shards(self.csv_path, shards_num)
+
+        self.assertEqual(header, HEADER)
+        self.assertLessEqual(len(shards), shards_num)
+        shards_lines = []
+        with open(self.csv_path, 'rb') as csv_file:
+            for start, end, first_row_num in shards:
+                csv_file.seek(start)
+                shard_bytes = csv_file.read(end - start)
+                shard_lines = shard_bytes.splitlines(keepends=True)
+                self.assertEqual(first_row_num, len(shards_lines))
+                shards_lines.extend(shard_lines)
+        self.assertEqual(shards_lines, body.splitlines(keepends=True))
+
+    def test_lines_split_once(self):
+        """Ensure no line is dropped or duplicated, whatever the number of
+        shards, including more shards than lines"""
+        for shards_num in (1, 2, 3, 7, 50, 80):
+            with self.subTest(shards_num=shards_num):
+                self._assert_lines_split_once(
+                    b''.join(self.lines), shards_num)
+
+    def test_no_trailing_line_break(self):
+        """Ensure the last line is kept without a trailing line break"""
+        self._assert_lines_split_once(b''.join(self.lines).rstrip(b'\n'), 4)
+
+    def test_header_only(self):
+        """Ensure a csv file without data lines yields no shards"""
+        with open(self.csv_path, 'wb') as csv_file:
+            csv_file.write(HEADER)
+        self.assertEqual(
+            _split_csv_into_shards(self.csv_path, 4), (HEADER, []))
+
+
+class TestWriteDeltaToTable(unittest.TestCase):
+    """Test class for writing the delta of a csv file into a table"""
+
+    def setUp(self):
+        """Provide a temporary directory and a csv file of two recordings of
+        a subject and one of another"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = f"{self.tmp_dir}{os.sep}data.csv"
+        self.manifest_path = f"{self.tmp_dir}{os.sep}manifest.parquet"
+        self.data_df = pd.DataFrame({
+            'subject_id': ['a', 'a', 'b'],
+            **{col_name: [0.1, 0.2, 0.3] for col_name in FEATURE_COL_NAMES},
+            'status': [1, 1, 0]
+        })
+        self.session = MagicMock()
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_delta(self, data_df: pd.DataFrame):
+        """Write the delta of a df into a partitioned table, and get the
+        summary, the inserted rows and the deleted keys"""
+        data_df.to_csv(self.csv_path, index=False)
+        with patch('src.create_cassandra_db.create_tables.bump_table_version'), \
+                patch('src.create_cassandra_db.create_tables.'
+                      'execute_concurrent_with_args') as mock_execute:
+            delta_summary = write_delta_to_table(
+                self.session, self.csv_path, 'speech_data_train',
+                to_delete_missing=True, manifest_path=self.manifest_path,
+                is_partitioned=True)
+        inserted_rows = list(mock_execute.call_args_list[0].args[2])
+        deleted_keys = list(mock_execute.call_args_list[1].args[2])
+        return delta_summary, inserted_rows, deleted_keys
+
+    def test_partitioned_delta(self):
+        """Ensure each recording of a partitioned table is written and
+        deleted on its own, rather than once per subject"""
+        delta_summary, inserted_rows, _ = self._write_delta(self.data_df)
+        self.assertEqual(delta_summary['new'], 3)
+        self.assertEqual([(row[0], row[-1]) for row in inserted_rows],
+                         [('a', 0), ('a', 1), ('b', 2)])
+
+        changed_df = self.data_df.iloc[:2].copy()
+        changed_df.loc[1, 'apq_11'] = 0.5
+        delta_summary, inserted_rows, deleted_keys = self._write_delta(
+            changed_df)
+        self.assertEqual(
+            delta_summary,
+            {'new': 0, 'changed': 1, 'unchanged': 1, 'deleted': 1})
+        self.assertEqual([(row[0], row[-1]) for row in inserted_rows],
+                         [('a', 1)])
+        self.assertEqual(deleted_keys, [('b', 2)])
+        self.assertIn('subject_id = ? AND recording_id = ?',
+                      self.session.prepare.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
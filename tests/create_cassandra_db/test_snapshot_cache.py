@@ -0,0 +1,84 @@
+"""Tests for the read-through cache of table snapshots"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.create_cassandra_db.snapshot_cache import get_cached_data_from_table
+
+TABLE_NAME = 'speech_data_train'
+
+
+class TestGetCachedDataFromTable(unittest.TestCase):
+    """Test class for reading table snapshots through the cache"""
+
+    def setUp(self):
+        """Provide a temporary directory, a dummy session and table"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.session = MagicMock(keyspace='parkinson')
+        self.table_df = pd.DataFrame(
+            {'subject_id': ['a', 'b'], 'apq_11': [0.1, 0.2], 'status': [1, 0]})
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def _get_cached_data(
+            self,
+            version: int,
+            is_compact: bool = False
+    ) -> pd.DataFrame:
+        """Read the table through the cache given its version and whether to
+        apply the memory-compact dtype policy"""
+        with patch('src.create_cassandra_db.snapshot_cache.get_table_version',
+                   return_value=version):
+            return get_cached_data_from_table(
+                self.session, TABLE_NAME, is_compact=is_compact,
+                snapshots_dir=self.tmp_dir)
+
+    @patch('src.create_cassandra_db.snapshot_cache.get_all_data_from_table')
+    def test_snapshot_reused(self, mock_get_all_data):
+        """Ensure the table is read only once while its version is unchanged"""
+        mock_get_all_data.return_value = self.table_df
+
+        self._get_cached_data(version=1)
+        result_df = self._get_cached_data(version=1)
+
+        mock_get_all_data.assert_called_once()
+        assert_frame_equal(result_df, self.table_df)
+
+    @patch('src.create_cassandra_db.snapshot_cache.get_all_data_from_table')
+    def test_snapshot_invalidated(self, mock_get_all_data):
+        """Ensure the table is read again, and the previous snapshot
+        removed, once its version is bumped"""
+        mock_get_all_data.return_value = self.table_df
+
+        self._get_cached_data(version=1)
+        self._get_cached_data(version=2)
+
+        self.assertEqual(mock_get_all_data.call_count, 2)
+        self.assertEqual(
+            os.listdir(self.tmp_dir),
+            [f'parkinson.{TABLE_NAME}.v2.parquet'])
+
+    @patch('src.create_cassandra_db.snapshot_cache.get_all_data_from_table')
+    def test_snapshot_per_dtype_policy(self, mock_get_all_data):
+        """Ensure a snapshot read with the memory-compact dtype policy is not
+        served for a read without it, and vice versa"""
+        mock_get_all_data.return_value = self.table_df
+
+        self._get_cached_data(version=1)
+        self._get_cached_data(version=1, is_compact=True)
+        self._get_cached_data(version=1, is_compact=True)
+
+        self.assertEqual(mock_get_all_data.call_count, 2)
+        self.assertTrue(mock_get_all_data.call_args.kwargs['is_compact'])
+        self.assertEqual(
+            sorted(os.listdir(self.tmp_dir)),
+            [f'parkinson.{TABLE_NAME}.v1.compact.parquet',
+             f'parkinson.{TABLE_NAME}.v1.parquet'])
@@ -0,0 +1,71 @@
+"""Tests for the local, embedded storage backend"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.create_cassandra_db.storage_backends import ParquetBackend
+
+TABLE_NAME = 'speech_data_test'
+
+
+class TestParquetBackend(unittest.TestCase):
+    """Test class for the Parquet storage backend"""
+
+    def setUp(self):
+        """Provide a temporary directory and a dummy csv file for tests"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = f"{self.tmp_dir}{os.sep}data.csv"
+        pd.DataFrame({
+            'subject_id': ['a', 'b', 'a'],
+            'jitter_percent': [0.1, 0.2, 0.3],
+            'jitter_abs': [1e-5, 2e-5, 3e-5],
+            'rap': [0.1, 0.2, 0.3],
+            'ppq': [0.1, 0.2, 0.3],
+            'apq_3': [0.1, 0.2, 0.3],
+            'apq_5': [0.1, 0.2, 0.3],
+            'apq_11': [0.1, 0.2, 0.3],
+            'status': [1, 0, 0]
+        }).to_csv(self.csv_path, index=False)
+
+        self.backend = ParquetBackend(f"{self.tmp_dir}{os.sep}tables")
+        self.backend.create_table(TABLE_NAME)
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_empty_table(self):
+        """Ensure a newly created table is empty"""
+        result_df = self.backend.get_all_data_from_table(TABLE_NAME)
+        self.assertEqual(len(result_df), 0)
+
+    def test_write_and_get_all_data(self):
+        """Ensure rows are upserted by primary key, with 32-bit precision
+        and the columns in the same order as in Cassandra"""
+        self.backend.write_data_to_table(self.csv_path, TABLE_NAME)
+        result_df = self.backend.get_all_data_from_table(TABLE_NAME)
+
+        self.assertEqual(
+            list(result_df.columns),
+            ['subject_id', 'apq_11', 'apq_3', 'apq_5', 'jitter_abs',
+             'jitter_percent', 'ppq', 'rap', 'status'])
+        result_df = result_df.set_index('subject_id').sort_index()
+        self.assertEqual(list(result_df['status']), [0, 0])
+        self.assertEqual(
+            result_df.loc['a', 'apq_11'], float(np.float32(0.3)))
+
+    def test_get_all_data_columnar(self):
+        """Ensure columnar reads return compact dtypes"""
+        self.backend.write_data_to_table(self.csv_path, TABLE_NAME)
+        result_df = self.backend.get_all_data_from_table(
+            TABLE_NAME, is_columnar=True)
+
+        self.assertEqual(result_df['apq_11'].dtype, np.float32)
+        self.assertEqual(result_df['status'].dtype, np.int8)
+        self.assertIsInstance(
+            result_df['subject_id'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,169 @@
+"""Tests for the paged reads from Apache Cassandra tables"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.create_cassandra_db.utils import (columnar_row_factory,
+                                           create_session,
+                                           get_class_sampled_data_from_table,
+                                           get_filtered_data_from_table,
+                                           shutdown_sessions)
+
+COL_NAMES = ['subject_id', 'apq_11', 'status']
+
+
+class FakeResultSet:
+    """Result set fetching its pages into the same object, as per the driver"""
+
+    def __init__(self, pages: list[list[tuple]], row_factory=None):
+        """Provide the rows of each page and the row factory decoding them"""
+        self.column_names = COL_NAMES
+        self.pages = pages
+        self.row_factory = row_factory
+        self.page_num = 0
+        self.current_rows = self._decode_page()
+
+    def _decode_page(self):
+        """Decode the rows of the current page"""
+        rows = self.pages[self.page_num]
+        if self.row_factory is None:
+            return rows
+        return [self.row_factory(self.column_names, rows)]
+
+    @property
+    def has_more_pages(self) -> bool:
+        """Whether a page follows the current one"""
+        return self.page_num < len(self.pages) - 1
+
+    def fetch_next_page(self) -> None:
+        """Replace the current page with the next one"""
+        self.page_num += 1
+        self.current_rows = self._decode_page()
+
+
+class FakeSession:
+    """Session serving the class counts and the paged token-range reads of a
+    table of rows keyed by token, as per the index on the 'status' column"""
+
+    def __init__(self, rows: list[tuple], row_factory=None):
+        """Provide the (token, subject_id, apq_11, status) rows in token order
+        and the row factory decoding the pages"""
+        self.rows = rows
+        self.row_factory = row_factory
+        self.queries = []
+
+    def execute(self, statement, parameters, **_kwargs):
+        """Count the rows of a class, or get the first rows of a class in a
+        token range as a paged result set"""
+        if isinstance(statement, str):
+            count = sum(row[3] == parameters[0] for row in self.rows)
+            return MagicMock(one=MagicMock(return_value=(count,)))
+        self.queries.append(statement.query_string)
+        class_label, lower_token, upper_token, rows_limit = parameters
+        rows = [row[1:] for row in self.rows if (
+            row[3] == class_label and lower_token < row[0] <= upper_token)]
+        rows = rows[:rows_limit]
+        fetch_size = statement.fetch_size
+        pages = [rows[num:num + fetch_size]
+                 for num in range(0, len(rows), fetch_size)] or [[]]
+        return FakeResultSet(pages, self.row_factory)
+
+    @staticmethod
+    def execution_profile_clone_update(profile: str, **_kwargs) -> str:
+        """Get the name of the profile, the pages being decoded by the row
+        factory of the session"""
+        return profile
+
+
+class TestGetClassSampledDataFromTable(unittest.TestCase):
+    """Test class for sampling each class of a table over random token ranges
+    and multiple pages"""
+
+    def setUp(self):
+        """Provide a table of 30 rows of class 0 and 300 rows of class 1,
+        with tokens spread over the token ring"""
+        self.rows = [(-2**63 + (num + 1) * (2**64 // 331),
+                      f"S{num % 11}_{num}", 0.1, int(num % 11 > 0))
+                     for num in range(330)]
+
+    def test_balanced_sample(self):
+        """Ensure the minority class is read whole, the majority class is
+        sampled as many rows, spread over the token ring, and the rows of
+        every page are kept, rather than the last page once per page"""
+        for is_columnar in (False, True):
+            with self.subTest(is_columnar=is_columnar):
+                row_factory = columnar_row_factory if is_columnar else None
+                session = FakeSession(self.rows, row_factory)
+                sampled_df = get_class_sampled_data_from_table(
+                    session, 'speech_data_train', is_columnar=is_columnar,
+                    fetch_size=4, sampled_tokens_num=16)
+
+                self.assertEqual(list(sampled_df.columns), COL_NAMES)
+                np.testing.assert_array_equal(
+                    sampled_df['status'], [0] * 30 + [1] * 30)
+                self.assertEqual(
+                    sorted(sampled_df['subject_id'][:30]),
+                    sorted(row[1] for row in self.rows if row[3] == 0))
+                sampled_ids = list(sampled_df['subject_id'][30:])
+                self.assertEqual(len(set(sampled_ids)), 30)
+                sampled_nums = sorted(
+                    int(subject_id.split('_')[1])
+                    for subject_id in sampled_ids)
+                self.assertGreater(max(np.diff(sampled_nums)), 1)
+                self.assertGreater(sampled_nums[-1] - sampled_nums[0], 150)
+
+    def test_per_partition_limit(self):
+        """Ensure the maximum number of rows per partition is in the reads"""
+        session = FakeSession(self.rows)
+        get_class_sampled_data_from_table(
+            session, 'speech_data_train', samples_per_class=10,
+            per_partition_limit=1)
+        self.assertTrue(all('per partition limit 1 limit %s' in query
+                            for query in session.queries))
+
+
+class TestGetFilteredDataFromTable(unittest.TestCase):
+    """Test class for filtering a table by class and subjects"""
+
+    def test_no_subjects(self):
+        """Ensure an empty list of subjects is read via prepared partition
+        reads, i.e., with '?' placeholders only, and yields no rows"""
+        session = MagicMock()
+        filtered_df = get_filtered_data_from_table(
+            session, 'speech_data_train', status=1, subject_ids=[])
+
+        query = session.prepare.call_args.args[0]
+        self.assertIn('status = ?', query)
+        self.assertNotIn('%s', query)
+        self.assertEqual(len(filtered_df), 0)
+
+
+class TestCreateSession(unittest.TestCase):
+    """Test class for the cache of sessions"""
+
+    def tearDown(self):
+        """Clear the cached (dummy) sessions"""
+        shutdown_sessions()
+
+    @patch('src.create_cassandra_db.utils.Cluster')
+    def test_session_cached_per_settings(self, mock_cluster):
+        """Ensure a session is reused for the same contact points and number
+        of executor threads only"""
+        mock_cluster.side_effect = lambda *args, **kwargs: MagicMock()
+
+        session = create_session(['10.0.0.2', '10.0.0.1'], executor_threads=2)
+        self.assertIs(
+            create_session(['10.0.0.1', '10.0.0.2'], executor_threads=2),
+            session)
+        self.assertIsNot(
+            create_session(['10.0.0.1', '10.0.0.2'], executor_threads=4),
+            session)
+        self.assertEqual(mock_cluster.call_count, 2)
+        self.assertEqual(
+            mock_cluster.call_args.kwargs['executor_threads'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
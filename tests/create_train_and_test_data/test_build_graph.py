@@ -0,0 +1,64 @@
+"""Tests for the incremental build graph of the train and test datasets"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.create_train_and_test_data.build_graph import (load_manifest,
+                                                        run_stage,
+                                                        save_manifest)
+
+
+class TestRunStage(unittest.TestCase):
+    """Test class for running a stage of the build graph"""
+
+    def setUp(self):
+        """Provide a temporary directory with an input file, and a stage
+        copying it into an output file"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.input_path = f"{self.tmp_dir}{os.sep}input.csv"
+        self.output_path = f"{self.tmp_dir}{os.sep}output.csv"
+        self.manifest_path = f"{self.tmp_dir}{os.sep}manifest.json"
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write('a,b\n1,2\n')
+        self.build_fn = MagicMock(
+            side_effect=lambda: shutil.copyfile(
+                self.input_path, self.output_path))
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def _run_stage(self, params: dict = None) -> bool:
+        """Run the stage, persisting the manifest across runs"""
+        manifest = load_manifest(self.manifest_path)
+        is_run = run_stage(
+            'copy', [self.input_path], [self.output_path],
+            params or {'param': 1}, self.build_fn, manifest)
+        save_manifest(manifest, self.manifest_path)
+        return is_run
+
+    def test_unchanged_stage_skipped(self):
+        """Ensure a stage is skipped when rerun with unchanged inputs,
+        even if their modification time changed"""
+        self.assertTrue(self._run_stage())
+        os.utime(self.input_path, (0, 0))
+        self.assertFalse(self._run_stage())
+        self.build_fn.assert_called_once()
+
+    def test_changed_stage_rebuilt(self):
+        """Ensure a stage is rebuilt when its input, parameters or
+        outputs change"""
+        self._run_stage()
+
+        with open(self.input_path, 'a', encoding='utf-8') as input_file:
+            input_file.write('3,4\n')
+        self.assertTrue(self._run_stage())
+
+        self.assertTrue(self._run_stage({'param': 2}))
+
+        os.remove(self.output_path)
+        self.assertTrue(self._run_stage({'param': 2}))
+        self.assertEqual(self.build_fn.call_count, 4)
@@ -0,0 +1,73 @@
+"""Tests for merging the speech datasets into train and test sets"""
+
+import functools
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.create_train_and_test_data.merge_speech_data import \
+    merge_speech_datasets
+from src.process_data.columnar_cache import load_csv_columns
+from src.process_data.constants import DATA_DIR_STR, NEW_COL_NAMES
+
+
+class TestMergeSpeechDatasets(unittest.TestCase):
+    """Test class for merging the speech datasets"""
+
+    def setUp(self):
+        """Provide a temporary source directory with dummy processed datasets,
+        one of which with missing values"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.datasets = {}
+        for dataset_num, subject_ids in enumerate(
+                (['S01', 'S02', 'S03', 'S04', 'S05'], [7, 8, 9])):
+            dataset_dir = f"{self.tmp_dir}{os.sep}{DATA_DIR_STR}{os.sep}dataset_{dataset_num}"
+            os.makedirs(dataset_dir)
+            data_df = pd.DataFrame(
+                np.random.default_rng(dataset_num).random(
+                    (len(subject_ids), len(NEW_COL_NAMES) - 1)),
+                columns=NEW_COL_NAMES[1:])
+            data_df.insert(0, NEW_COL_NAMES[0], subject_ids)
+            data_df['status'] = 1
+            data_df.iloc[1, 2] = np.nan
+            data_df.to_csv(
+                f"{dataset_dir}{os.sep}data_processed.csv", index=False)
+            self.datasets[f"dataset_{dataset_num}"] = {
+                'csv_path': f"dataset_{dataset_num}/data.csv"}
+        self.train_test_dir = f"{self.tmp_dir}{os.sep}train_and_test_sets"
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def _merge(self, is_streamed: bool) -> tuple[str, str]:
+        """Merge the dummy datasets and return the train and test csv files"""
+        with patch('src.create_train_and_test_data.merge_speech_data.ROOT_DIR_STR',
+                   self.tmp_dir), \
+                patch('src.create_train_and_test_data.merge_speech_data.TRAIN_TEST_DATA_DIR',
+                      self.train_test_dir), \
+                patch('src.create_train_and_test_data.merge_speech_data.load_csv_columns',
+                      functools.partial(load_csv_columns, cache_dir=self.tmp_dir)):
+            merge_speech_datasets(
+                ['dataset_0', 'dataset_1'], ['dataset_1'], self.datasets,
+                is_streamed=is_streamed, chunk_size=2)
+
+        with open(f"{self.train_test_dir}{os.sep}train_data.csv",
+                  encoding='utf-8') as train_csv_file, \
+                open(f"{self.train_test_dir}{os.sep}test_data.csv",
+                     encoding='utf-8') as test_csv_file:
+            return train_csv_file.read(), test_csv_file.read()
+
+    def test_streamed_merge_matches(self):
+        """Ensure the streamed merge yields the same train and test sets as
+        the in-memory one, without the rows with missing values"""
+        train_csv, test_csv = self._merge(is_streamed=False)
+
+        self.assertEqual(self._merge(is_streamed=True), (train_csv, test_csv))
+        self.assertEqual(len(train_csv.splitlines()), 1 + 4 + 2)
+        self.assertEqual(len(test_csv.splitlines()), 1 + 2)
@@ -0,0 +1,132 @@
+"""Test the hyperparameter search of the GBT classifier"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from src.modelling.classify.gbt_classifier import (get_best_gbt_classifier,
+                                                   get_engine_param_name,
+                                                   get_search_report)
+from src.modelling.evaluate.explainability import get_surrogate_tree
+
+
+class TestGetBestGbtClassifier(unittest.TestCase):
+    """Test class to verify the successive-halving hyperparameter search"""
+
+    def setUp(self):
+        """Provide dummy, separable data and a small hyperparameter grid"""
+        rng = np.random.default_rng(0)
+        self.train_feats = pd.DataFrame({
+            'apq_11': rng.random(600),
+            'jitter_percent': rng.random(600)
+        })
+        self.train_targets = pd.Series(
+            (self.train_feats['apq_11'] > 0.5).astype(int), name='status')
+        self.param_grid = {
+            'gbt__n_estimators': [5, 10, 15],
+            'gbt__learning_rate': [0.1, 0.3],
+            'gbt__max_depth': [2, 3, 4]
+        }
+
+    def test_halving_search_over_samples(self):
+        """Ensure halving over the samples performs fewer fits than the grid"""
+        best_gbt = get_best_gbt_classifier(
+            self.train_feats, self.train_targets, to_optimise=True,
+            search_mode='halving', jobs_num=1, param_grid=self.param_grid,
+            halving_min_samples=60)
+
+        self.assertEqual(best_gbt.n_candidates_[0], 18)
+        self.assertEqual(best_gbt.n_resources_[0], 66)
+        self.assertEqual(best_gbt.n_resources_[-1], 594)
+        self.assertGreater(
+            best_gbt.score(self.train_feats, self.train_targets), 0.9)
+
+        search_report = get_search_report(best_gbt, self.param_grid, 1.0)
+        self.assertEqual(search_report['grid_fits_num'], 90)
+        self.assertEqual(
+            search_report['fits_num'], 5 * sum(best_gbt.n_candidates_))
+        self.assertAlmostEqual(search_report['full_fits_num'],
+                               5 * (18 * 66 + 6 * 198 + 2 * 594) / 600)
+        self.assertGreater(search_report['saved_fits_num'], 0)
+
+    def test_halving_search_over_estimators(self):
+        """Ensure halving over the estimators grows them up to the largest number"""
+        best_gbt = get_best_gbt_classifier(
+            self.train_feats, self.train_targets, to_optimise=True,
+            search_mode='halving', jobs_num=1, param_grid=self.param_grid,
+            halving_resource='gbt__n_estimators')
+
+        self.assertEqual(best_gbt.n_candidates_[0], 6)
+        self.assertEqual(best_gbt.best_params_['gbt__n_estimators'], 15)
+
+    def test_unknown_search_mode(self):
+        """Ensure an unknown search mode is rejected"""
+        with self.assertRaises(ValueError):
+            get_best_gbt_classifier(
+                self.train_feats, self.train_targets, to_optimise=True,
+                search_mode='random', param_grid=self.param_grid)
+
+
+class TestHistGbtEngine(unittest.TestCase):
+    """Test class to verify the histogram-based GBT engine"""
+
+    def setUp(self):
+        """Provide dummy, separable data"""
+        rng = np.random.default_rng(0)
+        self.train_feats = pd.DataFrame({
+            'apq_11': rng.random(600),
+            'apq_3': rng.random(600),
+            'jitter_percent': rng.random(600),
+            'vector_similarity': rng.random(600)
+        })
+        self.train_targets = pd.Series(
+            (self.train_feats['apq_11'] > 0.5).astype(int), name='status')
+
+    def test_hist_engine(self):
+        """Ensure the histogram-based engine is trained with the same
+        hyperparameters and can be explained via a surrogate tree"""
+        best_gbt = get_best_gbt_classifier(
+            self.train_feats, self.train_targets, engine='hist')
+
+        self.assertIsInstance(best_gbt, HistGradientBoostingClassifier)
+        self.assertLessEqual(best_gbt.n_iter_, 15)
+        self.assertGreater(
+            best_gbt.score(self.train_feats, self.train_targets), 0.9)
+        self.assertEqual(
+            best_gbt.predict_proba(self.train_feats.iloc[:1]).shape, (1, 2))
+
+        surrogate_tree = get_surrogate_tree(best_gbt, self.train_feats)
+        self.assertEqual(self.train_feats.columns[
+            np.argmax(surrogate_tree.feature_importances_)], 'apq_11')
+
+    def test_hist_engine_search(self):
+        """Ensure the hyperparameters are renamed for the histogram-based engine"""
+        param_grid = {
+            'gbt__n_estimators': [5, 15],
+            'gbt__max_depth': [2, 3],
+            'gbt__subsample': [0.5, 0.9]
+        }
+        best_gbt = get_best_gbt_classifier(
+            self.train_feats, self.train_targets, to_optimise=True,
+            search_mode='halving', jobs_num=1, param_grid=param_grid,
+            halving_resource='gbt__n_estimators', engine='hist')
+
+        self.assertEqual(best_gbt.n_candidates_[0], 2)
+        self.assertEqual(best_gbt.best_params_['gbt__max_iter'], 15)
+
+    def test_engine_param_names(self):
+        """Ensure the hyperparameters of the classic engine are mapped correctly"""
+        self.assertEqual(get_engine_param_name('gbt__n_estimators', 'hist'),
+                         'gbt__max_iter')
+        self.assertIsNone(get_engine_param_name('gbt__subsample', 'hist'))
+        self.assertEqual(
+            get_engine_param_name('gbt__max_depth', 'hist'), 'gbt__max_depth')
+        self.assertIsNone(get_engine_param_name('gbt__max_features', 'hist'))
+        self.assertEqual(
+            get_engine_param_name('gbt__subsample'), 'gbt__subsample')
+
+
+if __name__ == '__main__':
+    unittest.main()
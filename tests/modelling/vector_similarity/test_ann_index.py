@@ -0,0 +1,119 @@
+"""Test the approximate-nearest-neighbour index of the training vectors"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KNeighborsClassifier
+
+from src.modelling.vector_similarity.ann_index import AnnKNeighborsClassifier
+
+
+class TestAnnKNeighborsClassifier(unittest.TestCase):
+    """Test class to verify the ANN classifier against the exact KNN one"""
+
+    def setUp(self):
+        """Provide dummy training vectors and queries, and a temporary directory"""
+        rng = np.random.default_rng(0)
+        self.train_feats = pd.DataFrame(
+            rng.random((2000, 3)),
+            columns=['apq_11', 'apq_3', 'jitter_percent'])
+        self.train_targets = pd.Series(
+            (self.train_feats['apq_11'] + 0.2 * rng.random(2000) > 0.6).astype(int))
+        self.queries = pd.DataFrame(
+            rng.random((300, 3)), columns=self.train_feats.columns)
+        self.index_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.index_dir)
+
+    def _get_knn_classifier(self, train_size: int) -> KNeighborsClassifier:
+        """Get the exact KNN classifier with the same hyperparameters"""
+        return KNeighborsClassifier(
+            n_neighbors=2, weights='distance', p=0.5, algorithm='brute').fit(
+                self.train_feats.iloc[:train_size], self.train_targets.iloc[:train_size])
+
+    def test_single_leaf_is_exact(self):
+        """Ensure a single leaf, i.e., an exhaustive search, matches the exact KNN"""
+        ann_classifier = AnnKNeighborsClassifier(trees_num=1).fit(
+            self.train_feats.iloc[:30], self.train_targets.iloc[:30])
+        knn_classifier = self._get_knn_classifier(30)
+
+        expected_distances, expected_indices = knn_classifier.kneighbors(
+            self.queries)
+        distances, indices = ann_classifier.kneighbors(self.queries)
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-5)
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(
+            ann_classifier.predict_proba(self.queries),
+            knn_classifier.predict_proba(self.queries),
+            atol=1e-5)
+
+    def test_recall_grows_with_trees(self):
+        """Ensure the recall of the neighbours grows with the trees searched"""
+        ann_classifier = AnnKNeighborsClassifier(trees_num=10).fit(
+            self.train_feats, self.train_targets)
+        knn_classifier = self._get_knn_classifier(2000)
+        _, expected_indices = knn_classifier.kneighbors(self.queries)
+
+        recalls = []
+        for search_trees_num in (1, 10):
+            ann_classifier.search_trees_num = search_trees_num
+            _, indices = ann_classifier.kneighbors(self.queries)
+            recalls.append(np.mean([
+                len(set(row) & set(expected_row)) / 2
+                for row, expected_row in zip(indices, expected_indices)]))
+        self.assertLess(recalls[0], recalls[1])
+        self.assertGreater(recalls[1], 0.9)
+
+    def test_hyperparameters(self):
+        """Ensure the leaves hold at most leaf_size training vectors, the trees
+        depend on random_state only, and the indices can be found alone"""
+        ann_classifier = AnnKNeighborsClassifier(
+            trees_num=2, leaf_size=100, random_state=1).fit(
+                self.train_feats, self.train_targets)
+        leaf_sizes = np.diff(ann_classifier.index['leaf_bounds'], axis=1)
+        self.assertLessEqual(leaf_sizes.max(), 100)
+        self.assertGreater(leaf_sizes.max(), 32)
+
+        same_classifier = AnnKNeighborsClassifier(
+            trees_num=2, leaf_size=100, random_state=1).fit(
+                self.train_feats, self.train_targets)
+        other_classifier = AnnKNeighborsClassifier(
+            trees_num=2, leaf_size=100, random_state=2).fit(
+                self.train_feats, self.train_targets)
+        np.testing.assert_array_equal(same_classifier.index['leaf_items'],
+                                      ann_classifier.index['leaf_items'])
+        self.assertFalse(np.array_equal(other_classifier.index['leaf_items'],
+                                        ann_classifier.index['leaf_items']))
+
+        _, expected_indices = ann_classifier.kneighbors(self.queries)
+        np.testing.assert_array_equal(
+            ann_classifier.kneighbors(self.queries, return_distance=False),
+            expected_indices)
+
+    def test_save_and_load(self):
+        """Ensure a saved index is memory-mapped on load and yields the same
+        predictions"""
+        ann_classifier = AnnKNeighborsClassifier().fit(
+            self.train_feats, self.train_targets)
+        index_dir = f"{self.index_dir}{os.sep}index"
+        ann_classifier.save(index_dir)
+        loaded_classifier = AnnKNeighborsClassifier.load(index_dir)
+
+        self.assertIsInstance(loaded_classifier.index['vectors'], np.memmap)
+        self.assertEqual(loaded_classifier.get_params(),
+                         ann_classifier.get_params())
+        np.testing.assert_array_equal(
+            loaded_classifier.predict_proba(self.queries),
+            ann_classifier.predict_proba(self.queries))
+        np.testing.assert_array_equal(loaded_classifier.predict(self.queries),
+                                      ann_classifier.predict(self.queries))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Test the blocked, memory-bounded exact KNN classifier"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import NotFittedError
+from sklearn.neighbors import KNeighborsClassifier
+
+from src.modelling.evaluate.inference_and_performance import infer_and_evaluate
+from src.modelling.vector_similarity.blocked_knn import (
+    BlockedKNeighborsClassifier, get_tile_sizes)
+from src.modelling.vector_similarity.knn_classifier import \
+    get_best_knn_classifier
+
+
+class TestBlockedKNeighborsClassifier(unittest.TestCase):
+    """Test class to verify the blocked KNN classifier against sklearn's one"""
+
+    def setUp(self):
+        """Provide dummy training vectors and queries"""
+        rng = np.random.default_rng(0)
+        self.train_feats = pd.DataFrame(
+            rng.random((500, 3)),
+            columns=['apq_11', 'apq_3', 'jitter_percent'])
+        self.train_targets = pd.Series(
+            (self.train_feats['apq_11'] + 0.2 * rng.random(500) > 0.6).astype(int))
+        self.queries = pd.DataFrame(
+            rng.random((200, 3)), columns=self.train_feats.columns)
+
+    def test_matches_sklearn_in_tiles(self):
+        """Ensure the neighbours and probabilities match sklearn's ones, for
+        integer and fractional p, whichever the tiles"""
+        for p_param in (0.5, 1, 2):
+            knn_classifier = KNeighborsClassifier(
+                n_neighbors=3, weights='distance', p=p_param, algorithm='brute').fit(
+                    self.train_feats, self.train_targets)
+            expected_distances, expected_indices = knn_classifier.kneighbors(
+                self.queries)
+            for memory_budget in (16 * 64 * 64, 2 ** 28):
+                blocked_classifier = BlockedKNeighborsClassifier(
+                    n_neighbors=3, p=p_param, memory_budget=memory_budget,
+                    workers_num=2).fit(self.train_feats, self.train_targets)
+                distances, indices = blocked_classifier.kneighbors(
+                    self.queries)
+
+                np.testing.assert_array_equal(indices, expected_indices)
+                np.testing.assert_allclose(
+                    distances, expected_distances, rtol=1e-4)
+                np.testing.assert_allclose(
+                    blocked_classifier.predict_proba(self.queries),
+                    knn_classifier.predict_proba(self.queries), atol=1e-4)
+
+    def test_not_fitted(self):
+        """Ensure an unfitted classifier has no fitted state and raises
+        sklearn's error before fitting, as the sklearn one does"""
+        blocked_classifier = BlockedKNeighborsClassifier()
+        self.assertFalse(hasattr(blocked_classifier, 'train_data_'))
+        with self.assertRaises(NotFittedError):
+            _ = blocked_classifier.classes_
+        with self.assertRaises(NotFittedError):
+            blocked_classifier.predict_proba(self.queries)
+
+    def test_tile_sizes_fit_memory_budget(self):
+        """Ensure the tiles of all workers fit in the memory budget"""
+        queries_tile_size, vectors_tile_size = get_tile_sizes(
+            10 ** 6, 10 ** 6, 2, memory_budget=2 ** 20, workers_num=4)
+        self.assertLessEqual(
+            4 * 16 * queries_tile_size * vectors_tile_size, 2 ** 20)
+        self.assertEqual(get_tile_sizes(10, 20, 2), (10, 20))
+
+    def test_drop_in_for_knn_classifier(self):
+        """Ensure the blocked engine can be optimised and evaluated as the
+        sklearn one"""
+        best_knn_classifier = get_best_knn_classifier(
+            self.train_feats, self.train_targets, knn_engine='blocked')
+        self.assertIsInstance(best_knn_classifier, BlockedKNeighborsClassifier)
+        self.assertIn(best_knn_classifier.p, (1, 2))
+
+        preds = infer_and_evaluate(best_knn_classifier, self.queries,
+                                   self.queries['apq_11'] > 0.6, True, 0.5)
+        self.assertEqual(len(preds), len(self.queries))
+
+
+if __name__ == '__main__':
+    unittest.main()
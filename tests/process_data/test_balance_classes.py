@@ -6,7 +6,8 @@ import numpy as np
 import pandas as pd
 
 from src.constants import TARGET_COL_NAME
-from src.process_data.balance_classes import balance_samples_per_class
+from src.process_data.balance_classes import (balance_samples_in_stream,
+                                              balance_samples_per_class)
 
 
 class TestBalanceSamplesPerClass(unittest.TestCase):
@@ -51,3 +52,52 @@ class TestBalanceSamplesPerClass(unittest.TestCase):
         )
 
         pd.testing.assert_frame_equal(balanced_df1, balanced_df2)
+
+
+class TestBalanceSamplesInStream(unittest.TestCase):
+    """Test class to ensure classes are balanced correctly out of core"""
+
+    def setUp(self):
+        """Provide dummy data with three imbalanced classes"""
+        rng = np.random.default_rng(0)
+        whole_size = 1000
+        self.data_df = pd.DataFrame({
+            'feature1': rng.random(whole_size),
+            TARGET_COL_NAME: rng.choice(
+                [0, 1, 2], size=whole_size, p=[0.2, 0.5, 0.3])
+        })
+        self.class_counts = self.data_df[TARGET_COL_NAME].value_counts()
+
+    def _get_chunks(self, chunk_size: int = 64):
+        """Stream the dummy data in chunks"""
+        for start in range(0, len(self.data_df), chunk_size):
+            yield self.data_df.iloc[start:start + chunk_size]
+
+    def test_single_df_as_per_balance_samples_per_class(self):
+        """Ensure a single in-memory df is balanced as per balance_samples_per_class"""
+        binary_df = self.data_df[self.data_df[TARGET_COL_NAME] < 2]
+        pd.testing.assert_frame_equal(
+            balance_samples_in_stream(binary_df),
+            balance_samples_per_class(binary_df))
+
+    def test_multi_class_stream(self):
+        """Ensure the classes of a stream are balanced reproducibly"""
+        balanced_df = balance_samples_in_stream(self._get_chunks())
+
+        class_counts = balanced_df[TARGET_COL_NAME].value_counts()
+        self.assertTrue((class_counts == self.class_counts.min()).all())
+        self.assertEqual(len(class_counts), 3)
+        pd.testing.assert_frame_equal(
+            balanced_df, balance_samples_in_stream(self._get_chunks()))
+        # The samples are rows of the input, in their order of arrival
+        pd.testing.assert_frame_equal(
+            balanced_df[balanced_df[TARGET_COL_NAME] == 0],
+            self.data_df[self.data_df[TARGET_COL_NAME] == 0])
+
+    def test_target_ratio_and_reservoir_size(self):
+        """Ensure the classes are in the target ratio, within the reservoir size"""
+        balanced_df = balance_samples_in_stream(
+            self._get_chunks(), class_ratios={0: 1, 1: 2}, reservoir_size=150)
+
+        class_counts = balanced_df[TARGET_COL_NAME].value_counts()
+        self.assertDictEqual(class_counts.to_dict(), {1: 150, 0: 75})
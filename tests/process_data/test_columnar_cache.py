@@ -0,0 +1,67 @@
+"""Tests for the columnar cache of the csv files"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.process_data.columnar_cache import get_cache_path, load_csv_columns
+
+
+class TestLoadCsvColumns(unittest.TestCase):
+    """Test class for loading csv files via their columnar cache"""
+
+    def setUp(self):
+        """Provide a temporary directory with a dummy csv file"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = f"{self.tmp_dir}{os.sep}cache"
+        self.csv_path = f"{self.tmp_dir}{os.sep}dummy.csv"
+        self.data_df = pd.DataFrame(
+            {'subject_id': ['a', 'b', 'a'],
+             'apq_11': [0.1, 0.2, 0.3],
+             'unused': [1, 2, 3],
+             'status': [1, 0, 1]})
+        self.data_df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_selected_cols(self):
+        """Ensure only the selected columns are loaded, with the given dtypes"""
+        result_df = load_csv_columns(
+            self.csv_path, ['subject_id', 'status'],
+            {'subject_id': 'category', 'status': 'int8', 'apq_11': 'float32'},
+            cache_dir=self.cache_dir)
+
+        self.assertListEqual(list(result_df.columns), ['subject_id', 'status'])
+        self.assertIsInstance(
+            result_df['subject_id'].dtype, pd.CategoricalDtype)
+        self.assertEqual(result_df['status'].dtype, 'int8')
+        self.assertTrue(os.path.exists(
+            get_cache_path(self.csv_path, self.cache_dir)))
+
+    def test_csv_parsed_once(self):
+        """Ensure the csv file is parsed only once while unmodified,
+        and again once modified"""
+        with patch('src.process_data.columnar_cache.pd.read_csv',
+                   wraps=pd.read_csv) as mock_read_csv:
+            load_csv_columns(self.csv_path, cache_dir=self.cache_dir)
+            load_csv_columns(
+                self.csv_path, ['apq_11'], cache_dir=self.cache_dir)
+            self.assertEqual(mock_read_csv.call_count, 1)
+
+            cache_mtime = os.path.getmtime(
+                get_cache_path(self.csv_path, self.cache_dir))
+            modified_df = self.data_df.assign(status=[0, 0, 0])
+            modified_df.to_csv(self.csv_path, index=False)
+            os.utime(self.csv_path, (cache_mtime + 1, cache_mtime + 1))
+            result_df = load_csv_columns(
+                self.csv_path, cache_dir=self.cache_dir)
+
+            self.assertEqual(mock_read_csv.call_count, 2)
+            assert_frame_equal(result_df, modified_df)
@@ -0,0 +1,62 @@
+"""Tests for the memory-compact dtype policy"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.process_data.balance_classes import balance_samples_per_class
+from src.process_data.constants import COLS_TO_RETAIN, NEW_COL_NAMES
+from src.process_data.dtype_policy import (apply_dtype_policy,
+                                           get_memory_usage_report)
+from src.process_data.remove_outliers import z_score_outlier_removal
+from src.process_data.utils import retain_selected_cols
+
+
+class TestDtypePolicy(unittest.TestCase):
+    """Test class for the memory-compact dtype policy"""
+
+    def setUp(self):
+        """Provide a dummy df of speech data with wide dtypes"""
+        rng = np.random.default_rng(0)
+        rows_num = 1000
+        self.data_df = pd.DataFrame(
+            rng.random((rows_num, len(NEW_COL_NAMES) - 1)),
+            columns=NEW_COL_NAMES[1:])
+        subject_ids = [f"subject_{num % 40}" for num in range(rows_num)]
+        self.data_df.insert(0, 'subject_id', subject_ids)
+        self.data_df['status'] = rng.choice([0, 1], rows_num, p=[0.3, 0.7])
+
+    def _assert_compact(self, data_df: pd.DataFrame) -> None:
+        """Assert the df has compact dtypes"""
+        self.assertIsInstance(data_df['subject_id'].dtype, pd.CategoricalDtype)
+        self.assertEqual(data_df['status'].dtype, np.int8)
+        self.assertEqual(data_df['apq_11'].dtype, np.float32)
+
+    def test_dtypes_preserved(self):
+        """Ensure the compact dtypes are preserved by the processing steps,
+        which yield the same rows as with wide dtypes"""
+        compact_df = apply_dtype_policy(self.data_df)
+        self._assert_compact(compact_df)
+
+        cols_to_process = ['apq_11', 'apq_3', 'jitter_percent']
+        processed_dfs = []
+        for data_df in (self.data_df, compact_df):
+            data_df = retain_selected_cols(data_df, COLS_TO_RETAIN)
+            data_df = z_score_outlier_removal(data_df, cols_to_process, 1.5)
+            processed_dfs.append(balance_samples_per_class(data_df))
+
+        self._assert_compact(processed_dfs[1])
+        self.assertListEqual(
+            list(processed_dfs[0].index), list(processed_dfs[1].index))
+
+    def test_memory_usage_report(self):
+        """Ensure the memory usage report shows the savings per stage"""
+        report_df = get_memory_usage_report({
+            'wide': self.data_df,
+            'compact': apply_dtype_policy(self.data_df)})
+
+        self.assertAlmostEqual(report_df.loc['wide', 'savings_percent'], 0.0)
+        self.assertGreater(report_df.loc['compact', 'savings_percent'], 50.0)
+        self.assertEqual(
+            report_df.loc['compact', 'wide_bytes'], report_df.loc['wide', 'bytes'])
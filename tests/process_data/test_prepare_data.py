@@ -9,7 +9,7 @@ from pandas.testing import assert_frame_equal
 
 from src.get_src_dir import get_src_path
 from src.process_data.constants import DATA_DIR_STR
-from src.process_data.prepare_data import process_csv
+from src.process_data.prepare_data import prepare_dataset, process_csv
 
 ROOT_DIR_STR = str(get_src_path())
 
@@ -38,18 +38,75 @@ class TestPrepareData(unittest.TestCase):
 
         self.test_df_cols_renamed = test_df.rename(columns=self.new_col_names)
 
-    @patch('src.process_data.prepare_data.pd.read_csv', return_value=test_df)
-    @patch('src.process_data.prepare_data.pd.DataFrame.to_csv')
-    def test_process_csv(self, mock_to_csv, mock_read_csv):
-        """Tests to ensure df is processed with correctly renamed columns"""
+    @patch('src.process_data.prepare_data.load_csv_columns', return_value=test_df)
+    @patch('src.process_data.prepare_data.save_processed_df')
+    @patch('pandas.DataFrame.to_csv')
+    def test_process_csv(self, mock_to_csv, mock_save, mock_load_csv_columns):
+        """Tests to ensure df is processed with correctly renamed columns,
+        and saved into its processed csv file rather than over its input"""
         dummy_path = 'tmp/dummy_df.csv'
         full_dummy_path = f"{ROOT_DIR_STR}{os.sep}{DATA_DIR_STR}{os.sep}{dummy_path}"
         process_csv(
             dummy_path,
             test_df.columns,
             self.test_df_cols_renamed.columns)
-        mock_read_csv.return_value = self.test_df_cols_renamed
+        mock_save.assert_called_once()
+        self.assertEqual(mock_save.call_args.args[0], dummy_path)
         assert_frame_equal(
             self.test_df_cols_renamed,
-            pd.read_csv(full_dummy_path))
-        mock_to_csv.assert_called_once_with(full_dummy_path, index=False)
+            mock_save.call_args.args[1])
+        mock_to_csv.assert_not_called()
+        mock_load_csv_columns.assert_called_once_with(
+            full_dummy_path, list(test_df.columns))
+
+
+class TestPrepareDataset(unittest.TestCase):
+    """Test class for preparing a dataset described in the registry"""
+
+    def setUp(self) -> None:
+        """setUp method serving a dummy registry and dataset"""
+        self.datasets = {
+            'with_target': {
+                'csv_path': 'tmp/with_target.csv',
+                'cols_to_retain': ['id', 'feat'],
+                'target_col': 'class'
+            },
+            'without_target': {
+                'csv_path': 'tmp/without_target.csv',
+                'cols_to_retain': ['id', 'feat'],
+                'target_value': 1
+            }
+        }
+        self.new_col_names = ['subject_id', 'feature']
+        self.data_df = pd.DataFrame(
+            {'id': ['a', 'b'], 'feat': [0.1, 0.2], 'class': [0, 1]})
+
+    @patch('src.process_data.prepare_data.save_processed_df')
+    @patch('src.process_data.prepare_data.load_csv_columns')
+    def test_prepare_dataset_target_col(
+            self, mock_load_csv_columns, mock_save):
+        """Ensure the columns and the target column are renamed"""
+        mock_load_csv_columns.return_value = self.data_df
+        processed_path = prepare_dataset(
+            'with_target', self.datasets, self.new_col_names)
+
+        self.assertEqual(processed_path, 'tmp/with_target_processed.csv')
+        self.assertListEqual(
+            mock_load_csv_columns.call_args.args[1], ['id', 'feat', 'class'])
+        processed_df = mock_save.call_args.args[1]
+        self.assertListEqual(
+            list(processed_df.columns), ['subject_id', 'feature', 'status'])
+        self.assertListEqual(processed_df['status'].tolist(), [0, 1])
+
+    @patch('src.process_data.prepare_data.save_processed_df')
+    @patch('src.process_data.prepare_data.load_csv_columns')
+    def test_prepare_dataset_target_value(
+            self, mock_load_csv_columns, mock_save):
+        """Ensure the target column is added when missing"""
+        mock_load_csv_columns.return_value = self.data_df[['id', 'feat']]
+        prepare_dataset('without_target', self.datasets, self.new_col_names)
+
+        self.assertListEqual(
+            mock_load_csv_columns.call_args.args[1], ['id', 'feat'])
+        processed_df = mock_save.call_args.args[1]
+        self.assertListEqual(processed_df['status'].tolist(), [1, 1])
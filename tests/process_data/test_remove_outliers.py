@@ -1,10 +1,15 @@
 """Test file to ensure outliers are removed correctly"""
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
 import pandas as pd
 
-from src.process_data.remove_outliers import z_score_outlier_removal
+from src.process_data.remove_outliers import (ZScoreOutlierFilter,
+                                              z_score_outlier_removal)
 
 
 class TestZScoreOutlierRemoval(unittest.TestCase):
@@ -38,3 +43,66 @@ class TestZScoreOutlierRemoval(unittest.TestCase):
         expected_df = pd.DataFrame(expected_data).reset_index(drop=True)
 
         pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+class TestZScoreOutlierFilter(unittest.TestCase):
+    """Test class for the fitted z-score outlier filter"""
+
+    def setUp(self) -> None:
+        """Create dummy data for tests"""
+        rng = np.random.default_rng(0)
+        self.input_df = pd.DataFrame({
+            'A': np.append(rng.normal(0, 1, 200), [8.0, 0.0]),
+            'B': np.append(rng.normal(5, 2, 200), [5.0, 30.0]),
+            'C': rng.normal(0, 1, 202)
+        })
+        self.list_of_cols = ['A', 'B']
+
+    def test_single_mask_mode(self):
+        """Ensure the single-mask mode removes the rows with any z-score
+        beyond the threshold given the statistics of all rows"""
+        outlier_filter = ZScoreOutlierFilter(
+            self.list_of_cols, 3.0, is_sequential=False)
+        result_df = outlier_filter.fit_transform(self.input_df)
+
+        input_values = self.input_df[self.list_of_cols]
+        z_scores = ((input_values - input_values.mean())
+                    / input_values.std(ddof=0)).abs()
+        expected_df = self.input_df[(z_scores < 3.0).all(axis=1)]
+        pd.testing.assert_frame_equal(result_df, expected_df)
+        self.assertNotIn(200, result_df.index)
+        self.assertNotIn(201, result_df.index)
+
+    def test_robust_stats(self):
+        """Ensure the robust statistics are the median and scaled MAD"""
+        outlier_filter = ZScoreOutlierFilter(
+            self.list_of_cols, is_robust=True).fit(self.input_df)
+
+        col_a = self.input_df['A'].to_numpy()
+        self.assertAlmostEqual(outlier_filter.centres[0], np.median(col_a))
+        self.assertAlmostEqual(
+            outlier_filter.scales[0],
+            1.4826 * np.median(np.abs(col_a - np.median(col_a))))
+
+    def test_serialised_filter(self):
+        """Ensure a saved and loaded filter applies the same statistics to new data"""
+        outlier_filter = ZScoreOutlierFilter(self.list_of_cols)
+        outlier_filter.fit(self.input_df)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            json_path = f"{tmp_dir}{os.sep}filter.json"
+            outlier_filter.save(json_path)
+            loaded_filter = ZScoreOutlierFilter.load(json_path)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        new_df = self.input_df.iloc[[0, 200, 201]]
+        np.testing.assert_array_equal(
+            loaded_filter.get_inlier_mask(new_df), [True, False, False])
+        np.testing.assert_array_equal(
+            loaded_filter.scales, outlier_filter.scales)
+
+    def test_unfitted_filter(self):
+        """Ensure an unfitted filter cannot be applied"""
+        with self.assertRaises(ValueError):
+            ZScoreOutlierFilter(self.list_of_cols).transform(self.input_df)
@@ -8,8 +8,7 @@ from pandas.testing import assert_frame_equal
 
 from src.constants import TARGET_COL_NAME
 from src.get_src_dir import get_src_path
-from src.process_data.prepare_data import add_target_column
-from src.process_data.utils import retain_selected_cols
+from src.process_data.utils import add_target_column, retain_selected_cols
 
 ROOT_DIR_STR = str(get_src_path())
 
@@ -37,7 +36,7 @@ class TestAddTargetColumn(unittest.TestCase):
 
     def test_add_target_column_existing_col(self):
         """Add target column when existing column is considered"""
-        with patch('src.process_data.prepare_data.pd.read_csv', return_value=self.test_df):
+        with patch('src.process_data.utils.load_csv_columns', return_value=self.test_df):
             result_df = add_target_column('dummy.csv')
             assert_frame_equal(result_df, self.expected_df)
 
@@ -50,7 +49,7 @@ class TestAddTargetColumn(unittest.TestCase):
         }
         new_col_test_df = pd.DataFrame(new_col_test_data)
 
-        with patch('src.process_data.prepare_data.pd.read_csv', return_value=new_col_test_df):
+        with patch('src.process_data.utils.load_csv_columns', return_value=new_col_test_df):
             result_df = add_target_column('dummy.csv')
             assert_frame_equal(result_df, self.expected_df)
 
@@ -67,7 +66,7 @@ class TestAddTargetColumn(unittest.TestCase):
         expected_no_matching_col_df = pd.DataFrame(
             expected_no_matching_col_data)
 
-        with patch('src.process_data.prepare_data.pd.read_csv', return_value=no_matching_col_df):
+        with patch('src.process_data.utils.load_csv_columns', return_value=no_matching_col_df):
             result_df = add_target_column('dummy.csv')
             assert_frame_equal(result_df, expected_no_matching_col_df)
 